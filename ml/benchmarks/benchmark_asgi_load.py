@@ -0,0 +1,141 @@
+"""
+Test de charge local: application Flask (gunicorn) vs variante ASGI (uvicorn)
+
+Les deux serveurs sont lancés dans un répertoire de travail temporaire avec un
+historique synthétique, puis sollicités par un nombre croissant de clients
+simultanés sur /api/predictions (stratégie balanced, non mise en cache).
+Pour chaque niveau de concurrence: débit, latences p50/p99 des réponses 200,
+nombre de refus 429 (contre-pression ASGI) et d'échecs (délai dépassé,
+connexion refusée).
+
+Usage: python benchmarks/benchmark_asgi_load.py [workers gunicorn] [threads ASGI] [file ASGI]
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+ML_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(ML_DIR, 'src')
+
+URL_PATH = '/api/predictions?strategy=balanced&n=5'
+REQUESTS_PER_CLIENT = 10
+TIMEOUT = 30
+
+
+def create_workdir(n_draws=2_000):
+    """
+    Préparation d'un répertoire de travail (data/ et models/)
+    """
+    workdir = tempfile.mkdtemp(prefix='eurogenius_bench_')
+    os.makedirs(os.path.join(workdir, 'data'))
+    os.makedirs(os.path.join(workdir, 'models'))
+
+    rng = np.random.default_rng(42)
+    numbers = np.sort(rng.random((n_draws, 50)).argsort(axis=1)[:, :5] + 1, axis=1)
+    stars = np.sort(rng.random((n_draws, 12)).argsort(axis=1)[:, :2] + 1, axis=1)
+    data = pd.DataFrame(np.hstack([numbers, stars]), columns=['n1', 'n2', 'n3', 'n4', 'n5', 's1', 's2'])
+    data.insert(0, 'date', pd.Timestamp('2004-02-13') + pd.to_timedelta(np.arange(n_draws) * 7, unit='D'))
+    data.to_csv(os.path.join(workdir, 'data', 'euromillions_history.csv'), index=False)
+    return workdir
+
+
+def start_server(command, workdir, env, port):
+    """
+    Lancement d'un serveur et attente de sa disponibilité
+    """
+    process = subprocess.Popen(command, cwd=workdir, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 300
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}{URL_PATH}", timeout=TIMEOUT):
+                return process
+        except (urllib.error.URLError, ConnectionError, OSError):
+            time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError(f"Le serveur n'a pas démarré: {' '.join(command)}")
+
+
+def request_once(url):
+    """
+    Une requête: (code HTTP ou None en cas d'échec, latence en ms)
+    """
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=TIMEOUT) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except (urllib.error.URLError, ConnectionError, OSError):
+        status = None
+    return status, (time.perf_counter() - start) * 1000
+
+
+def load(port, n_clients):
+    """
+    Envoi de n_clients x REQUESTS_PER_CLIENT requêtes par n_clients clients
+    """
+    url = f"http://127.0.0.1:{port}{URL_PATH}"
+
+    def client(_):
+        return [request_once(url) for _ in range(REQUESTS_PER_CLIENT)]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=n_clients) as pool:
+        results = [r for batch in pool.map(client, range(n_clients)) for r in batch]
+    elapsed = time.perf_counter() - start
+
+    ok = [latency for status, latency in results if status == 200]
+    rejected = sum(1 for status, _ in results if status == 429)
+    failed = len(results) - len(ok) - rejected
+    p50, p99 = np.percentile(ok, [50, 99]) if ok else (float('nan'), float('nan'))
+    return len(ok) / elapsed, p50, p99, rejected, failed
+
+
+def run(label, command, workdir, env, port, concurrency):
+    process = start_server(command, workdir, env, port)
+    try:
+        for n_clients in concurrency:
+            throughput, p50, p99, rejected, failed = load(port, n_clients)
+            print(f"{label:<8} {n_clients:>8} {throughput:>10.1f} {p50:>9.1f} {p99:>9.1f} "
+                  f"{rejected:>6} {failed:>7}")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    gunicorn_workers = sys.argv[1] if len(sys.argv) > 1 else '2'
+    asgi_workers = sys.argv[2] if len(sys.argv) > 2 else '2'
+    asgi_queue = sys.argv[3] if len(sys.argv) > 3 else '8'
+    concurrency = [1, 8, 32, 128]
+
+    workdir = create_workdir()
+    env = dict(os.environ, ML_RUNTIME='numpy', PYTHONPATH=SRC_DIR, GUNICORN_WORKERS=gunicorn_workers,
+               ASGI_MAX_WORKERS=asgi_workers, ASGI_MAX_QUEUE=asgi_queue)
+    try:
+        print(f"gunicorn: {gunicorn_workers} workers sync | ASGI: {asgi_workers} threads, file {asgi_queue}")
+        print(f"{'serveur':<8} {'clients':>8} {'req/s':>10} {'p50 (ms)':>9} {'p99 (ms)':>9} "
+              f"{'429':>6} {'échecs':>7}")
+        run('flask', [sys.executable, '-m', 'gunicorn', '-c', os.path.join(ML_DIR, 'gunicorn.conf.py'),
+                      '--bind', '127.0.0.1:5301', 'app:app'],
+            workdir, env, 5301, concurrency)
+        run('asgi', [sys.executable, '-m', 'uvicorn', '--host', '127.0.0.1', '--port', '5302',
+                     '--log-level', 'warning', 'asgi_app:app'],
+            workdir, env, 5302, concurrency)
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark du backtesting walk-forward: exécution séquentielle, pool de processus, cache
+
+Sur un historique synthétique, le même backtest est lancé:
+    - séquentiellement sans cache (un pli après l'autre);
+    - sur un pool de processus sans cache (un pli par tâche);
+    - sur le pool avec un cache vide, puis une seconde fois cache rempli.
+Les rangs de gains doivent être identiques dans les quatre cas.
+
+Usage: python benchmarks/benchmark_backtest.py [tirages] [processus] [stratégies séparées par des virgules]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+import numpy as np
+
+# Ajout du répertoire src au path pour les imports
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+from evaluation.backtest import SERVICE_COLUMNS, STRATEGIES, format_report, run_backtest
+
+
+def create_history(n_draws, seed=42):
+    """
+    Historique synthétique au format de l'API
+    """
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    numbers = np.sort(rng.random((n_draws, 50)).argsort(axis=1)[:, :5] + 1, axis=1)
+    stars = np.sort(rng.random((n_draws, 12)).argsort(axis=1)[:, :2] + 1, axis=1)
+    return pd.DataFrame(np.hstack([numbers, stars]), columns=SERVICE_COLUMNS)
+
+
+def main():
+    n_draws = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    n_workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    strategies = sys.argv[3].split(',') if len(sys.argv) > 3 else STRATEGIES
+    history = create_history(n_draws)
+    options = {'min_train': 200, 'test_size': 50, 'lstm_epochs': 3, 'ga_generations': 10}
+    print(f"{n_draws} tirages, {os.cpu_count()} cœurs, stratégies: {', '.join(strategies)}")
+
+    cache_dir = tempfile.mkdtemp()
+    runs = []
+    try:
+        for label, workers, cache in [('séquentiel', 1, None), ('pool', n_workers, None),
+                                      ('pool, cache vide', n_workers, cache_dir),
+                                      ('pool, cache rempli', n_workers, cache_dir)]:
+            start = time.perf_counter()
+            report = run_backtest(history, strategies, n_workers=workers, cache_dir=cache, **options)
+            runs.append((label, workers, time.perf_counter() - start, report))
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    print(format_report(runs[0][3]))
+    print(f"\n{'exécution':>20} {'processus':>10} {'durée (s)':>10} {'accélération':>13} {'rangs identiques':>17}")
+    reference = {name: metrics['tier_counts'] for name, metrics in runs[0][3]['strategies'].items()}
+    for label, workers, elapsed, report in runs:
+        same = reference == {name: metrics['tier_counts'] for name, metrics in report['strategies'].items()}
+        print(f"{label:>20} {workers:>10} {elapsed:>10.2f} {runs[0][2] / elapsed:>12.1f}x {str(same):>17}")
+
+
+if __name__ == '__main__':
+    main()
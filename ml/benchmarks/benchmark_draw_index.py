@@ -0,0 +1,106 @@
+"""
+Benchmark du calcul des statistiques: masques pandas vs index des tirages
+
+Usage: python benchmarks/benchmark_draw_index.py
+"""
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+# Ajout du répertoire src au path pour les imports
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+from preprocessing.draw_index import DrawIndex
+
+
+def create_synthetic_data(n_draws, seed=42):
+    """
+    Génération de tirages synthétiques au format de l'API ML
+    """
+    rng = np.random.default_rng(seed)
+    numbers = np.sort(rng.random((n_draws, 50)).argsort(axis=1)[:, :5] + 1, axis=1)
+    stars = np.sort(rng.random((n_draws, 12)).argsort(axis=1)[:, :2] + 1, axis=1)
+    data = pd.DataFrame(numbers, columns=['n1', 'n2', 'n3', 'n4', 'n5'])
+    data['s1'] = stars[:, 0]
+    data['s2'] = stars[:, 1]
+    return data
+
+
+def legacy_statistics(historical_data):
+    """
+    Calcul historique des statistiques (62 + 62 masques pandas)
+    """
+    number_frequencies = {}
+    for i in range(1, 51):
+        count = ((historical_data['n1'] == i) | (historical_data['n2'] == i) |
+                 (historical_data['n3'] == i) | (historical_data['n4'] == i) |
+                 (historical_data['n5'] == i)).sum()
+        number_frequencies[i] = {'count': int(count), 'frequency': round(count / len(historical_data), 4)}
+
+    star_frequencies = {}
+    for i in range(1, 13):
+        count = ((historical_data['s1'] == i) | (historical_data['s2'] == i)).sum()
+        star_frequencies[i] = {'count': int(count), 'frequency': round(count / len(historical_data), 4)}
+
+    recent_data = historical_data.tail(20)
+    hot_numbers, cold_numbers = [], []
+    for i in range(1, 51):
+        recent_count = ((recent_data['n1'] == i) | (recent_data['n2'] == i) |
+                        (recent_data['n3'] == i) | (recent_data['n4'] == i) |
+                        (recent_data['n5'] == i)).sum()
+        if recent_count >= 3:
+            hot_numbers.append(i)
+        elif recent_count == 0:
+            cold_numbers.append(i)
+
+    hot_stars, cold_stars = [], []
+    for i in range(1, 13):
+        recent_count = ((recent_data['s1'] == i) | (recent_data['s2'] == i)).sum()
+        if recent_count >= 3:
+            hot_stars.append(i)
+        elif recent_count == 0:
+            cold_stars.append(i)
+
+    return number_frequencies, star_frequencies, hot_numbers, cold_numbers, hot_stars, cold_stars
+
+
+def index_statistics(index):
+    """
+    Calcul des statistiques à partir de l'index précalculé
+    """
+    number_frequencies, star_frequencies = index.frequencies()
+    hot_cold = index.hot_cold(window=20)
+    return (number_frequencies, star_frequencies, hot_cold['hot_numbers'], hot_cold['cold_numbers'],
+            hot_cold['hot_stars'], hot_cold['cold_stars'])
+
+
+def timed(func, *args, repeat=5):
+    """
+    Meilleur temps d'exécution (en millisecondes) sur `repeat` appels
+    """
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main():
+    print(f"{'tirages':>10} {'pandas (ms)':>12} {'build (ms)':>11} {'index (ms)':>11} {'gain':>8}")
+    for n_draws in [1_000, 100_000, 1_000_000]:
+        data = create_synthetic_data(n_draws)
+        repeat = 5 if n_draws < 1_000_000 else 2
+
+        legacy_ms, legacy_result = timed(legacy_statistics, data, repeat=repeat)
+        build_ms, index = timed(DrawIndex, data, repeat=1)
+        index_ms, index_result = timed(index_statistics, index, repeat=repeat)
+
+        assert legacy_result == index_result, "Les statistiques de l'index divergent du calcul pandas"
+        print(f"{n_draws:>10} {legacy_ms:>12.2f} {build_ms:>11.2f} {index_ms:>11.3f} {legacy_ms / index_ms:>7.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark du chargement de l'historique: CSV (pandas) vs fichier binaire (np.memmap),
+et coût de l'ingestion d'un tirage: réécriture complète (DataFrame concaténé puis
+fichier réécrit) vs ajout en place (DrawHistory et DrawStore.append)
+
+Usage: python benchmarks/benchmark_draw_store.py
+"""
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+# Ajout du répertoire src au path pour les imports
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+from preprocessing.draw_history import DrawHistory
+from preprocessing.draw_store import DrawStore
+
+NUMBER_COLUMNS = ['n1', 'n2', 'n3', 'n4', 'n5']
+STAR_COLUMNS = ['s1', 's2']
+
+
+def create_synthetic_data(n_draws, seed=42):
+    """
+    Génération de tirages synthétiques au format du CSV historique
+    """
+    rng = np.random.default_rng(seed)
+    numbers = np.sort(rng.random((n_draws, 50)).argsort(axis=1)[:, :5] + 1, axis=1)
+    stars = np.sort(rng.random((n_draws, 12)).argsort(axis=1)[:, :2] + 1, axis=1)
+    data = pd.DataFrame(np.hstack([numbers, stars]), columns=NUMBER_COLUMNS + STAR_COLUMNS)
+    # Les dates bouclent pour rester dans la plage des Timestamp pandas
+    dates = pd.Timestamp('1970-01-01') + pd.to_timedelta(np.arange(n_draws) % 100_000, unit='D')
+    data.insert(0, 'date', dates.strftime('%Y-%m-%d'))
+    return data
+
+
+def best_time(func, repeat=3):
+    """
+    Meilleur temps d'exécution (ms) et résultat
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def ingestion_times(data, store_path, n_appends=20):
+    """
+    Temps moyen d'ingestion d'un tirage (ms): réécriture complète vs ajout en place
+    """
+    row = data.iloc[[-1]]
+    date = pd.Timestamp(row['date'].iloc[0])
+    numbers = row[NUMBER_COLUMNS].iloc[0].tolist()
+    stars = row[STAR_COLUMNS].iloc[0].tolist()
+    days = np.array([np.datetime64(date.date(), 'D')]).astype(np.int32)
+
+    start = time.perf_counter()
+    for _ in range(n_appends):
+        data = pd.concat([data, row], ignore_index=True)
+        DrawStore.from_dataframe(data, store_path, NUMBER_COLUMNS, STAR_COLUMNS)
+    rewrite_ms = (time.perf_counter() - start) * 1000 / n_appends
+
+    # Premier ajout hors mesure: il donne sa capacité au fichier et aux tableaux
+    history = DrawHistory.from_dataframe(data)
+    history.append(date, numbers, stars)
+    DrawStore.append(store_path, np.array([numbers]), np.array([stars]), days)
+    start = time.perf_counter()
+    for _ in range(n_appends):
+        history = history.copy()
+        history.append(date, numbers, stars)
+        DrawStore.append(store_path, np.array([numbers]), np.array([stars]), days)
+    append_ms = (time.perf_counter() - start) * 1000 / n_appends
+    return rewrite_ms, append_ms
+
+
+def main():
+    print(f"{'tirages':>10} {'csv (ms)':>10} {'open (ms)':>10} {'df (ms)':>9} "
+          f"{'csv (Mo)':>9} {'store (Mo)':>11} {'mémoire csv':>12} {'mémoire df':>11} "
+          f"{'réécriture (ms)':>16} {'ajout (ms)':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_draws in [1_000, 100_000, 1_000_000]:
+            csv_path = os.path.join(tmp, f"history_{n_draws}.csv")
+            store_path = os.path.join(tmp, f"history_{n_draws}.draws")
+            create_synthetic_data(n_draws).to_csv(csv_path, index=False)
+            DrawStore.from_csv(csv_path, store_path, NUMBER_COLUMNS, STAR_COLUMNS)
+
+            csv_ms, csv_data = best_time(lambda: pd.read_csv(csv_path))
+            open_ms, store = best_time(lambda: DrawStore.open(store_path))
+            df_ms, store_data = best_time(lambda: DrawStore.open(store_path).to_dataframe(NUMBER_COLUMNS, STAR_COLUMNS))
+
+            assert np.array_equal(csv_data[NUMBER_COLUMNS + STAR_COLUMNS].to_numpy(),
+                                  store_data[NUMBER_COLUMNS + STAR_COLUMNS].to_numpy())
+
+            store_size = os.path.getsize(store_path)
+            rewrite_ms, append_ms = ingestion_times(csv_data, store_path)
+
+            print(f"{n_draws:>10} {csv_ms:>10.2f} {open_ms:>10.3f} {df_ms:>9.2f} "
+                  f"{os.path.getsize(csv_path) / 1e6:>9.2f} {store_size / 1e6:>11.2f} "
+                  f"{csv_data.memory_usage(deep=True).sum() / 1e6:>10.2f}Mo "
+                  f"{store_data.memory_usage(deep=True).sum() / 1e6:>9.2f}Mo "
+                  f"{rewrite_ms:>16.2f} {append_ms:>11.3f}")
+
+
+if __name__ == '__main__':
+    main()
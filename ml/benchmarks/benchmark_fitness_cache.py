@@ -0,0 +1,58 @@
+"""
+Benchmark du cache de fitness du GA: taux de succès et temps d'exécution, avec et sans cache
+
+Usage: python benchmarks/benchmark_fitness_cache.py
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+# Ajout du répertoire src au path pour les imports
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+from training.genetic_algorithm import GeneticAlgorithm
+
+COLUMNS = ['numero1', 'numero2', 'numero3', 'numero4', 'numero5', 'etoile1', 'etoile2']
+
+
+def create_synthetic_history(n_draws=2_000, seed=42):
+    """
+    Génération d'un historique synthétique au format de l'entraînement
+    """
+    rng = np.random.default_rng(seed)
+    numbers = np.sort(rng.random((n_draws, 50)).argsort(axis=1)[:, :5] + 1, axis=1)
+    stars = np.sort(rng.random((n_draws, 12)).argsort(axis=1)[:, :2] + 1, axis=1)
+    return pd.DataFrame(np.hstack([numbers, stars]), columns=COLUMNS)
+
+
+def run(history, engine, population_size, generations, cache_size):
+    """
+    Exécution complète: temps (ms) et compteurs de l'exécution
+    """
+    ga = GeneticAlgorithm(population_size=population_size, generations=generations, engine=engine,
+                          seed=0, fitness_cache_size=cache_size)
+    ga.load_historical_data(history)
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        ga.generate_combinations(num_combinations=5)
+    return (time.perf_counter() - start) * 1000, ga.run_stats
+
+
+def main():
+    history = create_synthetic_history()
+    print(f"{'moteur':>7} {'population':>11} {'générations':>12} {'sans cache (ms)':>16} "
+          f"{'avec cache (ms)':>16} {'demandes':>9} {'évitées':>8} {'succès':>7}")
+    for engine in ['deap', 'numpy']:
+        for population_size, generations in [(100, 50), (1_000, 50), (1_000, 200)]:
+            uncached_ms, _ = run(history, engine, population_size, generations, cache_size=0)
+            cached_ms, stats = run(history, engine, population_size, generations, cache_size=100_000)
+            print(f"{engine:>7} {population_size:>11} {generations:>12} {uncached_ms:>16.1f} {cached_ms:>16.1f} "
+                  f"{stats['fitness_requests']:>9} {stats['evaluations_saved']:>8} {stats['hit_ratio']:>7.1%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark du chargement de l'algorithme génétique: pickle face à l'artefact .npz
+
+- pickle (ancien format): dictionnaires de fréquences seuls, la fitness
+  n'est pas complète après chargement (originalité aléatoire);
+- pickle complet: dictionnaires et tirages, tables reconstruites au chargement;
+- .npz projeté en mémoire / lu entièrement: tables denses et masques de bits.
+
+Pour chaque format: taille du fichier, temps de chargement jusqu'à une
+fitness utilisable et temps de la première évaluation d'une population.
+
+Usage: python benchmarks/benchmark_ga_artifact.py
+"""
+import os
+import pickle
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+# Ajout du répertoire src au path pour les imports
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+from training.ga_artifact import load_artifact
+from training.genetic_algorithm import GeneticAlgorithm
+
+COLUMNS = ['numero1', 'numero2', 'numero3', 'numero4', 'numero5', 'etoile1', 'etoile2']
+
+
+def create_synthetic_history(n_draws, seed=42):
+    """
+    Génération d'un historique synthétique au format de l'entraînement
+    """
+    rng = np.random.default_rng(seed)
+    numbers = np.sort(rng.random((n_draws, 50)).argsort(axis=1)[:, :5] + 1, axis=1)
+    stars = np.sort(rng.random((n_draws, 12)).argsort(axis=1)[:, :2] + 1, axis=1)
+    return pd.DataFrame(np.hstack([numbers, stars]), columns=COLUMNS)
+
+
+def load_legacy(ga, path):
+    ga.load(path)
+
+
+def load_full_pickle(ga, path):
+    with open(path, 'rb') as f:
+        data = pickle.load(f)
+    ga.load_historical_data(pd.DataFrame(data['historical_draws'], columns=COLUMNS))
+
+
+def load_npz(mmap):
+    def load(ga, path):
+        load_artifact(ga, path, mmap=mmap)
+        ga._frequencies_from_tables()
+    return load
+
+
+def best_of(function, repeats=5):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main():
+    directory = tempfile.mkdtemp()
+    population = np.array(create_synthetic_history(1_000, seed=1).to_numpy(), dtype=np.uint8)
+
+    print(f"{'tirages':>8} {'format':>16} {'taille (Ko)':>12} {'chargement (ms)':>16} {'1re éval. (ms)':>15}")
+    for n_draws in [1_000, 100_000]:
+        ga = GeneticAlgorithm(engine='numpy', seed=0)
+        ga.load_historical_data(create_synthetic_history(n_draws))
+        expected = ga._score_population(population)
+
+        legacy_path = os.path.join(directory, f'legacy_{n_draws}.pkl')
+        full_path = os.path.join(directory, f'full_{n_draws}.pkl')
+        npz_path = os.path.join(directory, f'artifact_{n_draws}.npz')
+        ga.save(legacy_path)
+        ga.save(npz_path)
+        with open(full_path, 'wb') as f:
+            pickle.dump({'number_frequencies': ga.number_frequencies, 'star_frequencies': ga.star_frequencies,
+                         'pair_frequencies': ga.pair_frequencies, 'historical_draws': ga.historical_draws}, f)
+
+        for name, path, load in [('pickle', legacy_path, load_legacy),
+                                 ('pickle complet', full_path, load_full_pickle),
+                                 ('npz memmap', npz_path, load_npz(True)),
+                                 ('npz lu', npz_path, load_npz(False))]:
+            restored = GeneticAlgorithm(engine='numpy', seed=0)
+            load_time = best_of(lambda: load(restored, path))
+            start = time.perf_counter()
+            scores = restored.evaluate_population(population) if restored.number_frequency_table is not None \
+                else np.array([restored._evaluate_combination(ind.tolist())[0] for ind in population])
+            evaluation_time = (time.perf_counter() - start) * 1000
+            exact = 'identique' if np.array_equal(scores, expected) else 'différente'
+            print(f"{n_draws:>8} {name:>16} {os.path.getsize(path) / 1024:>12.1f} {load_time:>16.2f} "
+                  f"{evaluation_time:>15.2f}  fitness {exact}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark de la fitness du GA: évaluation scalaire par individu vs évaluation de la population entière
+
+L'évaluation en lot est mesurée sans le cache de fitness (_score_population).
+Avec l'originalité exacte (par défaut), chaque combinaison est comparée à
+chaque tirage de l'historique: le coût croît avec population x tirages. La
+formule des totaux (exact_originality=False) ne dépend pas de l'historique;
+son écart maximal à l'originalité exacte est affiché.
+
+Usage: python benchmarks/benchmark_ga_fitness.py
+"""
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+# Ajout du répertoire src au path pour les imports
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+from training.genetic_algorithm import GeneticAlgorithm
+
+COLUMNS = ['numero1', 'numero2', 'numero3', 'numero4', 'numero5', 'etoile1', 'etoile2']
+
+
+def create_synthetic_draws(n_draws, seed=42):
+    """
+    Génération de tirages synthétiques (numéros puis étoiles)
+    """
+    rng = np.random.default_rng(seed)
+    numbers = np.sort(rng.random((n_draws, 50)).argsort(axis=1)[:, :5] + 1, axis=1)
+    stars = np.sort(rng.random((n_draws, 12)).argsort(axis=1)[:, :2] + 1, axis=1)
+    return np.hstack([numbers, stars]).astype(np.uint8)
+
+
+def best_time(func, repeat=3):
+    """
+    Meilleur temps d'exécution (ms) et résultat
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main():
+    print(f"{'tirages':>10} {'population':>11} {'scalaire (ms)':>14} {'lot (ms)':>9} {'identique':>10} "
+          f"{'totaux (ms)':>12} {'écart totaux':>13}")
+    for n_draws in [1_000, 100_000, 1_000_000]:
+        history = pd.DataFrame(create_synthetic_draws(n_draws), columns=COLUMNS)
+        ga = GeneticAlgorithm(population_size=100, generations=1)
+        ga.load_historical_data(history)
+        approximate = GeneticAlgorithm(population_size=100, generations=1, exact_originality=False)
+        approximate.load_historical_data(history)
+
+        for population_size in [100, 1_000]:
+            population = create_synthetic_draws(population_size, seed=population_size)
+            individuals = population.tolist()
+
+            scalar_ms, expected = best_time(
+                lambda: [ga._evaluate_combination(ind)[0] for ind in individuals], repeat=1)
+            batch_ms, actual = best_time(lambda: ga._score_population(population))
+            totals_ms, approximated = best_time(lambda: approximate._score_population(population))
+
+            print(f"{n_draws:>10} {population_size:>11} {scalar_ms:>14.2f} {batch_ms:>9.2f} "
+                  f"{str(np.array_equal(expected, actual)):>10} {totals_ms:>12.3f} "
+                  f"{np.max(np.abs(approximated - actual)):>13.1e}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark de l'inférence: appel direct (lot de 1) vs ordonnanceur par micro-lots
+
+Usage: python benchmarks/benchmark_inference_batching.py [concurrence] [requêtes par client]
+"""
+import os
+import sys
+import time
+import threading
+import numpy as np
+from tensorflow import keras
+
+# Ajout du répertoire src au path pour les imports
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+from prediction.inference_scheduler import InferenceScheduler
+
+
+def create_model():
+    """
+    Modèle équivalent au modèle factice de l'API ML (séquences de 10 tirages)
+    """
+    model = keras.Sequential([
+        keras.layers.LSTM(64, input_shape=(10, 5)),
+        keras.layers.Dense(128, activation='relu'),
+        keras.layers.Dense(50, activation='softmax')
+    ])
+    model.compile(optimizer='adam', loss='categorical_crossentropy')
+    return model
+
+
+def run_clients(predict, concurrency, requests_per_client):
+    """
+    Lancement de clients concurrents et mesure des latences
+
+    Returns:
+        tuple: (latences en ms, durée totale en s)
+    """
+    latencies = []
+    lock = threading.Lock()
+    rng = np.random.default_rng(0)
+    X = rng.integers(1, 51, size=(1, 10, 5)).astype(np.float32)
+
+    def client():
+        local = []
+        for _ in range(requests_per_client):
+            start = time.perf_counter()
+            predict(X)
+            local.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return np.array(latencies), time.perf_counter() - start
+
+
+def report(label, latencies, elapsed):
+    print(f"{label:<28} p50={np.percentile(latencies, 50):8.2f} ms  "
+          f"p99={np.percentile(latencies, 99):8.2f} ms  "
+          f"débit={len(latencies) / elapsed:8.1f} req/s")
+
+
+def main():
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    requests_per_client = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    model = create_model()
+    # Préchauffage (traçage du graphe)
+    model.predict(np.zeros((1, 10, 5), dtype=np.float32), verbose=0)
+
+    print(f"Concurrence: {concurrency} clients x {requests_per_client} requêtes")
+    report("direct (lot de 1)", *run_clients(lambda X: model.predict(X, verbose=0), concurrency, requests_per_client))
+
+    class QuietModel:
+        def predict(self, X):
+            return model.predict(X, verbose=0)
+
+    for max_batch_size, max_wait_ms in [(8, 2), (32, 5), (64, 10)]:
+        scheduler = InferenceScheduler(QuietModel(), max_batch_size, max_wait_ms, name='benchmark')
+        latencies, elapsed = run_clients(scheduler.predict, concurrency, requests_per_client)
+        report(f"micro-lots ({max_batch_size}, {max_wait_ms} ms)", latencies, elapsed)
+        print(f"{'':<28} {scheduler.stats()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Passage à l'échelle du modèle en îles à budget de temps fixe
+
+Pour chaque nombre de cœurs (une île par cœur), le GA tourne pendant un
+budget de temps donné: nombre de générations par île, évaluations totales,
+débit et meilleure fitness obtenue.
+
+Usage: python benchmarks/benchmark_islands.py [budget en secondes] [cœurs max]
+"""
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+# Ajout du répertoire src au path pour les imports
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+from training.genetic_algorithm import GeneticAlgorithm
+
+COLUMNS = ['numero1', 'numero2', 'numero3', 'numero4', 'numero5', 'etoile1', 'etoile2']
+
+
+def create_synthetic_history(n_draws=2_000, seed=42):
+    """
+    Génération d'un historique synthétique au format de l'entraînement
+    """
+    rng = np.random.default_rng(seed)
+    numbers = np.sort(rng.random((n_draws, 50)).argsort(axis=1)[:, :5] + 1, axis=1)
+    stars = np.sort(rng.random((n_draws, 12)).argsort(axis=1)[:, :2] + 1, axis=1)
+    return pd.DataFrame(np.hstack([numbers, stars]), columns=COLUMNS)
+
+
+def main():
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    max_cores = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+
+    ga = GeneticAlgorithm(population_size=1_000, generations=1_000_000, engine='numpy', seed=0)
+    ga.load_historical_data(create_synthetic_history())
+
+    print(f"budget {budget} s, {os.cpu_count()} cœurs disponibles, population 1000 par île")
+    print(f"{'cœurs':>6} {'îles':>5} {'gén./île':>9} {'évaluations':>12} {'éval./s':>10} {'meilleure':>10}")
+    for cores in [c for c in [1, 2, 4, 8, 16] if c <= max_cores]:
+        combinations = ga.generate_combinations_parallel(
+            num_combinations=5, n_islands=cores, n_workers=cores, migration_interval=10, time_budget=budget
+        )
+        stats = ga.run_stats
+        print(f"{cores:>6} {stats['n_islands']:>5} {stats['generations']:>9} {stats['evaluations']:>12} "
+              f"{stats['evaluations'] / stats['elapsed_s']:>10.0f} {combinations[0]['fitness']:>10.4f}")
+
+
+if __name__ == '__main__':
+    main()
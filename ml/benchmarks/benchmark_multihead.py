@@ -0,0 +1,120 @@
+"""
+Benchmark du modèle LSTM multi-sorties face aux deux modèles séparés
+
+Historique synthétique avec une structure apprenable (les valeurs du tirage
+précédent ont plus de chances de ressortir). Les fenêtres des 80 % les plus
+anciens servent à l'entraînement, les 20 % les plus récents à l'évaluation.
+
+Mesures: temps d'entraînement (même nombre d'époques), temps d'un appel
+d'inférence pour les deux vecteurs de probabilités, et précision sur la
+période d'évaluation (part des numéros/étoiles tirés parmi les 5/2 valeurs
+les plus probables).
+
+Usage: python benchmarks/benchmark_multihead.py [tirages] [époques]
+"""
+import os
+import sys
+import time
+import numpy as np
+
+# Ajout du répertoire src au path pour les imports
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+from preprocessing.sequence_windows import sliding_windows, target_distribution
+from training.lstm_multihead_model import LSTMMultiHeadModel
+from training.lstm_numbers_model import LSTMNumbersModel
+from training.lstm_stars_model import LSTMStarsModel
+from training.window_dataset import time_split
+
+SEQUENCE_LENGTH = 10
+BATCH_SIZE = 64
+
+
+def create_history(n_draws, seed=42, repeat_weight=6.0):
+    """
+    Tirages dont les valeurs du tirage précédent sont favorisées
+    """
+    rng = np.random.default_rng(seed)
+
+    def draw(previous, max_value, k):
+        weights = np.ones(max_value)
+        weights[previous - 1] += repeat_weight
+        return np.sort(rng.choice(max_value, k, replace=False, p=weights / weights.sum()) + 1)
+
+    numbers = np.zeros((n_draws, 5), dtype=np.uint8)
+    stars = np.zeros((n_draws, 2), dtype=np.uint8)
+    numbers[0], stars[0] = draw(np.zeros(0, int), 50, 5), draw(np.zeros(0, int), 12, 2)
+    for i in range(1, n_draws):
+        numbers[i], stars[i] = draw(numbers[i - 1], 50, 5), draw(stars[i - 1], 12, 2)
+    return numbers, stars
+
+
+def top_k_hits(probabilities, targets, k):
+    """
+    Part des valeurs tirées parmi les k classes les plus probables (hors padding)
+    """
+    top = np.argsort(-probabilities[:, 1:], axis=1)[:, :k] + 1
+    return float((top[:, :, None] == targets[:, None, :]).any(axis=1).mean())
+
+
+def timed_fit(model, X, y, epochs):
+    start = time.perf_counter()
+    model.fit(X, y, epochs=epochs, batch_size=BATCH_SIZE, verbose=0)
+    return time.perf_counter() - start
+
+
+def call_time(function, repeats=50):
+    function()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        function()
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def main():
+    n_draws = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    epochs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    numbers, stars = create_history(n_draws)
+
+    X_numbers, y_numbers = sliding_windows(numbers, SEQUENCE_LENGTH)
+    X_stars, y_stars = sliding_windows(stars, SEQUENCE_LENGTH)
+    split = time_split(len(X_numbers))
+    print(f"{n_draws} tirages, {split} fenêtres d'entraînement, {len(X_numbers) - split} d'évaluation, "
+          f"{epochs} époques")
+
+    # Deux modèles séparés: deux fenêtrages, deux fit, deux appels
+    numbers_model = LSTMNumbersModel(sequence_length=SEQUENCE_LENGTH)
+    stars_model = LSTMStarsModel(sequence_length=SEQUENCE_LENGTH)
+    numbers_model._build_model()
+    stars_model._build_model()
+    separate_time = (timed_fit(numbers_model.model, X_numbers[:split], target_distribution(y_numbers[:split], 51), epochs)
+                     + timed_fit(stars_model.model, X_stars[:split], target_distribution(y_stars[:split], 13), epochs))
+    number_probs = numbers_model.model.predict(X_numbers[split:], verbose=0)
+    star_probs = stars_model.model.predict(X_stars[split:], verbose=0)
+    separate_hits = (top_k_hits(number_probs, y_numbers[split:], 5), top_k_hits(star_probs, y_stars[split:], 2))
+    last_numbers = np.ascontiguousarray(X_numbers[-1:], dtype=np.int32)
+    last_stars = np.ascontiguousarray(X_stars[-1:], dtype=np.int32)
+    separate_call = call_time(lambda: (numbers_model.model(last_numbers, training=False),
+                                       stars_model.model(last_stars, training=False)))
+
+    # Modèle multi-sorties: un fenêtrage joint, un fit, un appel
+    multihead = LSTMMultiHeadModel(sequence_length=SEQUENCE_LENGTH)
+    multihead._build_model()
+    X_joint, y_joint = sliding_windows(multihead.joint_draws(numbers, stars), SEQUENCE_LENGTH)
+    y_train = {'numbers': target_distribution(y_joint[:split, :5], 51),
+               'stars': target_distribution(y_joint[:split, 5:] - 50, 13)}
+    multihead_time = timed_fit(multihead.model, X_joint[:split], y_train, epochs)
+    outputs = multihead.model.predict(X_joint[split:], verbose=0)
+    multihead_hits = (top_k_hits(outputs['numbers'], y_numbers[split:], 5), top_k_hits(outputs['stars'], y_stars[split:], 2))
+    multihead_call = call_time(lambda: multihead.predict_probabilities(numbers[-SEQUENCE_LENGTH:], stars[-SEQUENCE_LENGTH:]))
+
+    # Précision du hasard: 5/50 numéros et 2/12 étoiles
+    print(f"{'modèle':>16} {'entraînement (s)':>17} {'appel (ms)':>11} {'numéros top-5':>14} {'étoiles top-2':>14}")
+    print(f"{'hasard':>16} {'':>17} {'':>11} {5 / 50:>14.3f} {2 / 12:>14.3f}")
+    for label, elapsed, call, hits in [('séparés', separate_time, separate_call, separate_hits),
+                                       ('multi-sorties', multihead_time, multihead_call, multihead_hits)]:
+        print(f"{label:>16} {elapsed:>17.1f} {call:>11.2f} {hits[0]:>14.3f} {hits[1]:>14.3f}")
+    print(f"temps d'entraînement gagné: {(1 - multihead_time / separate_time) * 100:.0f} %")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark du terme d'originalité du GA: intersections d'ensembles vs popcount sur masques de bits
+
+Usage: python benchmarks/benchmark_originality.py
+"""
+import os
+import sys
+import time
+import numpy as np
+
+# Ajout du répertoire src au path pour les imports
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+from training.combination_masks import encode_draws, originality
+
+
+def create_synthetic_draws(n_draws, seed=42):
+    """
+    Génération de tirages synthétiques (numéros puis étoiles)
+    """
+    rng = np.random.default_rng(seed)
+    numbers = np.sort(rng.random((n_draws, 50)).argsort(axis=1)[:, :5] + 1, axis=1)
+    stars = np.sort(rng.random((n_draws, 12)).argsort(axis=1)[:, :2] + 1, axis=1)
+    return np.hstack([numbers, stars])
+
+
+def set_originality(numbers, stars, draws):
+    """
+    Calcul historique: deux ensembles construits par tirage
+    """
+    similarities = []
+    for draw in draws:
+        common_numbers = len(set(numbers).intersection(set(draw[:5])))
+        common_stars = len(set(stars).intersection(set(draw[5:])))
+        similarities.append((common_numbers / 5 + common_stars / 2) / 2)
+    return 1.0 - sum(similarities) / len(similarities)
+
+
+def mean_time(func, combinations, budget=2.0):
+    """
+    Temps moyen par combinaison (ms), dans la limite d'un budget en secondes
+    """
+    start = time.perf_counter()
+    count = 0
+    for numbers, stars in combinations:
+        func(numbers, stars)
+        count += 1
+        if time.perf_counter() - start > budget:
+            break
+    return (time.perf_counter() - start) * 1000 / count
+
+
+def main():
+    rng = np.random.default_rng(0)
+    combinations = [(sorted(rng.choice(np.arange(1, 51), 5, replace=False).tolist()),
+                     sorted(rng.choice(np.arange(1, 13), 2, replace=False).tolist()))
+                    for _ in range(100)]
+
+    print(f"{'tirages':>10} {'ensembles (ms)':>15} {'popcount (ms)':>14} {'gain':>8} {'écart max':>10}")
+    for n_draws in [1_000, 10_000, 100_000, 1_000_000]:
+        draws = create_synthetic_draws(n_draws)
+        draws_list = draws.tolist()
+        number_masks, star_masks = encode_draws(draws)
+
+        set_ms = mean_time(lambda n, s: set_originality(n, s, draws_list), combinations)
+        mask_ms = mean_time(lambda n, s: originality(n, s, number_masks, star_masks), combinations)
+
+        numbers, stars = combinations[0]
+        error = abs(set_originality(numbers, stars, draws_list) - originality(numbers, stars, number_masks, star_masks))
+        print(f"{n_draws:>10} {set_ms:>15.3f} {mask_ms:>14.3f} {set_ms / mask_ms:>7.0f}x {error:>10.1e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark de la table des scores: calcul hors ligne, ouverture et classement d'une grille
+
+Compare le classement d'une grille par la table projetée en mémoire avec
+le calcul direct (évaluation des C(50,5) ensembles de numéros).
+
+Usage: python benchmarks/benchmark_score_table.py
+"""
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+
+# Ajout du répertoire src au path pour les imports
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+from preprocessing.draw_store import DrawStore
+from prediction.score_table import ScoreTable
+from training.export_score_table import compute_scores, export_score_table
+from training.genetic_algorithm import GeneticAlgorithm
+
+
+def create_synthetic_store(path, n_draws=2_000, seed=42):
+    """
+    Génération d'un fichier de tirages synthétique
+    """
+    rng = np.random.default_rng(seed)
+    numbers = np.sort(rng.random((n_draws, 50)).argsort(axis=1)[:, :5] + 1, axis=1)
+    stars = np.sort(rng.random((n_draws, 12)).argsort(axis=1)[:, :2] + 1, axis=1)
+    return DrawStore.write(path, numbers, stars)
+
+
+def main():
+    directory = tempfile.mkdtemp()
+    store = create_synthetic_store(os.path.join(directory, 'history.draws'))
+    table_path = os.path.join(directory, 'history.scores')
+
+    start = time.perf_counter()
+    export_score_table(store.path, table_path)
+    print(f"calcul et écriture de la table: {time.perf_counter() - start:.2f} s, "
+          f"{os.path.getsize(table_path) / 1e6:.1f} Mo")
+
+    start = time.perf_counter()
+    table = ScoreTable.open(table_path)
+    print(f"ouverture (memmap): {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    rng = np.random.default_rng(0)
+    tickets = [(sorted(rng.choice(50, 5, replace=False) + 1), sorted(rng.choice(12, 2, replace=False) + 1))
+               for _ in range(200)]
+    start = time.perf_counter()
+    for numbers, stars in tickets:
+        table.lookup(numbers, stars)
+    print(f"classement par la table: {(time.perf_counter() - start) / len(tickets) * 1000:.3f} ms par grille")
+
+    # Calcul direct: tous les scores partiels à chaque demande
+    ga = GeneticAlgorithm(engine='exact')
+    ga.load_historical_data(store)
+    start = time.perf_counter()
+    number_scores, star_scores = compute_scores(ga)
+    score = number_scores[0] + star_scores[0]
+    rank = 1 + sum(int(np.count_nonzero(number_scores + g > score)) for g in star_scores)
+    print(f"calcul direct: {(time.perf_counter() - start) * 1000:.0f} ms par grille "
+          f"(rang {rank}, table: {table.lookup([1, 2, 3, 4, 5], [1, 2])['rank']})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark de la préparation des séquences LSTM: boucles Python face aux vues glissantes
+
+Pour chaque taille d'historique: temps et pic de mémoire (tracemalloc) de la
+construction de X (fenêtres de 10 tirages) et des cibles, avec les boucles
+d'origine de `_prepare_data` (copies flatten(), one-hot float64 par tirage)
+et avec preprocessing.sequence_windows (vue à pas, one-hot float32 par
+indexation, ou cibles entières uint8).
+
+Usage: python benchmarks/benchmark_sequence_windows.py [tirages max des boucles]
+"""
+import os
+import sys
+import time
+import tracemalloc
+import numpy as np
+
+# Ajout du répertoire src au path pour les imports
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+from preprocessing.sequence_windows import sliding_windows, one_hot_targets, sparse_targets
+
+SEQUENCE_LENGTH = 10
+
+
+def legacy_prepare(numbers, sequence_length, num_classes):
+    """
+    Boucles d'origine de LSTMNumbersModel._prepare_data (sans la division)
+    """
+    X, y = [], []
+    for i in range(len(numbers) - sequence_length):
+        X.append(numbers[i:i + sequence_length].flatten())
+        y.append(numbers[i + sequence_length])
+    X = np.array(X)
+    y = np.array(y)
+
+    y_one_hot = []
+    for draw in y:
+        draw_one_hot = np.zeros((numbers.shape[1], num_classes))
+        for i, num in enumerate(draw):
+            draw_one_hot[i, num] = 1
+        y_one_hot.append(draw_one_hot)
+    return X, np.array(y_one_hot)
+
+
+def vectorized_prepare(numbers, sequence_length, num_classes):
+    X, y = sliding_windows(numbers, sequence_length)
+    return X, one_hot_targets(y, num_classes)
+
+
+def sparse_prepare(numbers, sequence_length, num_classes):
+    X, y = sliding_windows(numbers, sequence_length)
+    return X, sparse_targets(y, num_classes)
+
+
+def measure(function, *args):
+    """
+    Temps (s) et pic de mémoire (Mo) d'une préparation
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    X, y = function(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1e6, X.nbytes / 1e6 if X.base is None else 0.0, y.nbytes / 1e6
+
+
+def main():
+    legacy_limit = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    rng = np.random.default_rng(0)
+
+    print(f"{'tirages':>9} {'méthode':>16} {'temps (s)':>10} {'pic (Mo)':>10} {'X (Mo)':>8} {'y (Mo)':>8}")
+    for n_draws in [100_000, 200_000, 1_000_000, 3_000_000]:
+        numbers = np.sort(rng.integers(1, 51, size=(n_draws, 5)), axis=1)
+        # Même type que la sortie de DataFrame.values dans la version d'origine
+        methods = [('vues + one-hot', vectorized_prepare, numbers.astype(np.uint8)),
+                   ('vues + entiers', sparse_prepare, numbers.astype(np.uint8))]
+        if n_draws <= legacy_limit:
+            methods.insert(0, ('boucles', legacy_prepare, numbers))
+        for name, function, values in methods:
+            elapsed, peak, x_size, y_size = measure(function, values, SEQUENCE_LENGTH, 51)
+            print(f"{n_draws:>9} {name:>16} {elapsed:>10.3f} {peak:>10.1f} {x_size:>8.1f} {y_size:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""
+Mesure de la mémoire par worker gunicorn, avec et sans segment partagé
+
+Un répertoire de travail temporaire est préparé avec un historique
+synthétique (et, si fourni, les modèles exportés .npz), puis gunicorn est
+lancé dans chaque mode. Pour chaque worker, RSS et PSS (mémoire
+proportionnelle, qui répartit les pages partagées entre processus) sont lus
+dans /proc/<pid>/smaps_rollup.
+
+Usage: python benchmarks/benchmark_shared_memory.py [tirages] [workers] [répertoire des .npz]
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+import numpy as np
+import pandas as pd
+
+ML_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def create_workdir(n_draws, models_dir=None):
+    """
+    Préparation d'un répertoire de travail (data/ et models/)
+    """
+    workdir = tempfile.mkdtemp(prefix='eurogenius_bench_')
+    os.makedirs(os.path.join(workdir, 'data'))
+    os.makedirs(os.path.join(workdir, 'models'))
+
+    rng = np.random.default_rng(42)
+    numbers = np.sort(rng.random((n_draws, 50)).argsort(axis=1)[:, :5] + 1, axis=1)
+    stars = np.sort(rng.random((n_draws, 12)).argsort(axis=1)[:, :2] + 1, axis=1)
+    data = pd.DataFrame(np.hstack([numbers, stars]), columns=['n1', 'n2', 'n3', 'n4', 'n5', 's1', 's2'])
+    data.insert(0, 'date', pd.Timestamp('2004-02-13') + pd.to_timedelta(np.arange(n_draws) * 7, unit='D'))
+    data.to_csv(os.path.join(workdir, 'data', 'euromillions_history.csv'), index=False)
+
+    if models_dir:
+        for name in ['lstm_numbers_model.npz', 'lstm_stars_model.npz']:
+            shutil.copy(os.path.join(models_dir, name), os.path.join(workdir, 'models', name))
+    return workdir
+
+
+def memory_kb(pid):
+    """
+    RSS et PSS d'un processus (ko)
+    """
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            key, _, rest = line.partition(':')
+            if key in ('Rss', 'Pss'):
+                values[key] = int(rest.split()[0])
+    return values['Rss'], values['Pss']
+
+
+def worker_pids(master_pid):
+    """
+    PID des workers (processus enfants du maître gunicorn)
+    """
+    with open(f"/proc/{master_pid}/task/{master_pid}/children") as f:
+        return [int(pid) for pid in f.read().split()]
+
+
+def measure(workdir, n_workers, shared, port):
+    """
+    Lancement de gunicorn et mesure de la mémoire des workers
+    """
+    env = dict(
+        os.environ,
+        ML_SHARED_MEMORY='1' if shared else '0',
+        ML_SHARED_SEGMENT=os.path.join(workdir, 'segment.seg'),
+        ML_RUNTIME='numpy',
+        GUNICORN_WORKERS=str(n_workers),
+        PORT=str(port)
+    )
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', os.path.join(ML_DIR, 'gunicorn.conf.py'), 'app:app'],
+        cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        # Attente de la disponibilité (sollicitation répétée de tous les workers)
+        deadline = time.monotonic() + 600
+        ready = 0
+        while ready < 4 * n_workers and time.monotonic() < deadline:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/api/statistics", timeout=5):
+                    ready += 1
+            except (urllib.error.URLError, ConnectionError, OSError):
+                time.sleep(0.2)
+
+        pids = worker_pids(process.pid)
+        usage = [memory_kb(pid) for pid in pids]
+    finally:
+        process.terminate()
+        process.wait()
+
+    label = 'partagé' if shared else 'par worker'
+    rss = np.mean([u[0] for u in usage]) / 1024
+    pss = np.mean([u[1] for u in usage]) / 1024
+    print(f"{label:<12} workers={len(pids)}  RSS moyen={rss:8.1f} Mo  PSS moyen={pss:8.1f} Mo  "
+          f"PSS total={sum(u[1] for u in usage) / 1024:8.1f} Mo")
+
+
+def main():
+    n_draws = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    n_workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    models_dir = sys.argv[3] if len(sys.argv) > 3 else None
+
+    workdir = create_workdir(n_draws, models_dir)
+    try:
+        print(f"{n_draws} tirages, {n_workers} workers")
+        measure(workdir, n_workers, shared=False, port=5201)
+        measure(workdir, n_workers, shared=True, port=5202)
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == '__main__':
+    main()
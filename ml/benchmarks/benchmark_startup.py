@@ -0,0 +1,71 @@
+"""
+Mesure du temps de démarrage du service ML (mode bloquant vs arrière-plan)
+
+Pour chaque mode, le service est lancé dans un sous-processus puis interrogé
+jusqu'à ce que /health/live et /health/ready répondent. Les durées par étape
+renvoyées par /health/ready sont également affichées.
+
+Usage: python benchmarks/benchmark_startup.py
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+ML_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def poll(url, deadline):
+    """
+    Interrogation d'une URL jusqu'à obtenir une réponse 200
+
+    Returns:
+        tuple: (instant de succès, corps JSON) ou (None, None) si délai dépassé
+    """
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                return time.monotonic(), json.loads(response.read())
+        except (urllib.error.URLError, ConnectionError, OSError):
+            time.sleep(0.05)
+    return None, None
+
+
+def measure(mode, port, timeout=300):
+    """
+    Démarrage du service dans le mode donné et mesure des délais
+    """
+    env = dict(os.environ, ML_STARTUP_MODE=mode, PORT=str(port))
+    start = time.monotonic()
+    process = subprocess.Popen(
+        [sys.executable, os.path.join('src', 'app.py')],
+        cwd=ML_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        deadline = start + timeout
+        base = f"http://127.0.0.1:{port}"
+        live_at, _ = poll(f"{base}/health/live", deadline)
+        ready_at, ready = poll(f"{base}/health/ready", deadline)
+    finally:
+        process.terminate()
+        process.wait()
+
+    def elapsed(at):
+        return f"{(at - start) * 1000:8.0f} ms" if at else "   timeout"
+
+    print(f"{mode:<10} live: {elapsed(live_at)}   ready: {elapsed(ready_at)}")
+    if ready:
+        for name, stage in ready['data']['stages'].items():
+            print(f"{'':<10} - {name:<18} {stage['duration_ms']} ms")
+
+
+def main():
+    measure('blocking', 5101)
+    measure('background', 5102)
+
+
+if __name__ == '__main__':
+    main()
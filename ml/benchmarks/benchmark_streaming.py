@@ -0,0 +1,100 @@
+"""
+Benchmark de l'entraînement LSTM en flux (tf.data) face aux tableaux en mémoire
+
+Pour chaque taille d'historique (fichier de tirages synthétique):
+    - débit du seul pipeline d'entrée sur une époque (fenêtres/s), en
+      mémoire (tableaux préparés puis Dataset.from_tensor_slices) et en flux
+      depuis le DrawStore, sans et avec cache;
+    - débit d'une époque d'entraînement du modèle des étoiles (échantillons/s).
+
+Usage: python benchmarks/benchmark_streaming.py [tirages de l'entraînement]
+"""
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import tensorflow as tf
+
+# Ajout du répertoire src au path pour les imports
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+from preprocessing.draw_store import DrawStore
+from preprocessing.sequence_windows import sliding_windows, target_distribution
+from training.lstm_stars_model import LSTMStarsModel
+from training.window_dataset import streaming_datasets, time_split
+
+SEQUENCE_LENGTH = 10
+BATCH_SIZE = 256
+
+
+def create_synthetic_store(path, n_draws, seed=42):
+    """
+    Génération d'un fichier de tirages synthétique
+    """
+    rng = np.random.default_rng(seed)
+    numbers = np.sort(rng.random((n_draws, 50)).argsort(axis=1)[:, :5] + 1, axis=1)
+    stars = np.sort(rng.random((n_draws, 12)).argsort(axis=1)[:, :2] + 1, axis=1)
+    return DrawStore.write(path, numbers, stars)
+
+
+def in_memory_dataset(values, num_classes):
+    """
+    Chemin en mémoire: fenêtres et cibles matérialisées, puis lots mélangés
+    """
+    X, y = sliding_windows(np.asarray(values), SEQUENCE_LENGTH)
+    split = time_split(len(X))
+    X_train, y_train = np.ascontiguousarray(X[:split]), target_distribution(y[:split], num_classes)
+    dataset = tf.data.Dataset.from_tensor_slices((X_train, y_train)).shuffle(len(X_train)).batch(BATCH_SIZE)
+    return dataset, split, X_train.nbytes + y_train.nbytes
+
+
+def epoch_rate(dataset, n_samples):
+    """
+    Fenêtres par seconde sur une époque complète du pipeline
+    """
+    start = time.perf_counter()
+    for _ in dataset:
+        pass
+    return n_samples / (time.perf_counter() - start)
+
+
+def fit_rate(model, dataset, n_samples):
+    """
+    Échantillons par seconde sur une époque d'entraînement (après une époque de chauffe)
+    """
+    model.model.fit(dataset.take(2), epochs=1, verbose=0)
+    start = time.perf_counter()
+    model.model.fit(dataset, epochs=1, verbose=0)
+    return n_samples / (time.perf_counter() - start)
+
+
+def main():
+    fit_draws = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    directory = tempfile.mkdtemp()
+
+    print(f"{'tirages':>9} {'pipeline':>26} {'fenêtres/s':>12} {'tableaux (Mo)':>14}")
+    for n_draws in [100_000, 1_000_000]:
+        store = create_synthetic_store(os.path.join(directory, f"history_{n_draws}.draws"), n_draws)
+        dataset, n_train, size = in_memory_dataset(store.numbers, 51)
+        print(f"{n_draws:>9} {'mémoire':>26} {epoch_rate(dataset, n_train):>12.0f} {size / 1e6:>14.1f}")
+
+        for label, cache in [('flux', None), ('flux + cache mémoire', '')]:
+            train, _, n_train, _ = streaming_datasets(store.numbers, SEQUENCE_LENGTH, 51, BATCH_SIZE, cache=cache)
+            rate = epoch_rate(train, n_train)
+            if cache is not None:
+                # Deuxième époque: fenêtres relues depuis le cache
+                label, rate = f"{label} (2e)", epoch_rate(train, n_train)
+            print(f"{n_draws:>9} {label:>26} {rate:>12.0f} {0.0:>14.1f}")
+
+    store = create_synthetic_store(os.path.join(directory, 'history_fit.draws'), fit_draws)
+    print(f"\nentraînement du modèle des étoiles, {fit_draws} tirages, lots de {BATCH_SIZE}")
+    model = LSTMStarsModel(sequence_length=SEQUENCE_LENGTH, batch_size=BATCH_SIZE)
+    model._build_model()
+    dataset, n_train, _ = in_memory_dataset(store.stars, 13)
+    print(f"  mémoire: {fit_rate(model, dataset, n_train):.0f} échantillons/s")
+    train, _, n_train, _ = streaming_datasets(store.stars, SEQUENCE_LENGTH, 13, BATCH_SIZE)
+    print(f"  flux:    {fit_rate(model, train, n_train):.0f} échantillons/s")
+
+
+if __name__ == '__main__':
+    main()
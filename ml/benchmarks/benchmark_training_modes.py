@@ -0,0 +1,83 @@
+"""
+Benchmark des modes d'entraînement des LSTM: cibles denses, cibles entières, précision mixte
+
+Pour LSTMNumbersModel et LSTMStarsModel, sur un historique synthétique:
+    - mémoire des tableaux fournis à chaque époque (entrées + cibles), dont
+      les cibles one-hot float64 (n, k, classes) d'origine pour comparaison
+      (incompatibles avec la sortie du modèle, donc non entraînées);
+    - temps par lot d'une époque d'entraînement (après une époque de chauffe)
+      avec les distributions float32, les cibles entières uint8, puis les
+      cibles entières en précision mixte bfloat16.
+
+Usage: python benchmarks/benchmark_training_modes.py [tirages] [taille des lots]
+"""
+import os
+import sys
+import time
+import numpy as np
+
+# Ajout du répertoire src au path pour les imports
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+from preprocessing.sequence_windows import sliding_windows
+from training.lstm_numbers_model import LSTMNumbersModel
+from training.lstm_stars_model import LSTMStarsModel
+
+SEQUENCE_LENGTH = 10
+COLUMNS = {LSTMNumbersModel: ['numero1', 'numero2', 'numero3', 'numero4', 'numero5'],
+           LSTMStarsModel: ['etoile1', 'etoile2']}
+
+
+def create_history(n_draws, seed=42):
+    """
+    Historique synthétique au format des modèles d'entraînement
+    """
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    numbers = np.sort(rng.random((n_draws, 50)).argsort(axis=1)[:, :5] + 1, axis=1)
+    stars = np.sort(rng.random((n_draws, 12)).argsort(axis=1)[:, :2] + 1, axis=1)
+    return pd.DataFrame(np.hstack([numbers, stars]), columns=COLUMNS[LSTMNumbersModel] + COLUMNS[LSTMStarsModel])
+
+
+def step_time(model, X, y, batch_size):
+    """
+    Millisecondes par lot sur une époque (après une époque de chauffe)
+    """
+    model.fit(X[:4 * batch_size], y[:4 * batch_size], epochs=1, batch_size=batch_size, verbose=0)
+    start = time.perf_counter()
+    model.fit(X, y, epochs=1, batch_size=batch_size, verbose=0)
+    return (time.perf_counter() - start) / -(-len(X) // batch_size) * 1000
+
+
+def main():
+    n_draws = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 256
+    data = create_history(n_draws)
+    print(f"{n_draws} tirages, lots de {batch_size}")
+
+    print(f"{'modèle':>8} {'mode':>24} {'entrées (Mo)':>13} {'cibles (Mo)':>12} {'ms par lot':>11}")
+    for cls in [LSTMNumbersModel, LSTMStarsModel]:
+        label = 'numéros' if cls is LSTMNumbersModel else 'étoiles'
+        values = data[COLUMNS[cls]].to_numpy(dtype=np.uint8)
+        X, y = sliding_windows(values, SEQUENCE_LENGTH)
+        n_train = int(len(X) * 0.8)
+        num_classes = int(values.max()) + 1
+
+        # Préparation d'origine: entrées int64, cibles one-hot float64 (n, k, classes)
+        print(f"{label:>8} {'origine int64/float64':>24} {n_train * X.shape[1] * 8 / 1e6:>13.2f} "
+              f"{n_train * y.shape[1] * num_classes * 8 / 1e6:>12.2f} {'-':>11}")
+
+        for mode, sparse, mixed in [('distribution float32', False, False),
+                                    ('entiers uint8', True, False),
+                                    ('entiers uint8 + bf16', True, True)]:
+            model = cls(sequence_length=SEQUENCE_LENGTH, batch_size=batch_size,
+                        sparse_targets=sparse, mixed_precision=mixed)
+            model._build_model()
+            X_train, y_train, _, _ = model._prepare_data(data)
+            elapsed = step_time(model.model, X_train, y_train, batch_size)
+            print(f"{label:>8} {mode:>24} {X_train.nbytes / 1e6:>13.2f} {y_train.nbytes / 1e6:>12.2f} "
+                  f"{elapsed:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark de la reprise des élites archivées (warm start) face au départ à froid
+
+Une suite d'exécutions du GA sur le même historique, comme le service qui
+régénère des combinaisons à chaque demande: à froid, chaque exécution part
+d'une population aléatoire; à chaud, un quart de la population initiale
+vient de l'archive alimentée par les exécutions précédentes. Pour chaque
+exécution: générations et temps nécessaires pour atteindre une fitness
+cible (fraction de l'optimum donné par la recherche exacte).
+
+Usage: python benchmarks/benchmark_warm_start.py [nombre d'exécutions]
+"""
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+# Ajout du répertoire src au path pour les imports
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+from training.elite_archive import EliteArchive
+from training.genetic_algorithm import GeneticAlgorithm
+from training.numpy_engine import NumpyGeneticEngine, top_unique
+
+COLUMNS = ['numero1', 'numero2', 'numero3', 'numero4', 'numero5', 'etoile1', 'etoile2']
+MAX_GENERATIONS = 500
+
+
+def create_synthetic_history(n_draws=2_000, seed=42):
+    """
+    Génération d'un historique synthétique au format de l'entraînement
+    """
+    rng = np.random.default_rng(seed)
+    numbers = np.sort(rng.random((n_draws, 50)).argsort(axis=1)[:, :5] + 1, axis=1)
+    stars = np.sort(rng.random((n_draws, 12)).argsort(axis=1)[:, :2] + 1, axis=1)
+    return pd.DataFrame(np.hstack([numbers, stars]), columns=COLUMNS)
+
+
+def time_to_target(ga, target, seed, archive=None):
+    """
+    Générations et temps pour atteindre la fitness cible (moteur NumPy)
+
+    Returns:
+        tuple: (générations, temps en ms, meilleure fitness)
+    """
+    ga.elite_archive = archive
+    seeds = ga._warm_start_seeds()
+    engine = NumpyGeneticEngine(ga, seed=seed)
+
+    start = time.perf_counter()
+    population = engine.initial_population(ga.population_size, seeds)
+    fitness = engine.evaluate(population)
+    generations = 0
+    while fitness.max() < target and generations < MAX_GENERATIONS:
+        population, fitness = engine.step(population, fitness)
+        generations += 1
+    elapsed = (time.perf_counter() - start) * 1000
+
+    # Versement des meilleures combinaisons dans l'archive, comme après generate_combinations
+    if archive is not None:
+        best, best_fitness = top_unique(population, fitness, ga._warm_start_size(), ga.numbers_to_draw)
+        archive.update(ga.history_fingerprint, best, best_fitness)
+    return generations, elapsed, float(fitness.max())
+
+
+def main():
+    n_runs = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+
+    ga = GeneticAlgorithm(population_size=200, engine='numpy', seed=0, fitness_cache_size=0)
+    ga.load_historical_data(create_synthetic_history())
+    optimum = GeneticAlgorithm(engine='exact')
+    optimum.load_historical_data(create_synthetic_history())
+    best = optimum.generate_combinations(num_combinations=1, verbose=False)[0]['fitness']
+    target = best - 0.002 * abs(best)
+    print(f"optimum {best:.6f}, cible {target:.6f}, population 200, {MAX_GENERATIONS} générations max")
+
+    archive = EliteArchive()
+    print(f"{'exécution':>10} {'froid gén.':>11} {'froid ms':>9} {'chaud gén.':>11} {'chaud ms':>9}")
+    totals = np.zeros(4)
+    for run in range(n_runs):
+        cold = time_to_target(ga, target, seed=run)
+        warm = time_to_target(ga, target, seed=run, archive=archive)
+        totals += [cold[0], cold[1], warm[0], warm[1]]
+        print(f"{run + 1:>10} {cold[0]:>11} {cold[1]:>9.1f} {warm[0]:>11} {warm[1]:>9.1f}")
+    totals /= n_runs
+    print(f"{'moyenne':>10} {totals[0]:>11.1f} {totals[1]:>9.1f} {totals[2]:>11.1f} {totals[3]:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Configuration gunicorn du service ML
+
+Usage (depuis le répertoire ml/): gunicorn -c gunicorn.conf.py app:app
+
+Avec ML_SHARED_MEMORY=1, le processus maître publie une seule fois les
+tirages, l'index et les poids des modèles NumPy dans un segment partagé
+(ML_SHARED_SEGMENT, par défaut /dev/shm/eurogenius_ml.seg) auquel tous les
+workers s'attachent en lecture seule. Les matrices de l'index et les poids
+sont lus directement dans le segment; chaque worker garde une copie compacte
+des tirages (uint8, environ 15 octets par tirage avec la date) pour les modèles.
+Le segment enregistre l'identité du fichier de tirages publié (inode, date de
+modification, taille): un worker relancé après une ingestion n'utilise pas
+ces tirages périmés et recharge l'historique depuis le fichier.
+
+Les tirages ingérés (POST /api/draws) sont ajoutés en fin de fichier de
+l'historique (data/euromillions_history.draws, sinon le CSV) sous un verrou
+fcntl exclusif; chaque worker compare l'identité du fichier (inode, date de
+modification, taille) à chaque requête et, sous le verrou partagé, ne lit
+que les tirages ajoutés (rechargement complet si le fichier a été remplacé).
+Sans fichier d'historique (données factices), un tirage ingéré reste propre
+au worker qui l'a reçu.
+"""
+import os
+import sys
+
+ML_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(ML_DIR, 'src'))
+
+pythonpath = os.path.join(ML_DIR, 'src')
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+workers = int(os.environ.get('GUNICORN_WORKERS', 2))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+
+
+def on_starting(server):
+    """
+    Publication du segment partagé avant le démarrage des workers
+    """
+    if os.environ.get('ML_SHARED_MEMORY', '0') != '1':
+        return
+
+    # Import limité au module de partage: app.py n'est jamais importé par le maître
+    from prediction.shared_memory import DEFAULT_SEGMENT_PATH, publish_from_files
+
+    segment_path = os.environ.setdefault('ML_SHARED_SEGMENT', DEFAULT_SEGMENT_PATH)
+    publish_from_files(
+        segment_path,
+        data_path=os.path.join('data', 'euromillions_history.csv'),
+        models_dir='models'
+    )
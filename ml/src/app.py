@@ -4,11 +4,30 @@ from flask import Flask, request, jsonify
 from flask_cors import CORS
 import pandas as pd
 import numpy as np
-import tensorflow as tf
-from tensorflow import keras
 import joblib
 import sys
 import logging
+import threading
+import fcntl
+import io
+from collections import namedtuple
+from contextlib import contextmanager
+
+# Ajout du répertoire courant au path pour les imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from preprocessing.draw_index import DrawIndex, NUMBER_COLUMNS, STAR_COLUMNS
+from preprocessing.draw_history import DrawHistory
+from preprocessing.draw_store import DrawStore, history_fingerprint
+from prediction.response_cache import ResponseCache
+from prediction.inference_scheduler import InferenceScheduler
+from prediction.startup import StartupTracker
+from prediction.numpy_runtime import NumpyModel
+from prediction.shared_memory import DEFAULT_SEGMENT_PATH, attach_service_state, history_file_identity
+from prediction.score_table import ScoreTable
+from prediction.strategies import (generate_random_combinations, generate_statistical_combinations,
+                                   generate_hot_combinations, generate_cold_combinations,
+                                   generate_rare_combinations, generate_balanced_combinations,
+                                   calculate_confidence_scores)
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
@@ -20,6 +39,9 @@ CORS(app)  # Activation de CORS pour permettre les requêtes cross-origin
 
 # Chargement des modèles
 def load_models():
+    # Import différé: TensorFlow n'est chargé qu'au moment de charger les modèles
+    from tensorflow import keras
+    
     try:
         # Chemins vers les modèles
         numbers_model_path = os.path.join('models', 'lstm_numbers_model.h5')
@@ -49,8 +71,21 @@ def load_models():
         stars_model = create_dummy_model(input_shape=(10, 2), output_units=12)
         return numbers_model, stars_model
 
+# Chargement des modèles exportés au format NumPy (sans TensorFlow)
+def load_numpy_models():
+    numbers_model_path = os.path.join('models', 'lstm_numbers_model.npz')
+    stars_model_path = os.path.join('models', 'lstm_stars_model.npz')
+    
+    if not (os.path.exists(numbers_model_path) and os.path.exists(stars_model_path)):
+        logger.error("Modèles NumPy introuvables, utilisation de TensorFlow")
+        return None
+    
+    return NumpyModel.load(numbers_model_path), NumpyModel.load(stars_model_path)
+
 # Création d'un modèle factice pour le développement
 def create_dummy_model(input_shape, output_units):
+    from tensorflow import keras
+    
     model = keras.Sequential([
         keras.layers.LSTM(64, input_shape=input_shape),
         keras.layers.Dense(128, activation='relu'),
@@ -59,22 +94,54 @@ def create_dummy_model(input_shape, output_units):
     model.compile(optimizer='adam', loss='categorical_crossentropy')
     return model
 
+# Fichiers de l'historique: format binaire projeté en mémoire, prioritaire sur le CSV s'il existe
+HISTORY_STORE_PATH = os.path.join('data', 'euromillions_history.draws')
+HISTORY_CSV_PATH = os.path.join('data', 'euromillions_history.csv')
+
+def history_source_path():
+    if os.path.exists(HISTORY_STORE_PATH):
+        return HISTORY_STORE_PATH
+    if os.path.exists(HISTORY_CSV_PATH):
+        return HISTORY_CSV_PATH
+    return None
+
+# Identité du fichier de l'historique: un fichier remplacé change d'inode,
+# un ajout en place change sa date de modification (et la taille d'un CSV)
+HistorySource = namedtuple('HistorySource', ['path', 'inode', 'mtime', 'size'])
+
+def history_source():
+    path = history_source_path()
+    try:
+        stat = os.stat(path) if path else None
+    except FileNotFoundError:
+        stat = None
+    if stat is None:
+        return None
+    return HistorySource(path, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+# Lecture du fichier de l'historique, sans repli sur des données factices
+def read_history_source(path):
+    if path == HISTORY_STORE_PATH:
+        data = DrawStore.open(path).to_dataframe(NUMBER_COLUMNS, STAR_COLUMNS)
+        logger.info("Données historiques chargées avec succès (format binaire)")
+        return data
+    
+    data = pd.read_csv(path)
+    logger.info("Données historiques chargées avec succès")
+    return data
+
 # Chargement des données historiques
 def load_historical_data():
     try:
-        # Chemin vers les données historiques
-        data_path = os.path.join('data', 'euromillions_history.csv')
+        data_path = history_source_path()
         
         # Vérification de l'existence du fichier
-        if not os.path.exists(data_path):
-            logger.error(f"Le fichier de données n'existe pas: {data_path}")
+        if data_path is None:
+            logger.error(f"Le fichier de données n'existe pas: {HISTORY_CSV_PATH}")
             # Création de données factices pour le développement
             return create_dummy_data()
         
-        # Chargement des données
-        data = pd.read_csv(data_path)
-        logger.info("Données historiques chargées avec succès")
-        return data
+        return read_history_source(data_path)
     except Exception as e:
         logger.error(f"Erreur lors du chargement des données: {str(e)}")
         # Création de données factices en cas d'erreur
@@ -115,31 +182,64 @@ def prepare_data(data, sequence_length=10):
     
     return np.array(X_numbers), np.array(X_stars)
 
+# Préparation de la seule fenêtre d'entrée utilisée pour la prédiction
+# (identique à prepare_data(data)[i][-1:], sans matérialiser les autres fenêtres)
+def prepare_last_window(data, sequence_length=10):
+    if len(data) <= sequence_length:
+        return None, None
+    
+    # Seules les sequence_length + 1 dernières lignes sont lues
+    X_numbers = data.numbers[-(sequence_length + 1):-1][np.newaxis]
+    X_stars = data.stars[-(sequence_length + 1):-1][np.newaxis]
+    return X_numbers, X_stars
+
+# Probabilités des modèles mémorisées pour la dernière version de l'historique
+probabilities_cache = {}
+
+def predict_probabilities(numbers_model, stars_model, data, version=None):
+    cached = probabilities_cache.get('latest')
+    if version is not None and cached is not None and cached[0] == version:
+        return cached[1], cached[2]
+    
+    X_numbers, X_stars = prepare_last_window(data)
+    if X_numbers is None:
+        return None, None
+    
+    numbers_probs = numbers_model.predict(X_numbers)
+    stars_probs = stars_model.predict(X_stars)
+    
+    if version is not None:
+        probabilities_cache['latest'] = (version, numbers_probs, stars_probs)
+    return numbers_probs, stars_probs
+
 # Génération de prédictions
-def generate_predictions(numbers_model, stars_model, data, strategy='balanced', n_combinations=5):
-    # Préparation des données
-    X_numbers, X_stars = prepare_data(data)
+def generate_predictions(numbers_model, stars_model, data, strategy='balanced', n_combinations=5, index=None):
+    # Index des tirages (construit à la volée si non fourni)
+    if index is None:
+        index = DrawIndex(data)
+        version = None
+    else:
+        version = index.version
     
-    if len(X_numbers) == 0:
+    if len(data) <= 10:
         logger.error("Pas assez de données pour générer des prédictions")
         return generate_random_combinations(n_combinations)
     
     try:
-        # Prédiction des probabilités
-        numbers_probs = numbers_model.predict(X_numbers[-1:])
-        stars_probs = stars_model.predict(X_stars[-1:])
+        # Prédiction des probabilités (mémorisées par version de l'historique)
+        numbers_probs, stars_probs = predict_probabilities(numbers_model, stars_model, data, version)
         
         # Génération des combinaisons selon la stratégie
         if strategy == 'statistical':
-            combinations = generate_statistical_combinations(data, n_combinations)
+            combinations = generate_statistical_combinations(data, n_combinations, index)
         elif strategy == 'hot':
-            combinations = generate_hot_combinations(data, n_combinations)
+            combinations = generate_hot_combinations(data, n_combinations, index)
         elif strategy == 'cold':
-            combinations = generate_cold_combinations(data, n_combinations)
+            combinations = generate_cold_combinations(data, n_combinations, index)
         elif strategy == 'rare':
             combinations = generate_rare_combinations(numbers_probs[0], stars_probs[0], n_combinations)
         else:  # balanced
-            combinations = generate_balanced_combinations(numbers_probs[0], stars_probs[0], data, n_combinations)
+            combinations = generate_balanced_combinations(numbers_probs[0], stars_probs[0], data, n_combinations, index)
         
         # Calcul des scores de confiance
         combinations = calculate_confidence_scores(combinations, numbers_probs[0], stars_probs[0])
@@ -149,250 +249,443 @@ def generate_predictions(numbers_model, stars_model, data, strategy='balanced',
         logger.error(f"Erreur lors de la génération des prédictions: {str(e)}")
         return generate_random_combinations(n_combinations)
 
-# Génération de combinaisons aléatoires
-def generate_random_combinations(n_combinations):
-    combinations = []
+# Validation d'un tirage soumis à l'ingestion
+def validate_draw(numbers, stars):
+    if not isinstance(numbers, list) or len(numbers) != 5 or len(set(numbers)) != 5:
+        raise ValueError("Un tirage doit contenir 5 numéros distincts")
+    if not isinstance(stars, list) or len(stars) != 2 or len(set(stars)) != 2:
+        raise ValueError("Un tirage doit contenir 2 étoiles distinctes")
+    # bool est une sous-classe de int: true/false ne sont pas des numéros
+    if not all(isinstance(n, int) and not isinstance(n, bool) and 1 <= n <= 50 for n in numbers):
+        raise ValueError("Les numéros doivent être des entiers entre 1 et 50")
+    if not all(isinstance(s, int) and not isinstance(s, bool) and 1 <= s <= 12 for s in stars):
+        raise ValueError("Les étoiles doivent être des entiers entre 1 et 12")
+
+# Instantané de l'historique servi: tirages (DrawHistory), index et version publiés ensemble.
+# Un instantané n'est jamais modifié: l'ingestion en publie un nouveau.
+HistorySnapshot = namedtuple('HistorySnapshot', ['data', 'index', 'version', 'source'])
+
+def publish_history(data, index, source):
+    global history
     
-    for _ in range(n_combinations):
-        # Génération de 5 numéros uniques entre 1 et 50
-        numbers = sorted(np.random.choice(range(1, 51), 5, replace=False))
-        # Génération de 2 étoiles uniques entre 1 et 12
-        stars = sorted(np.random.choice(range(1, 13), 2, replace=False))
-        
-        combination = {
-            'numbers': numbers.tolist(),
-            'stars': stars.tolist(),
-            'confidence': round(np.random.uniform(0.1, 0.9), 2)
-        }
-        
-        combinations.append(combination)
-    
-    return combinations
-
-# Génération de combinaisons basées sur les statistiques
-def generate_statistical_combinations(data, n_combinations):
-    combinations = []
-    
-    # Calcul des fréquences
-    number_counts = {}
-    for i in range(1, 51):
-        count = ((data['n1'] == i) | (data['n2'] == i) | (data['n3'] == i) | 
-                 (data['n4'] == i) | (data['n5'] == i)).sum()
-        number_counts[i] = count
-    
-    star_counts = {}
-    for i in range(1, 13):
-        count = ((data['s1'] == i) | (data['s2'] == i)).sum()
-        star_counts[i] = count
-    
-    # Tri des numéros et étoiles par fréquence
-    sorted_numbers = sorted(number_counts.keys(), key=lambda x: number_counts[x], reverse=True)
-    sorted_stars = sorted(star_counts.keys(), key=lambda x: star_counts[x], reverse=True)
-    
-    for i in range(n_combinations):
-        # Sélection des numéros et étoiles les plus fréquents avec une légère variation
-        start_idx = i % 10
-        numbers = sorted(sorted_numbers[start_idx:start_idx+5])
-        stars = sorted(sorted_stars[i % 5:i % 5+2])
-        
-        combination = {
-            'numbers': numbers,
-            'stars': stars,
-            'confidence': round(0.7 - (i * 0.05), 2)  # Confiance décroissante
-        }
-        
-        combinations.append(combination)
-    
-    return combinations
-
-# Génération de combinaisons basées sur les numéros "chauds"
-def generate_hot_combinations(data, n_combinations):
-    # Utilisation des 20 derniers tirages pour déterminer les numéros "chauds"
-    recent_data = data.tail(20)
-    return generate_statistical_combinations(recent_data, n_combinations)
-
-# Génération de combinaisons basées sur les numéros "froids"
-def generate_cold_combinations(data, n_combinations):
-    combinations = []
-    
-    # Calcul des écarts (nombre de tirages depuis la dernière apparition)
-    number_gaps = {}
-    for i in range(1, 51):
-        last_occurrence = max(
-            data[data['n1'] == i].index.max(),
-            data[data['n2'] == i].index.max(),
-            data[data['n3'] == i].index.max(),
-            data[data['n4'] == i].index.max(),
-            data[data['n5'] == i].index.max()
-        )
-        
-        if pd.isna(last_occurrence):
-            gap = len(data)  # Jamais apparu
-        else:
-            gap = len(data) - last_occurrence
-        
-        number_gaps[i] = gap
-    
-    star_gaps = {}
-    for i in range(1, 13):
-        last_occurrence = max(
-            data[data['s1'] == i].index.max(),
-            data[data['s2'] == i].index.max()
-        )
-        
-        if pd.isna(last_occurrence):
-            gap = len(data)  # Jamais apparu
-        else:
-            gap = len(data) - last_occurrence
-        
-        star_gaps[i] = gap
+    history = HistorySnapshot(data, index, index.version, source)
+    # Les réponses des versions précédentes de l'historique ne sont plus valides
+    response_cache.invalidate()
+    probabilities_cache.clear()
+    return history
+
+# Historique courant, rechargé si un autre worker a modifié le fichier de tirages
+def current_history():
+    snapshot = history
+    if snapshot is None or history_source() == snapshot.source:
+        return snapshot
     
-    # Tri des numéros et étoiles par écart
-    sorted_numbers = sorted(number_gaps.keys(), key=lambda x: number_gaps[x], reverse=True)
-    sorted_stars = sorted(star_gaps.keys(), key=lambda x: star_gaps[x], reverse=True)
+    with ingestion_lock:
+        path = history_source_path()
+        if path is None:
+            return history
+        # Verrou partagé: aucune ingestion n'est en cours d'écriture pendant la relecture
+        with history_file_lock(path, shared=True):
+            return refresh_history()
+
+# Rechargement de l'historique depuis son fichier (appelé sous ingestion_lock
+# et sous le verrou du fichier)
+def refresh_history():
+    snapshot = history
+    source = history_source()
+    # Fichier inchangé, ou supprimé: l'historique chargé reste servi
+    if source is None or source == snapshot.source:
+        return snapshot
     
-    for i in range(n_combinations):
-        # Sélection des numéros et étoiles avec les plus grands écarts avec une légère variation
-        start_idx = i % 10
-        numbers = sorted(sorted_numbers[start_idx:start_idx+5])
-        stars = sorted(sorted_stars[i % 5:i % 5+2])
-        
-        combination = {
-            'numbers': numbers,
-            'stars': stars,
-            'confidence': round(0.6 - (i * 0.05), 2)  # Confiance décroissante
-        }
-        
-        combinations.append(combination)
+    # Même fichier complété sur place: seuls les tirages ajoutés sont lus
+    appended = read_appended_draws(snapshot, source)
+    if appended is not None:
+        data = snapshot.data.copy()
+        index = snapshot.index.copy()
+        for date, numbers, stars in appended:
+            data.append(date, numbers, stars)
+            index.append(numbers, stars)
+        index.version = snapshot.version + 1
+        logger.info(f"Historique complété depuis le fichier ({len(appended)} tirages, version {index.version})")
+        return publish_history(data, index, source)
     
-    return combinations
+    frame = read_history_source(source.path)
+    index = DrawIndex(frame)
+    index.version = snapshot.version + 1
+    logger.info(f"Historique rechargé depuis le fichier ({len(frame)} tirages, version {index.version})")
+    return publish_history(DrawHistory.from_dataframe(frame), index, source)
 
-# Génération de combinaisons rares basées sur les probabilités
-def generate_rare_combinations(numbers_probs, stars_probs, n_combinations):
-    combinations = []
+# Tirages ajoutés en fin de fichier depuis l'instantané [(date, numéros, étoiles)],
+# ou None si le fichier a été remplacé ou réécrit (rechargement complet)
+def read_appended_draws(snapshot, source):
+    previous = snapshot.source
+    if previous is None or len(snapshot.data) == 0:
+        return None
+    if (source.path, source.inode) != (previous.path, previous.inode) or source.size < previous.size:
+        return None
     
-    for _ in range(n_combinations):
-        # Sélection des numéros avec les probabilités les plus faibles
-        numbers_indices = np.argsort(numbers_probs)[:5]
-        numbers = sorted([i + 1 for i in numbers_indices])
-        
-        # Sélection des étoiles avec les probabilités les plus faibles
-        stars_indices = np.argsort(stars_probs)[:2]
-        stars = sorted([i + 1 for i in stars_indices])
-        
-        # Ajout d'une légère randomisation
-        if np.random.random() < 0.3:
-            random_idx = np.random.randint(0, 5)
-            new_number = np.random.randint(1, 51)
-            while new_number in numbers:
-                new_number = np.random.randint(1, 51)
-            numbers[random_idx] = new_number
-            numbers.sort()
-        
-        if np.random.random() < 0.3:
-            random_idx = np.random.randint(0, 2)
-            new_star = np.random.randint(1, 13)
-            while new_star in stars:
-                new_star = np.random.randint(1, 13)
-            stars[random_idx] = new_star
-            stars.sort()
-        
-        combination = {
-            'numbers': numbers,
-            'stars': stars,
-            'confidence': round(np.random.uniform(0.2, 0.5), 2)  # Confiance faible
-        }
-        
-        combinations.append(combination)
+    data = snapshot.data
+    if source.path == HISTORY_STORE_PATH:
+        store = DrawStore.open(source.path)
+        n_draws = len(data)
+        if len(store) < n_draws:
+            return None
+        # Le dernier tirage connu doit être inchangé (inode réutilisé par un autre fichier)
+        if not (np.array_equal(store.numbers[n_draws - 1], data.numbers[-1])
+                and np.array_equal(store.stars[n_draws - 1], data.stars[-1])):
+            return None
+        dates = store.dates()
+        return [
+            (pd.Timestamp(dates[i]) if dates is not None else None,
+             store.numbers[i].tolist(), store.stars[i].tolist())
+            for i in range(n_draws, len(store))
+        ]
     
-    return combinations
+    # CSV: lignes écrites après la taille connue, avec les colonnes de l'en-tête
+    with open(source.path, 'rb') as f:
+        header = f.readline().decode().strip().split(',')
+        start = max(previous.size - 1024, f.tell())
+        f.seek(start)
+        known = f.read(previous.size - start)
+        added = f.read(source.size - previous.size)
+    if not known.endswith(b'\n'):
+        return None
+    last_line = known[:-1].rsplit(b'\n', 1)[-1]
+    rows = pd.read_csv(io.BytesIO(last_line + b'\n' + added), header=None, names=header)
+    if not (np.array_equal(rows[NUMBER_COLUMNS].to_numpy()[0], data.numbers[-1])
+            and np.array_equal(rows[STAR_COLUMNS].to_numpy()[0], data.stars[-1])):
+        return None
+    return [
+        (row.get('date'), [row[c] for c in NUMBER_COLUMNS], [row[c] for c in STAR_COLUMNS])
+        for row in rows.iloc[1:].to_dict('records')
+    ]
+
+# Verrou inter-processus de l'historique: exclusif pour les écritures,
+# partagé pour les relectures des autres workers
+@contextmanager
+def history_file_lock(path, shared=False):
+    with open(f"{path}.lock", 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
 
-# Génération de combinaisons équilibrées
-def generate_balanced_combinations(numbers_probs, stars_probs, data, n_combinations):
-    combinations = []
+# Ajout d'un tirage en fin de fichier de l'historique, sans réécrire les précédents
+def append_history_source(path, date, numbers, stars):
+    if path == HISTORY_STORE_PATH:
+        days = np.array([np.datetime64(date.date(), 'D')]).astype(np.int32)
+        DrawStore.append(path, np.array([numbers]), np.array([stars]), days)
+        return
     
-    # Mélange de différentes stratégies
-    statistical_combinations = generate_statistical_combinations(data, n_combinations // 3)
-    hot_combinations = generate_hot_combinations(data, n_combinations // 3)
+    values = {'date': date.strftime('%Y-%m-%d')}
+    values.update(zip(NUMBER_COLUMNS + STAR_COLUMNS, numbers + stars))
+    with open(path, 'r+') as f:
+        header = f.readline().strip().split(',')
+        # Fin de fichier sans retour à la ligne: la ligne ajoutée doit commencer sur une nouvelle ligne
+        f.seek(0, os.SEEK_END)
+        if f.tell() > 0:
+            f.seek(f.tell() - 1)
+            if f.read(1) != '\n':
+                f.write('\n')
+        f.write(','.join(str(values.get(column, '')) for column in header) + '\n')
+
+# Ingestion d'un nouveau tirage sans recalcul complet des statistiques.
+# Le tirage est ajouté en fin de fichier de l'historique: il survit à un
+# redémarrage, et les autres workers le lisent à leur prochaine requête.
+def ingest_draw(date, numbers, stars):
+    validate_draw(numbers, stars)
+    if not date:
+        raise ValueError("La date du tirage est obligatoire")
+    date = pd.Timestamp(date)
+    numbers = sorted(numbers)
+    stars = sorted(stars)
     
-    # Génération de combinaisons basées sur les probabilités du modèle
-    model_combinations = []
-    for _ in range(n_combinations - len(statistical_combinations) - len(hot_combinations)):
-        # Sélection des numéros avec les probabilités les plus élevées
-        numbers_indices = np.argsort(numbers_probs)[-10:]  # Top 10
-        selected_indices = np.random.choice(numbers_indices, 5, replace=False)
-        numbers = sorted([i + 1 for i in selected_indices])
-        
-        # Sélection des étoiles avec les probabilités les plus élevées
-        stars_indices = np.argsort(stars_probs)[-5:]  # Top 5
-        selected_indices = np.random.choice(stars_indices, 2, replace=False)
-        stars = sorted([i + 1 for i in selected_indices])
-        
-        combination = {
-            'numbers': numbers,
-            'stars': stars,
-            'confidence': round(np.random.uniform(0.6, 0.9), 2)  # Confiance élevée
-        }
-        
-        model_combinations.append(combination)
+    source_path = history_source_path()
+    with ingestion_lock:
+        if source_path is None:
+            logger.warning("Aucun fichier d'historique: tirage conservé en mémoire dans ce processus uniquement")
+            return append_draw(history, date, numbers, stars, None)
+        
+        with history_file_lock(source_path):
+            # Tirages ajoutés entre-temps par un autre worker
+            snapshot = refresh_history()
+            snapshot = append_draw(snapshot, date, numbers, stars, source_path)
+    
+    logger.info(f"Tirage du {date.date()} ingéré (version {snapshot.version})")
+    return snapshot
+
+# Nouvel instantané: copies de l'historique et de l'index complétées dans leur
+# capacité libre (l'instantané courant reste intact), puis publiées ensemble
+def append_draw(snapshot, date, numbers, stars, source_path):
+    data = snapshot.data.copy()
+    data.append(date, numbers, stars)
     
-    # Combinaison des différentes stratégies
-    combinations = statistical_combinations + hot_combinations + model_combinations
+    # Mise à jour incrémentale de l'index (comptes, écarts, paires)
+    index = snapshot.index.copy()
+    index.append(numbers, stars)
     
-    return combinations
+    source = None
+    if source_path is not None:
+        append_history_source(source_path, date, numbers, stars)
+        source = history_source()
+        # Un ajout dans la même granularité d'horloge ne changerait pas la date:
+        # elle est avancée pour que les autres workers le voient
+        if snapshot.source is not None and source.mtime <= snapshot.source.mtime:
+            os.utime(source_path, ns=(source.mtime, snapshot.source.mtime + 1))
+            source = history_source()
+    return publish_history(data, index, source)
 
-# Calcul des scores de confiance
-def calculate_confidence_scores(combinations, numbers_probs, stars_probs):
-    for combination in combinations:
-        numbers = combination['numbers']
-        stars = combination['stars']
-        
-        # Calcul du score basé sur les probabilités du modèle
-        number_score = sum(numbers_probs[n-1] for n in numbers) / 5
-        star_score = sum(stars_probs[s-1] for s in stars) / 2
-        
-        # Score combiné
-        combined_score = 0.7 * number_score + 0.3 * star_score
+# Table des scores de toutes les grilles (job hors ligne training/export_score_table.py),
+# rouverte lorsque le job remplace le fichier
+SCORE_TABLE_PATH = os.environ.get('ML_SCORE_TABLE', os.path.join('models', 'score_table.scores'))
+score_table_state = {'table': None, 'mtime': None, 'fingerprint': None}
+score_table_lock = threading.Lock()
+
+def get_score_table():
+    with score_table_lock:
+        mtime = os.stat(SCORE_TABLE_PATH).st_mtime_ns if os.path.exists(SCORE_TABLE_PATH) else None
+        if mtime is None:
+            raise FileNotFoundError(f"La table des scores {SCORE_TABLE_PATH} n'existe pas")
+        if mtime != score_table_state['mtime']:
+            score_table_state['table'] = ScoreTable.open(SCORE_TABLE_PATH)
+            score_table_state['mtime'] = mtime
+            logger.info(f"Table des scores chargée: {SCORE_TABLE_PATH}")
+        return score_table_state['table']
+
+# Empreinte de l'historique courant, recalculée à chaque nouvelle version
+def current_history_fingerprint(snapshot):
+    version, fingerprint = score_table_state['fingerprint'] or (None, None)
+    if version != snapshot.version:
+        fingerprint = history_fingerprint(snapshot.data.numbers, snapshot.data.stars)
+        score_table_state['fingerprint'] = (snapshot.version, fingerprint)
+    return fingerprint
+
+# Lecture d'une grille passée en paramètres de requête ("1,2,3,4,5" et "1,2")
+def parse_ticket_params(numbers, stars):
+    try:
+        numbers = [int(n) for n in numbers.split(',')] if numbers else []
+        stars = [int(s) for s in stars.split(',')] if stars else []
+    except ValueError:
+        raise ValueError("Les numéros et étoiles doivent être des entiers séparés par des virgules")
+    validate_draw(numbers, stars)
+    return numbers, stars
+
+# Stratégies dont le résultat est stable pour un historique donné (mises en cache)
+CACHEABLE_STRATEGIES = {'statistical', 'hot', 'cold'}
+
+# Réponse JSON mise en cache, avec ETag et revalidation conditionnelle
+def cached_response(key, build_payload):
+    cached = response_cache.get(key)
+    if cached is None:
+        body = jsonify(build_payload()).get_data()
+        etag = response_cache.put(key, body)
+    else:
+        body, etag = cached
+    
+    response = app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    # Les clients (backend Node, nginx) doivent revalider avec If-None-Match
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Cache'] = 'MISS' if cached is None else 'HIT'
+    return response.make_conditional(request)
+
+# Regroupement des appels aux modèles par micro-lots (INFERENCE_BATCHING=0 pour désactiver)
+def create_schedulers(numbers_model, stars_model):
+    if os.environ.get('INFERENCE_BATCHING', '1') == '0':
+        return numbers_model, stars_model
+    
+    max_batch_size = int(os.environ.get('INFERENCE_MAX_BATCH_SIZE', 32))
+    max_wait_ms = float(os.environ.get('INFERENCE_MAX_WAIT_MS', 5))
+    return (
+        InferenceScheduler(numbers_model, max_batch_size, max_wait_ms, name='numbers'),
+        InferenceScheduler(stars_model, max_batch_size, max_wait_ms, name='stars')
+    )
+
+# Chargement des modèles et des données, étape par étape, puis préchauffage
+def initialize_service():
+    global numbers_model, stars_model, numbers_predictor, stars_predictor
+    
+    # Fichier identifié avant le chargement: une écriture concurrente sera rechargée
+    source = history_source()
+    
+    # ML_SHARED_MEMORY=1: tirages, index et poids NumPy partagés entre workers
+    # (tirages et index ignorés si le fichier a changé depuis la publication)
+    models = None
+    shared = None
+    segment_path = os.environ.get('ML_SHARED_SEGMENT', DEFAULT_SEGMENT_PATH)
+    if os.environ.get('ML_SHARED_MEMORY', '0') == '1' and os.path.exists(segment_path):
+        with startup.stage('shared_segment'):
+            shared = attach_service_state(segment_path, history_file_identity(source.path) if source else None)
+            models = shared[2]
+    
+    # ML_RUNTIME=numpy: inférence sans TensorFlow à partir des exports .npz
+    if models is None and os.environ.get('ML_RUNTIME', 'tensorflow') == 'numpy':
+        with startup.stage('numpy_models'):
+            models = load_numpy_models()
+    
+    if models is None:
+        with startup.stage('tensorflow_import'):
+            import tensorflow
         
-        # Ajustement du score de confiance existant
-        combination['confidence'] = round((combination['confidence'] + combined_score) / 2, 2)
+        with startup.stage('models'):
+            models = load_models()
+    
+    with startup.stage('schedulers'):
+        numbers_model, stars_model = models
+        numbers_predictor, stars_predictor = create_schedulers(numbers_model, stars_model)
+    
+    if shared is not None and shared[0] is not None:
+        snapshot = publish_history(DrawHistory.from_dataframe(shared[0]), shared[1], source)
+    else:
+        with startup.stage('data'):
+            data = load_historical_data()
+            snapshot = publish_history(DrawHistory.from_dataframe(data), DrawIndex(data), source)
     
-    return combinations
+    # Première inférence: traçage du graphe et remplissage du cache de probabilités
+    with startup.stage('warmup'):
+        predict_probabilities(numbers_predictor, stars_predictor, snapshot.data, snapshot.version)
+    
+    startup.mark_ready()
 
-# Chargement des modèles et des données
-numbers_model, stars_model = load_models()
-historical_data = load_historical_data()
+startup = StartupTracker()
+numbers_model = stars_model = None
+numbers_predictor = stars_predictor = None
+history = None
+ingestion_lock = threading.Lock()
+response_cache = ResponseCache(
+    max_entries=int(os.environ.get('RESPONSE_CACHE_SIZE', 256)),
+    ttl=float(os.environ.get('RESPONSE_CACHE_TTL', 3600))
+)
 
-# Route pour la page d'accueil
-@app.route('/')
-def home():
+# ML_STARTUP_MODE=background: le serveur accepte les connexions immédiatement
+# et charge modèles et données dans un thread (sans gunicorn --preload, le
+# thread ne survivant pas au fork des workers)
+if os.environ.get('ML_STARTUP_MODE', 'blocking') == 'background':
+    startup.run_in_background(initialize_service)
+else:
+    initialize_service()
+
+# Routes disponibles avant la fin du démarrage
+HEALTH_ROUTES = {'/', '/health/live', '/health/ready'}
+
+# Refus des requêtes métier tant que le service n'est pas prêt
+@app.before_request
+def reject_until_ready():
+    if not startup.ready and request.path not in HEALTH_ROUTES:
+        return jsonify({
+            'status': 'error',
+            'message': "Le service ML est en cours de démarrage"
+        }), 503, {'Retry-After': '5'}
+
+# Sonde de vivacité: le processus répond
+@app.route('/health/live', methods=['GET'])
+def health_live():
     return jsonify({
+        'status': 'success',
+        'data': {
+            'alive': True,
+            'uptime_ms': startup.uptime_ms()
+        }
+    })
+
+# Sonde de disponibilité: modèles et données chargés, préchauffage effectué
+@app.route('/health/ready', methods=['GET'])
+def health_ready():
+    state = startup.status()
+    return jsonify({
+        'status': 'success' if state['ready'] else 'error',
+        'data': state
+    }), 200 if state['ready'] else 503
+
+# Contenus des réponses, partagés par l'application Flask et la variante ASGI
+def build_home_payload():
+    return {
         'status': 'success',
         'message': 'API EuroGenius ML en ligne',
         'version': '1.0.0'
-    })
+    }
+
+def build_latest_draws_payload(snapshot, n_draws):
+    latest_draws = snapshot.data.tail(n_draws).to_dict('records')
+    
+    # Formatage des résultats
+    formatted_draws = []
+    for draw in latest_draws:
+        formatted_draw = {
+            'date': draw['date'].strftime('%Y-%m-%d') if isinstance(draw['date'], pd.Timestamp) else draw['date'],
+            'numbers': [draw['n1'], draw['n2'], draw['n3'], draw['n4'], draw['n5']],
+            'stars': [draw['s1'], draw['s2']]
+        }
+        formatted_draws.append(formatted_draw)
+    
+    return {
+        'status': 'success',
+        'data': formatted_draws
+    }
+
+def build_statistics_payload(snapshot):
+    # Fréquences et numéros "chauds"/"froids" issus de l'index précalculé
+    number_frequencies, star_frequencies = snapshot.index.frequencies()
+    hot_cold = snapshot.index.hot_cold(window=20)
+    
+    return {
+        'status': 'success',
+        'data': {
+            'number_frequencies': number_frequencies,
+            'star_frequencies': star_frequencies,
+            'hot_numbers': hot_cold['hot_numbers'],
+            'cold_numbers': hot_cold['cold_numbers'],
+            'hot_stars': hot_cold['hot_stars'],
+            'cold_stars': hot_cold['cold_stars']
+        }
+    }
+
+# Validation des paramètres de prédiction (message d'erreur ou None)
+VALID_STRATEGIES = ['balanced', 'statistical', 'hot', 'cold', 'rare']
+
+def validate_prediction_params(strategy, n_combinations):
+    if strategy not in VALID_STRATEGIES:
+        return f"Stratégie invalide. Valeurs acceptées: {', '.join(VALID_STRATEGIES)}"
+    if n_combinations < 1 or n_combinations > 10:
+        return "Le nombre de combinaisons doit être entre 1 et 10"
+    return None
+
+def build_predictions_payload(snapshot, strategy, n_combinations):
+    # Génération des prédictions
+    combinations = generate_predictions(numbers_predictor, stars_predictor, snapshot.data, strategy, n_combinations, snapshot.index)
+    
+    return {
+        'status': 'success',
+        'data': {
+            'strategy': strategy,
+            'combinations': combinations
+        }
+    }
+
+def build_ticket_rank_payload(snapshot, numbers, stars):
+    table = get_score_table()
+    result = table.lookup(numbers, stars)
+    
+    # Une table calculée sur un autre historique reste utilisable, mais signalée
+    result['history_size'] = table.history_size
+    result['up_to_date'] = table.matches(current_history_fingerprint(snapshot))
+    return {
+        'status': 'success',
+        'data': result
+    }
+
+# Route pour la page d'accueil
+@app.route('/')
+def home():
+    return jsonify(build_home_payload())
 
 # Route pour obtenir les derniers tirages
 @app.route('/api/draws/latest', methods=['GET'])
 def get_latest_draws():
     try:
         n_draws = request.args.get('n', default=10, type=int)
-        latest_draws = historical_data.tail(n_draws).to_dict('records')
-        
-        # Formatage des résultats
-        formatted_draws = []
-        for draw in latest_draws:
-            formatted_draw = {
-                'date': draw['date'].strftime('%Y-%m-%d') if isinstance(draw['date'], pd.Timestamp) else draw['date'],
-                'numbers': [draw['n1'], draw['n2'], draw['n3'], draw['n4'], draw['n5']],
-                'stars': [draw['s1'], draw['s2']]
-            }
-            formatted_draws.append(formatted_draw)
-        
-        return jsonify({
-            'status': 'success',
-            'data': formatted_draws
-        })
+        return jsonify(build_latest_draws_payload(current_history(), n_draws))
     except Exception as e:
         logger.error(f"Erreur lors de la récupération des derniers tirages: {str(e)}")
         return jsonify({
@@ -400,69 +693,39 @@ def get_latest_draws():
             'message': str(e)
         }), 500
 
-# Route pour obtenir les statistiques
-@app.route('/api/statistics', methods=['GET'])
-def get_statistics():
+# Route pour ingérer un nouveau tirage
+@app.route('/api/draws', methods=['POST'])
+def post_draw():
     try:
-        # Calcul des fréquences des numéros
-        number_frequencies = {}
-        for i in range(1, 51):
-            count = ((historical_data['n1'] == i) | (historical_data['n2'] == i) | 
-                     (historical_data['n3'] == i) | (historical_data['n4'] == i) | 
-                     (historical_data['n5'] == i)).sum()
-            frequency = count / len(historical_data)
-            number_frequencies[i] = {
-                'count': int(count),
-                'frequency': round(frequency, 4)
-            }
-        
-        # Calcul des fréquences des étoiles
-        star_frequencies = {}
-        for i in range(1, 13):
-            count = ((historical_data['s1'] == i) | (historical_data['s2'] == i)).sum()
-            frequency = count / len(historical_data)
-            star_frequencies[i] = {
-                'count': int(count),
-                'frequency': round(frequency, 4)
-            }
-        
-        # Calcul des numéros "chauds" et "froids"
-        recent_data = historical_data.tail(20)
-        hot_numbers = []
-        cold_numbers = []
-        
-        for i in range(1, 51):
-            recent_count = ((recent_data['n1'] == i) | (recent_data['n2'] == i) | 
-                           (recent_data['n3'] == i) | (recent_data['n4'] == i) | 
-                           (recent_data['n5'] == i)).sum()
-            
-            if recent_count >= 3:
-                hot_numbers.append(i)
-            elif recent_count == 0:
-                cold_numbers.append(i)
-        
-        hot_stars = []
-        cold_stars = []
-        
-        for i in range(1, 13):
-            recent_count = ((recent_data['s1'] == i) | (recent_data['s2'] == i)).sum()
-            
-            if recent_count >= 3:
-                hot_stars.append(i)
-            elif recent_count == 0:
-                cold_stars.append(i)
+        payload = request.get_json(silent=True) or {}
+        snapshot = ingest_draw(payload.get('date'), payload.get('numbers'), payload.get('stars'))
         
         return jsonify({
             'status': 'success',
             'data': {
-                'number_frequencies': number_frequencies,
-                'star_frequencies': star_frequencies,
-                'hot_numbers': hot_numbers,
-                'cold_numbers': cold_numbers,
-                'hot_stars': hot_stars,
-                'cold_stars': cold_stars
+                'version': snapshot.version,
+                'n_draws': snapshot.index.n_draws
             }
-        })
+        }), 201
+    except ValueError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        logger.error(f"Erreur lors de l'ingestion du tirage: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+# Route pour obtenir les statistiques
+@app.route('/api/statistics', methods=['GET'])
+def get_statistics():
+    try:
+        snapshot = current_history()
+        key = ResponseCache.make_key('statistics', version=snapshot.version)
+        return cached_response(key, lambda: build_statistics_payload(snapshot))
     except Exception as e:
         logger.error(f"Erreur lors du calcul des statistiques: {str(e)}")
         return jsonify({
@@ -478,29 +741,25 @@ def get_predictions():
         n_combinations = request.args.get('n', default=5, type=int)
         
         # Validation des paramètres
-        valid_strategies = ['balanced', 'statistical', 'hot', 'cold', 'rare']
-        if strategy not in valid_strategies:
+        error = validate_prediction_params(strategy, n_combinations)
+        if error is not None:
             return jsonify({
                 'status': 'error',
-                'message': f"Stratégie invalide. Valeurs acceptées: {', '.join(valid_strategies)}"
+                'message': error
             }), 400
         
-        if n_combinations < 1 or n_combinations > 10:
-            return jsonify({
-                'status': 'error',
-                'message': "Le nombre de combinaisons doit être entre 1 et 10"
-            }), 400
+        # Données, index et clé de cache lus dans le même instantané
+        snapshot = current_history()
         
-        # Génération des prédictions
-        combinations = generate_predictions(numbers_model, stars_model, historical_data, strategy, n_combinations)
+        def build_payload():
+            return build_predictions_payload(snapshot, strategy, n_combinations)
         
-        return jsonify({
-            'status': 'success',
-            'data': {
-                'strategy': strategy,
-                'combinations': combinations
-            }
-        })
+        # Les stratégies aléatoires (balanced, rare) ne sont pas mises en cache
+        if strategy not in CACHEABLE_STRATEGIES:
+            return jsonify(build_payload())
+        
+        key = ResponseCache.make_key('predictions', strategy, n_combinations, snapshot.version)
+        return cached_response(key, build_payload)
     except Exception as e:
         logger.error(f"Erreur lors de la génération des prédictions: {str(e)}")
         return jsonify({
@@ -508,6 +767,38 @@ def get_predictions():
             'message': str(e)
         }), 500
 
+# Route pour obtenir le rang et le percentile d'une grille parmi toutes les grilles
+@app.route('/api/tickets/rank', methods=['GET'])
+def get_ticket_rank():
+    try:
+        numbers, stars = parse_ticket_params(request.args.get('numbers'), request.args.get('stars'))
+        return jsonify(build_ticket_rank_payload(current_history(), numbers, stars))
+    except ValueError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
+    except FileNotFoundError as e:
+        logger.error(f"Table des scores indisponible: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'message': "La table des scores n'a pas encore été calculée"
+        }), 503
+    except Exception as e:
+        logger.error(f"Erreur lors du classement de la grille: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+# Route pour obtenir les compteurs du cache de réponses
+@app.route('/api/cache/stats', methods=['GET'])
+def get_cache_stats():
+    return jsonify({
+        'status': 'success',
+        'data': response_cache.stats()
+    })
+
 # Démarrage de l'application
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
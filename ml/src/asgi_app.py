@@ -0,0 +1,333 @@
+import asyncio
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs
+from flask import jsonify
+
+# Ajout du répertoire courant au path pour les imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import app as service
+from prediction.response_cache import ResponseCache
+
+logger = service.logger
+
+# Nombre de threads pour le travail CPU (modèles, statistiques, combinaisons)
+MAX_WORKERS = int(os.environ.get('ASGI_MAX_WORKERS', 4))
+# Requêtes admises en attente d'un thread au-delà des requêtes en cours
+MAX_QUEUE = int(os.environ.get('ASGI_MAX_QUEUE', 16))
+# Délai conseillé au client (secondes) lorsque le service est saturé
+RETRY_AFTER = os.environ.get('ASGI_RETRY_AFTER', '1')
+
+
+class Response:
+    """
+    Réponse HTTP minimale (corps JSON déjà sérialisé)
+    """
+
+    def __init__(self, body, status=200, headers=None):
+        self.body = body
+        self.status = status
+        self.headers = headers or {}
+
+
+def serialize(payload):
+    """
+    Corps JSON produit par flask.jsonify, dans un contexte d'application
+    (API disponible de Flask 2.1, version figée, à Flask 3)
+    """
+    with service.app.app_context():
+        return jsonify(payload).get_data()
+
+
+def json_response(payload, status=200, headers=None):
+    """
+    Sérialisation identique à flask.jsonify
+    """
+    return Response(serialize(payload), status, headers)
+
+
+def error_response(message, status, headers=None):
+    return json_response({'status': 'error', 'message': message}, status, headers)
+
+
+def query_arg(query, name, default, type=str):
+    """
+    Lecture d'un paramètre de requête, comme request.args.get(name, default, type)
+    """
+    values = query.get(name)
+    if not values:
+        return default
+    try:
+        return type(values[0])
+    except (TypeError, ValueError):
+        return default
+
+
+def cached_response(key, build_payload, if_none_match):
+    """
+    Réponse mise en cache avec ETag (même cache et mêmes clés que Flask)
+    """
+    cached = service.response_cache.get(key)
+    if cached is None:
+        body = serialize(build_payload())
+        etag = service.response_cache.put(key, body)
+    else:
+        body, etag = cached
+
+    headers = {
+        'ETag': f'"{etag}"',
+        'Cache-Control': 'no-cache',
+        'X-Cache': 'MISS' if cached is None else 'HIT'
+    }
+    tags = [tag.strip() for tag in if_none_match.split(',')] if if_none_match else []
+    if '*' in tags or f'"{etag}"' in tags or f'W/"{etag}"' in tags:
+        return Response(b'', 304, headers)
+    return Response(body, 200, headers)
+
+
+# Gestionnaires synchrones, exécutés dans le pool de threads
+def handle_home(query, headers):
+    return json_response(service.build_home_payload())
+
+
+def handle_latest_draws(query, headers):
+    try:
+        n_draws = query_arg(query, 'n', 10, int)
+        return json_response(service.build_latest_draws_payload(service.current_history(), n_draws))
+    except Exception as e:
+        logger.error(f"Erreur lors de la récupération des derniers tirages: {str(e)}")
+        return error_response(str(e), 500)
+
+
+def handle_statistics(query, headers):
+    try:
+        snapshot = service.current_history()
+        key = ResponseCache.make_key('statistics', version=snapshot.version)
+        return cached_response(key, lambda: service.build_statistics_payload(snapshot), headers.get('if-none-match'))
+    except Exception as e:
+        logger.error(f"Erreur lors du calcul des statistiques: {str(e)}")
+        return error_response(str(e), 500)
+
+
+def handle_predictions(query, headers):
+    try:
+        strategy = query_arg(query, 'strategy', 'balanced', str)
+        n_combinations = query_arg(query, 'n', 5, int)
+
+        error = service.validate_prediction_params(strategy, n_combinations)
+        if error is not None:
+            return error_response(error, 400)
+
+        # Données, index et clé de cache lus dans le même instantané
+        snapshot = service.current_history()
+
+        def build_payload():
+            return service.build_predictions_payload(snapshot, strategy, n_combinations)
+
+        # Les stratégies aléatoires (balanced, rare) ne sont pas mises en cache
+        if strategy not in service.CACHEABLE_STRATEGIES:
+            return json_response(build_payload())
+
+        key = ResponseCache.make_key('predictions', strategy, n_combinations, snapshot.version)
+        return cached_response(key, build_payload, headers.get('if-none-match'))
+    except Exception as e:
+        logger.error(f"Erreur lors de la génération des prédictions: {str(e)}")
+        return error_response(str(e), 500)
+
+
+def handle_ticket_rank(query, headers):
+    try:
+        numbers, stars = service.parse_ticket_params(query_arg(query, 'numbers', None), query_arg(query, 'stars', None))
+        return json_response(service.build_ticket_rank_payload(service.current_history(), numbers, stars))
+    except ValueError as e:
+        return error_response(str(e), 400)
+    except FileNotFoundError as e:
+        logger.error(f"Table des scores indisponible: {str(e)}")
+        return error_response("La table des scores n'a pas encore été calculée", 503)
+    except Exception as e:
+        logger.error(f"Erreur lors du classement de la grille: {str(e)}")
+        return error_response(str(e), 500)
+
+
+def handle_health_live(query, headers):
+    return json_response({
+        'status': 'success',
+        'data': {
+            'alive': True,
+            'uptime_ms': service.startup.uptime_ms()
+        }
+    })
+
+
+def handle_health_ready(query, headers):
+    state = service.startup.status()
+    return json_response({
+        'status': 'success' if state['ready'] else 'error',
+        'data': state
+    }, 200 if state['ready'] else 503)
+
+
+# Routes exposées par la variante ASGI (GET uniquement)
+ROUTES = {
+    '/': handle_home,
+    '/health/live': handle_health_live,
+    '/health/ready': handle_health_ready,
+    '/api/draws/latest': handle_latest_draws,
+    '/api/statistics': handle_statistics,
+    '/api/predictions': handle_predictions,
+    '/api/tickets/rank': handle_ticket_rank
+}
+
+# Routes légères, traitées sans passer par le pool de threads
+INLINE_ROUTES = {'/', '/health/live', '/health/ready'}
+
+
+class AsgiService:
+    """
+    Application ASGI servant les routes de lecture de l'API ML
+
+    Le travail CPU est confié à un pool de threads borné (`max_workers`).
+    Au plus `max_workers + max_queue` requêtes sont admises simultanément:
+    au-delà, la réponse est un 429 immédiat avec Retry-After, au lieu
+    d'allonger la file et la latence de toutes les requêtes. Si le client se
+    déconnecte avant la fin, la tâche est annulée: une requête encore en file
+    n'est jamais exécutée (un calcul déjà commencé va à son terme, son
+    résultat est ignoré).
+    """
+
+    def __init__(self, max_workers=MAX_WORKERS, max_queue=MAX_QUEUE):
+        """
+        Initialisation de l'application
+
+        Args:
+            max_workers (int): Nombre de threads de calcul
+            max_queue (int): Nombre de requêtes admises en attente d'un thread
+        """
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='asgi-worker')
+        self.in_flight = 0
+        self.rejected = 0
+        self.cancelled = 0
+
+    @property
+    def capacity(self):
+        return self.max_workers + self.max_queue
+
+    def stats(self):
+        return {
+            'max_workers': self.max_workers,
+            'max_queue': self.max_queue,
+            'in_flight': self.in_flight,
+            'rejected': self.rejected,
+            'cancelled': self.cancelled
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self._http(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.executor.shutdown(wait=False, cancel_futures=True)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _http(self, scope, receive, send):
+        path = scope['path']
+        handler = ROUTES.get(path)
+
+        if handler is None:
+            await self._send(send, error_response("Route inconnue", 404))
+            return
+        if scope['method'] != 'GET':
+            await self._send(send, error_response("Méthode non autorisée", 405, {'Allow': 'GET'}))
+            return
+        if not service.startup.ready and path not in service.HEALTH_ROUTES:
+            await self._send(send, error_response("Le service ML est en cours de démarrage", 503,
+                                                  {'Retry-After': '5'}))
+            return
+
+        query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+        headers = {name.decode('latin-1').lower(): value.decode('latin-1')
+                   for name, value in scope.get('headers', [])}
+
+        if path in INLINE_ROUTES:
+            await self._send(send, handler(query, headers))
+            return
+
+        # Contre-pression: refus immédiat lorsque toutes les places sont prises
+        if self.in_flight >= self.capacity:
+            self.rejected += 1
+            await self._send(send, error_response("Service ML saturé, réessayer plus tard", 429,
+                                                  {'Retry-After': RETRY_AFTER}))
+            return
+
+        self.in_flight += 1
+        try:
+            response = await self._run_until_disconnect(handler, query, headers, receive)
+        finally:
+            self.in_flight -= 1
+
+        if response is not None:
+            await self._send(send, response)
+
+    async def _run_until_disconnect(self, handler, query, headers, receive):
+        """
+        Exécution dans le pool, annulée si le client se déconnecte
+
+        Returns:
+            Response: Réponse du gestionnaire, ou None si le client est parti
+        """
+        loop = asyncio.get_running_loop()
+        work = loop.run_in_executor(self.executor, handler, query, headers)
+        disconnect = asyncio.ensure_future(self._wait_disconnect(receive))
+
+        done, _ = await asyncio.wait({work, disconnect}, return_when=asyncio.FIRST_COMPLETED)
+        if work in done:
+            disconnect.cancel()
+            return work.result()
+
+        # Annule la tâche si elle attend encore un thread
+        work.cancel()
+        self.cancelled += 1
+        return None
+
+    @staticmethod
+    async def _wait_disconnect(receive):
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return
+
+    @staticmethod
+    async def _send(send, response):
+        headers = [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(response.body)).encode('latin-1')),
+            # Équivalent de CORS(app) côté Flask
+            (b'access-control-allow-origin', b'*')
+        ]
+        headers += [(name.lower().encode('latin-1'), str(value).encode('latin-1'))
+                    for name, value in response.headers.items()]
+        await send({'type': 'http.response.start', 'status': response.status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': response.body})
+
+
+# Application ASGI (uvicorn asgi_app:app)
+app = AsgiService()
+
+
+# Démarrage de l'application
+if __name__ == '__main__':
+    import uvicorn
+
+    port = int(os.environ.get('PORT', 5000))
+    uvicorn.run(app, host='0.0.0.0', port=port)
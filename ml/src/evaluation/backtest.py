@@ -0,0 +1,560 @@
+import hashlib
+import json
+import multiprocessing
+import numpy as np
+import os
+import sys
+import tempfile
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+# Ajout du répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import MODELS_DIR, logger
+from preprocessing.draw_store import history_fingerprint
+
+# Rangs de gains EuroMillions: (numéros trouvés, étoiles trouvées), du rang 1 au rang 13
+PRIZE_TIERS = [(5, 2), (5, 1), (5, 0), (4, 2), (4, 1), (3, 2), (4, 0),
+               (2, 2), (3, 1), (3, 0), (1, 2), (2, 1), (2, 0)]
+
+# Rang (1-13, 0 sans gain) indexé par [numéros trouvés, étoiles trouvées]
+TIER_TABLE = np.zeros((6, 3), dtype=np.int8)
+for _rank, (_numbers, _stars) in enumerate(PRIZE_TIERS, start=1):
+    TIER_TABLE[_numbers, _stars] = _rank
+
+# Stratégies évaluées: celles de l'API (app.py), le GA, l'ensemble, et le hasard pour référence
+STRATEGIES = ['random', 'statistical', 'hot', 'cold', 'rare', 'balanced', 'genetic', 'ensemble']
+
+# Stratégies utilisant les probabilités des LSTM entraînés sur le pli
+LSTM_STRATEGIES = {'rare', 'balanced', 'ensemble'}
+
+# Colonnes des tirages des modèles d'entraînement et de l'API
+TRAINING_COLUMNS = ['numero1', 'numero2', 'numero3', 'numero4', 'numero5', 'etoile1', 'etoile2']
+SERVICE_COLUMNS = ['n1', 'n2', 'n3', 'n4', 'n5', 's1', 's2']
+
+# Paramètres par défaut de l'entraînement des modèles sur chaque pli
+DEFAULT_PARAMS = {
+    'n_combinations': 5,
+    'seed': 42,
+    'sequence_length': 10,
+    'lstm_epochs': 5,
+    'lstm_batch_size': 64,
+    'ga_population': 100,
+    'ga_generations': 20,
+    'ensemble_ga_budget': 0.5
+}
+
+
+def walk_forward_folds(n_draws, min_train=200, test_size=20, max_folds=None):
+    """
+    Plis chronologiques à fenêtre d'entraînement croissante
+
+    Le pli i entraîne les modèles sur les tirages [0, train_end) et les
+    évalue sur [train_end, test_end); chaque tirage de test n'est prédit
+    qu'à partir des tirages qui le précèdent.
+
+    Args:
+        n_draws (int): Nombre de tirages de l'historique
+        min_train (int): Tirages d'entraînement du premier pli
+        test_size (int): Tirages évalués par pli
+        max_folds (int, optional): Nombre maximal de plis (les plus récents)
+
+    Returns:
+        list: Couples (train_end, test_end)
+    """
+    folds = [(end, min(end + test_size, n_draws)) for end in range(min_train, n_draws, test_size)]
+    if max_folds is not None:
+        folds = folds[-max_folds:]
+    return folds
+
+
+def prize_tiers(tickets, numbers, stars):
+    """
+    Numéros et étoiles trouvés et rang de gain de chaque grille face à un tirage
+
+    Args:
+        tickets (array): Grilles (m, 7), numéros puis étoiles (lignes nulles ignorées)
+        numbers (array): Numéros du tirage (5,)
+        stars (array): Étoiles du tirage (2,)
+
+    Returns:
+        tuple: (numéros trouvés (m,), étoiles trouvées (m,), rangs (m,), 0 sans gain)
+    """
+    number_hits = (tickets[:, :5, None] == np.asarray(numbers)[None, None, :]).any(axis=2).sum(axis=1)
+    star_hits = (tickets[:, 5:, None] == np.asarray(stars)[None, None, :]).any(axis=2).sum(axis=1)
+    return number_hits, star_hits, TIER_TABLE[number_hits, star_hits]
+
+
+def random_tier_probabilities():
+    """
+    Probabilité de chaque rang pour une grille tirée au hasard
+
+    Returns:
+        array: Probabilités des rangs 1 à 13
+    """
+    from math import comb
+
+    number_total, star_total = comb(50, 5), comb(12, 2)
+    return np.array([comb(5, n) * comb(45, 5 - n) / number_total * comb(2, s) * comb(10, 2 - s) / star_total
+                     for n, s in PRIZE_TIERS])
+
+
+def to_tickets(combinations, n_combinations):
+    """
+    Combinaisons (dictionnaires des stratégies) en tableau de grilles uint8
+
+    Les grilles manquantes restent nulles et ne sont pas comptées.
+    """
+    tickets = np.zeros((n_combinations, 7), dtype=np.uint8)
+    for row, combination in zip(tickets, combinations[:n_combinations]):
+        row[:5] = sorted(int(n) for n in combination['numbers'])
+        row[5:] = sorted(int(s) for s in combination['stars'])
+    return tickets
+
+
+def cache_path(cache_dir, fingerprint, train_end, test_end, name, params):
+    """
+    Fichier de cache des sorties d'un pli
+
+    La clé combine l'empreinte des tirages [0, test_end), les bornes du pli
+    et les paramètres: l'ajout de nouveaux tirages ne l'invalide pas.
+    """
+    key = hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()[:12]
+    return os.path.join(cache_dir, f"{fingerprint.hex()[:16]}_{train_end}_{test_end}_{name}_{key}.npz")
+
+
+def load_cached(path):
+    if path is None or not os.path.exists(path):
+        return None
+    with np.load(path, allow_pickle=False) as data:
+        return {name: data[name] for name in data.files}
+
+
+def save_cached(path, **arrays):
+    if path is None:
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp.npz')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _history_frame(numbers, stars, columns):
+    import pandas as pd
+
+    return pd.DataFrame(np.hstack([numbers, stars]), columns=columns)
+
+
+def _fit_lstm(model, data, params):
+    """
+    Entraînement d'un LSTM sur les tirages d'un pli (sans point de contrôle sur disque)
+    """
+    from tensorflow.keras.callbacks import EarlyStopping
+
+    model.epochs = params['lstm_epochs']
+    model.batch_size = params['lstm_batch_size']
+    model._build_model()
+    X_train, y_train, X_val, y_val = model._prepare_data(data)
+    model.model.fit(X_train, y_train, validation_data=(X_val, y_val), epochs=model.epochs,
+                    batch_size=model.batch_size, verbose=0,
+                    callbacks=[EarlyStopping(monitor='val_loss', patience=3, restore_best_weights=True)])
+    return model
+
+
+def _fold_lstm(numbers, stars, train_end, test_end, params):
+    """
+    LSTM des numéros et des étoiles entraînés sur [0, train_end), et leurs
+    probabilités pour chaque tirage de test (un seul appel par modèle)
+    """
+    from preprocessing.sequence_windows import sliding_windows
+    from training.lstm_numbers_model import LSTMNumbersModel
+    from training.lstm_stars_model import LSTMStarsModel
+
+    import tensorflow as tf
+
+    # Initialisation des poids reproductible: mêmes probabilités en série, dans le pool ou au cache
+    tf.keras.utils.set_random_seed(_strategy_seed(params, train_end, 'lstm'))
+    length = params['sequence_length']
+    train = _history_frame(numbers[:train_end], stars[:train_end], TRAINING_COLUMNS)
+    numbers_model = _fit_lstm(LSTMNumbersModel(sequence_length=length), train, params)
+    stars_model = _fit_lstm(LSTMStarsModel(sequence_length=length), train, params)
+
+    # Fenêtre se terminant juste avant chaque tirage de test
+    X_numbers, _ = sliding_windows(numbers[train_end - length:test_end], length)
+    X_stars, _ = sliding_windows(stars[train_end - length:test_end], length)
+    number_probs = numbers_model.model.predict(np.ascontiguousarray(X_numbers), verbose=0)
+    star_probs = stars_model.model.predict(np.ascontiguousarray(X_stars), verbose=0)
+    return numbers_model, stars_model, number_probs, star_probs
+
+
+def _fold_genetic(numbers, stars, train_end, params):
+    from training.genetic_algorithm import GeneticAlgorithm
+
+    ga = GeneticAlgorithm(population_size=params['ga_population'], generations=params['ga_generations'],
+                          engine='numpy', seed=params['seed'])
+    ga.load_historical_data(_history_frame(numbers[:train_end], stars[:train_end], TRAINING_COLUMNS))
+    return ga
+
+
+def _limit_tf_threads(n_threads):
+    """
+    Partage des cœurs entre les processus du pool (une seule fois par processus:
+    TensorFlow refuse toute modification après son initialisation)
+    """
+    import tensorflow as tf
+
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(n_threads)
+        tf.config.threading.set_inter_op_parallelism_threads(n_threads)
+    except RuntimeError:
+        pass
+
+
+def _strategy_seed(params, train_end, strategy):
+    return (params['seed'] * 1_000_003 + train_end * 101 + zlib.crc32(strategy.encode())) % 2**32
+
+
+def run_fold(task):
+    """
+    Évaluation de toutes les stratégies sur un pli (exécuté dans un processus du pool)
+
+    Les grilles de chaque stratégie et les probabilités des LSTM sont lues
+    dans le cache lorsqu'elles existent; sinon les modèles sont entraînés
+    sur [0, train_end) et chaque tirage de test est prédit à partir des
+    seuls tirages qui le précèdent (l'index des tirages est complété après
+    chaque prédiction).
+
+    Args:
+        task (dict): numbers, stars (tirages [0, test_end)), train_end, test_end,
+            strategies, params, cache_dir
+
+    Returns:
+        dict: Résultats par stratégie (grilles, temps, cache) et durée du pli
+    """
+    start = time.perf_counter()
+    numbers, stars = task['numbers'], task['stars']
+    train_end, test_end, params = task['train_end'], task['test_end'], task['params']
+    n_test, n_combinations = test_end - train_end, params['n_combinations']
+    fingerprint = history_fingerprint(numbers, stars)
+
+    def path(name):
+        if task['cache_dir'] is None:
+            return None
+        return cache_path(task['cache_dir'], fingerprint, train_end, test_end, name, params)
+
+    results, pending = {}, []
+    for strategy in task['strategies']:
+        cached = load_cached(path(strategy))
+        if cached is not None:
+            results[strategy] = {'tickets': cached['tickets'], 'fit_s': float(cached['fit_s']),
+                                 'predict_s': float(cached['predict_s']), 'cached': True}
+        else:
+            pending.append(strategy)
+
+    if LSTM_STRATEGIES & set(pending) and task.get('tf_threads'):
+        _limit_tf_threads(task['tf_threads'])
+
+    fit_s = {strategy: 0.0 for strategy in pending}
+    predict_s = {strategy: 0.0 for strategy in pending}
+
+    # Probabilités des LSTM: mises en cache pour le pli, communes à rare, balanced et ensemble
+    lstm = None
+    if LSTM_STRATEGIES & set(pending):
+        cached = load_cached(path('lstm'))
+        if cached is None or 'ensemble' in pending:
+            tick = time.perf_counter()
+            lstm = _fold_lstm(numbers, stars, train_end, test_end, params)
+            lstm_time = time.perf_counter() - tick
+            save_cached(path('lstm'), number_probs=lstm[2], star_probs=lstm[3], fit_s=lstm_time)
+            number_probs, star_probs = lstm[2], lstm[3]
+        else:
+            number_probs, star_probs, lstm_time = cached['number_probs'], cached['star_probs'], float(cached['fit_s'])
+        for strategy in LSTM_STRATEGIES & set(pending):
+            fit_s[strategy] += lstm_time
+
+    # Algorithme génétique: historique du pli, mêmes grilles pour tous les tirages de test
+    ga = None
+    if {'genetic', 'ensemble'} & set(pending):
+        tick = time.perf_counter()
+        ga = _fold_genetic(numbers, stars, train_end, params)
+        for strategy in {'genetic', 'ensemble'} & set(pending):
+            fit_s[strategy] += time.perf_counter() - tick
+    if 'genetic' in pending:
+        tick = time.perf_counter()
+        genetic_tickets = to_tickets(ga.generate_combinations(num_combinations=n_combinations, verbose=False),
+                                     n_combinations)
+        predict_s['genetic'] += time.perf_counter() - tick
+
+    ensemble = None
+    if 'ensemble' in pending:
+        from prediction.ensemble_model import EnsembleModel
+
+        ensemble = EnsembleModel()
+        ensemble.lstm_numbers_model, ensemble.lstm_stars_model = lstm[0], lstm[1]
+        ensemble.genetic_algorithm = ga
+        ensemble.genetic_time_budget = params['ensemble_ga_budget']
+        training_frame = _history_frame(numbers, stars, TRAINING_COLUMNS)
+
+    # Index des tirages pour statistical, hot, cold et balanced, complété tirage après tirage
+    index = None
+    if {'statistical', 'hot', 'cold', 'balanced'} & set(pending):
+        from preprocessing.draw_index import DrawIndex
+
+        tick = time.perf_counter()
+        index = DrawIndex(_history_frame(numbers[:train_end], stars[:train_end], SERVICE_COLUMNS))
+        for strategy in {'statistical', 'hot', 'cold', 'balanced'} & set(pending):
+            fit_s[strategy] += time.perf_counter() - tick
+
+    from prediction import strategies as service
+
+    tickets = {strategy: np.zeros((n_test, n_combinations, 7), dtype=np.uint8) for strategy in pending}
+    rngs = {strategy: np.random.RandomState(_strategy_seed(params, train_end, strategy)) for strategy in pending}
+    for i, draw in enumerate(range(train_end, test_end)):
+        for strategy in pending:
+            # Les stratégies de l'API utilisent l'état global de np.random
+            np.random.set_state(rngs[strategy].get_state())
+            tick = time.perf_counter()
+            if strategy == 'random':
+                combinations = service.generate_random_combinations(n_combinations)
+            elif strategy == 'statistical':
+                combinations = service.generate_statistical_combinations(None, n_combinations, index)
+            elif strategy == 'hot':
+                combinations = service.generate_hot_combinations(None, n_combinations, index)
+            elif strategy == 'cold':
+                combinations = service.generate_cold_combinations(None, n_combinations, index)
+            elif strategy == 'rare':
+                # Probabilités sans la classe 0 (padding): indice i -> valeur i + 1, comme dans l'API
+                combinations = service.generate_rare_combinations(number_probs[i][1:], star_probs[i][1:],
+                                                                  n_combinations)
+            elif strategy == 'balanced':
+                combinations = service.generate_balanced_combinations(number_probs[i][1:], star_probs[i][1:],
+                                                                      None, n_combinations, index)
+            elif strategy == 'genetic':
+                tickets[strategy][i] = genetic_tickets
+                continue
+            else:
+                recent = training_frame.iloc[draw - params['sequence_length']:draw]
+                combinations = ensemble.generate_combinations(recent, num_combinations=n_combinations)
+            predict_s[strategy] += time.perf_counter() - tick
+            rngs[strategy].set_state(np.random.get_state())
+            tickets[strategy][i] = to_tickets(combinations, n_combinations)
+
+        if index is not None:
+            index.append(numbers[draw].tolist(), stars[draw].tolist())
+
+    for strategy in pending:
+        save_cached(path(strategy), tickets=tickets[strategy], fit_s=fit_s[strategy], predict_s=predict_s[strategy])
+        results[strategy] = {'tickets': tickets[strategy], 'fit_s': fit_s[strategy],
+                             'predict_s': predict_s[strategy], 'cached': False}
+
+    return {'train_end': train_end, 'test_end': test_end, 'results': results,
+            'elapsed_s': time.perf_counter() - start, 'pid': os.getpid()}
+
+
+def score_fold(fold, numbers, stars):
+    """
+    Rangs de gains des grilles d'un pli face aux tirages réels
+
+    Returns:
+        dict: Stratégie -> (comptes des rangs 1-13, grilles, numéros trouvés, étoiles trouvées)
+    """
+    scores = {}
+    for strategy, result in fold['results'].items():
+        tier_counts = np.zeros(len(PRIZE_TIERS) + 1, dtype=np.int64)
+        n_tickets = number_hits = star_hits = 0
+        for i, draw in enumerate(range(fold['train_end'], fold['test_end'])):
+            tickets = result['tickets'][i]
+            tickets = tickets[tickets[:, 0] > 0]
+            hits_n, hits_s, tiers = prize_tiers(tickets, numbers[draw], stars[draw])
+            tier_counts += np.bincount(tiers, minlength=len(tier_counts))
+            n_tickets += len(tickets)
+            number_hits += int(hits_n.sum())
+            star_hits += int(hits_s.sum())
+        scores[strategy] = (tier_counts[1:], n_tickets, number_hits, star_hits)
+    return scores
+
+
+def summarize(folds, numbers, stars, wall_s):
+    """
+    Métriques prédictives et d'exécution par stratégie, sommées sur les plis
+
+    Returns:
+        dict: Rapport du backtest
+    """
+    expected = random_tier_probabilities()
+    report = {'folds': len(folds), 'draws_evaluated': sum(f['test_end'] - f['train_end'] for f in folds),
+              'wall_s': round(wall_s, 3), 'fold_s': round(sum(f['elapsed_s'] for f in folds), 3),
+              'workers': len({f['pid'] for f in folds}), 'strategies': {}}
+    report['speedup'] = round(report['fold_s'] / wall_s, 2) if wall_s > 0 else None
+
+    totals = {}
+    for fold in folds:
+        for strategy, (tiers, n_tickets, number_hits, star_hits) in score_fold(fold, numbers, stars).items():
+            total = totals.setdefault(strategy, {'tiers': np.zeros(len(PRIZE_TIERS), np.int64), 'tickets': 0,
+                                                 'number_hits': 0, 'star_hits': 0, 'fit_s': 0.0,
+                                                 'predict_s': 0.0, 'cached_folds': 0})
+            total['tiers'] += tiers
+            total['tickets'] += n_tickets
+            total['number_hits'] += number_hits
+            total['star_hits'] += star_hits
+            result = fold['results'][strategy]
+            total['fit_s'] += result['fit_s']
+            total['predict_s'] += result['predict_s']
+            total['cached_folds'] += int(result['cached'])
+
+    for strategy in [s for s in STRATEGIES if s in totals]:
+        total = totals[strategy]
+        tickets = max(total['tickets'], 1)
+        winning = int(total['tiers'].sum())
+        report['strategies'][strategy] = {
+            'tickets': total['tickets'],
+            'tier_counts': {str(rank): int(count) for rank, count in enumerate(total['tiers'], start=1)},
+            'winning_tickets': winning,
+            'win_rate': round(winning / tickets, 5),
+            'expected_win_rate': round(float(expected.sum()), 5),
+            'lift': round(winning / (tickets * float(expected.sum())), 3),
+            'mean_numbers_matched': round(total['number_hits'] / tickets, 4),
+            'mean_stars_matched': round(total['star_hits'] / tickets, 4),
+            'fit_s': round(total['fit_s'], 3),
+            'predict_ms_per_draw': round(total['predict_s'] / max(report['draws_evaluated'], 1) * 1000, 3),
+            'cached_folds': total['cached_folds']
+        }
+    return report
+
+
+def run_backtest(history, strategies=None, min_train=200, test_size=20, max_folds=None, n_workers=None,
+                 cache_dir=os.path.join(MODELS_DIR, 'backtest'), **params):
+    """
+    Backtest walk-forward de toutes les stratégies, un pli par tâche du pool de processus
+
+    Args:
+        history (DrawStore ou DataFrame): Tirages (colonnes numero*/etoile* ou n1-n5/s1-s2)
+        strategies (list, optional): Stratégies évaluées (par défaut STRATEGIES)
+        min_train (int): Tirages d'entraînement du premier pli
+        test_size (int): Tirages évalués par pli
+        max_folds (int, optional): Nombre maximal de plis (les plus récents)
+        n_workers (int, optional): Nombre de processus (par défaut min(plis, cœurs)); 1: sans pool
+        cache_dir (str, optional): Répertoire du cache des sorties par pli (None: sans cache)
+        **params: Paramètres des modèles (voir DEFAULT_PARAMS)
+
+    Returns:
+        dict: Rapport (voir summarize)
+    """
+    unknown = set(params) - set(DEFAULT_PARAMS)
+    if unknown:
+        raise ValueError(f"Paramètres inconnus: {sorted(unknown)}")
+    params = {**DEFAULT_PARAMS, **params}
+    strategies = list(strategies or STRATEGIES)
+    invalid = set(strategies) - set(STRATEGIES)
+    if invalid:
+        raise ValueError(f"Stratégies inconnues: {sorted(invalid)}")
+
+    if hasattr(history, 'columns'):
+        columns = TRAINING_COLUMNS if 'numero1' in history.columns else SERVICE_COLUMNS
+        numbers = history[columns[:5]].to_numpy(dtype=np.uint8)
+        stars = history[columns[5:]].to_numpy(dtype=np.uint8)
+    else:
+        numbers, stars = np.asarray(history.numbers), np.asarray(history.stars)
+
+    min_train = max(min_train, params['sequence_length'] * 5)
+    folds = walk_forward_folds(len(numbers), min_train, test_size, max_folds)
+    if not folds:
+        raise ValueError(f"Historique trop court pour un backtest: {len(numbers)} tirages")
+
+    n_workers = n_workers or min(len(folds), os.cpu_count() or 1)
+    tf_threads = max(1, (os.cpu_count() or 1) // n_workers) if n_workers > 1 else None
+    tasks = [{'numbers': numbers[:test_end], 'stars': stars[:test_end], 'train_end': train_end,
+              'test_end': test_end, 'strategies': strategies, 'params': params, 'cache_dir': cache_dir,
+              'tf_threads': tf_threads}
+             for train_end, test_end in folds]
+
+    start = time.perf_counter()
+    if n_workers == 1:
+        results = [run_fold(task) for task in tasks]
+    else:
+        # spawn: TensorFlow, s'il est déjà initialisé ici, ne survit pas à un fork
+        with ProcessPoolExecutor(max_workers=n_workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+            results = list(pool.map(run_fold, tasks))
+    report = summarize(results, numbers, stars, time.perf_counter() - start)
+
+    logger.info(f"Backtest: {report['folds']} plis, {report['draws_evaluated']} tirages évalués, "
+                f"{n_workers} processus, {report['wall_s']} s (accélération x{report['speedup']})")
+    return report
+
+
+def format_report(report):
+    """
+    Tableau texte du rapport (une ligne par stratégie)
+    """
+    lines = [f"{report['folds']} plis, {report['draws_evaluated']} tirages évalués, {report['wall_s']} s "
+             f"({report['workers']} processus, accélération x{report['speedup']})",
+             f"{'stratégie':>12} {'grilles':>8} {'gagnantes':>10} {'taux':>8} {'lift':>6} {'num.':>6} "
+             f"{'ét.':>6} {'rangs 1-13':>40} {'fit (s)':>8} {'ms/tirage':>10} {'cache':>6}"]
+    for strategy, metrics in report['strategies'].items():
+        tiers = ' '.join(str(count) for count in metrics['tier_counts'].values())
+        lines.append(f"{strategy:>12} {metrics['tickets']:>8} {metrics['winning_tickets']:>10} "
+                     f"{metrics['win_rate']:>8.4f} {metrics['lift']:>6.2f} {metrics['mean_numbers_matched']:>6.3f} "
+                     f"{metrics['mean_stars_matched']:>6.3f} {tiers:>40} {metrics['fit_s']:>8.2f} "
+                     f"{metrics['predict_ms_per_draw']:>10.2f} {metrics['cached_folds']:>6}")
+    return '\n'.join(lines)
+
+
+# Vérification sur un historique synthétique: rangs, plis, cache et exécution parallèle
+def test_backtest(n_draws=300, seed=42):
+    assert TIER_TABLE[5, 2] == 1 and TIER_TABLE[2, 0] == 13 and TIER_TABLE[1, 1] == 0
+    assert abs(1 / random_tier_probabilities().sum() - 13) < 0.1
+
+    tickets = np.array([[1, 2, 3, 4, 5, 1, 2], [1, 2, 30, 40, 50, 3, 4], [0] * 7], dtype=np.uint8)
+    number_hits, star_hits, tiers = prize_tiers(tickets, [1, 2, 3, 4, 5], [1, 2])
+    assert number_hits.tolist() == [5, 2, 0] and star_hits.tolist() == [2, 0, 0] and tiers.tolist() == [1, 13, 0]
+
+    folds = walk_forward_folds(n_draws, min_train=200, test_size=30)
+    assert folds[0] == (200, 230) and folds[-1] == (290, 300)
+
+    rng = np.random.default_rng(seed)
+    numbers = np.sort(rng.random((n_draws, 50)).argsort(axis=1)[:, :5] + 1, axis=1)
+    stars = np.sort(rng.random((n_draws, 12)).argsort(axis=1)[:, :2] + 1, axis=1)
+    history = _history_frame(numbers, stars, SERVICE_COLUMNS)
+
+    # Stratégies sans TensorFlow: parallèle puis relecture du cache, résultats identiques
+    cache_dir = tempfile.mkdtemp()
+    fast = ['random', 'statistical', 'hot', 'cold', 'genetic']
+    first = run_backtest(history, fast, min_train=200, test_size=25, n_workers=2, cache_dir=cache_dir,
+                         ga_generations=5)
+    second = run_backtest(history, fast, min_train=200, test_size=25, n_workers=1, cache_dir=cache_dir,
+                          ga_generations=5)
+    for strategy in fast:
+        metrics, cached = first['strategies'][strategy], second['strategies'][strategy]
+        assert metrics['tickets'] == 4 * 25 * 5 and cached['cached_folds'] == 4
+        assert metrics['tier_counts'] == cached['tier_counts']
+
+    # Le pli ne voit pas le tirage qu'il prédit: 'hot' ne dépend que des tirages antérieurs
+    fold = run_fold({'numbers': numbers[:230], 'stars': stars[:230], 'train_end': 200, 'test_end': 230,
+                     'strategies': ['hot'], 'params': DEFAULT_PARAMS, 'cache_dir': None})
+    changed = numbers[:230].copy()
+    changed[229] = [46, 47, 48, 49, 50]
+    other = run_fold({'numbers': changed, 'stars': stars[:230], 'train_end': 200, 'test_end': 230,
+                      'strategies': ['hot'], 'params': DEFAULT_PARAMS, 'cache_dir': None})
+    assert np.array_equal(fold['results']['hot']['tickets'], other['results']['hot']['tickets'])
+
+    print(format_report(first))
+    logger.info("Backtest vérifié")
+    return first
+
+
+# Backtest en ligne de commande: python backtest.py [tirages.draws] [processus]
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == '--test':
+        test_backtest()
+    else:
+        from preprocessing.draw_store import DrawStore
+
+        store = DrawStore.open(sys.argv[1] if len(sys.argv) > 1 else
+                               os.path.join(os.path.dirname(MODELS_DIR), 'data', 'euromillions_history.draws'))
+        print(format_report(run_backtest(store, n_workers=int(sys.argv[2]) if len(sys.argv) > 2 else None)))
@@ -12,21 +12,37 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import ROOT_DIR, DATA_DIR, MODELS_DIR, logger
 from training.lstm_numbers_model import LSTMNumbersModel
 from training.lstm_stars_model import LSTMStarsModel
+from training.lstm_multihead_model import LSTMMultiHeadModel
 from training.genetic_algorithm import GeneticAlgorithm
+from preprocessing.draw_store import DrawStore
+
+# Colonnes des tirages utilisées par les modèles d'entraînement
+NUMBER_COLUMNS = ['numero1', 'numero2', 'numero3', 'numero4', 'numero5']
+STAR_COLUMNS = ['etoile1', 'etoile2']
 
 class EnsembleModel:
     """
     Système d'ensemble combinant les prédictions des différents modèles
     """
     
-    def __init__(self):
+    def __init__(self, unified=False):
         """
         Initialisation du système d'ensemble
+        
+        Args:
+            unified (bool): Modèle LSTM multi-sorties unique (numéros et étoiles)
+                au lieu des deux modèles séparés
         """
+        self.unified = unified
         self.lstm_numbers_model = LSTMNumbersModel()
         self.lstm_stars_model = LSTMStarsModel()
+        self.lstm_multihead_model = LSTMMultiHeadModel()
         self.genetic_algorithm = GeneticAlgorithm()
         
+        # Limites de l'algorithme génétique lorsqu'il est appelé pendant une requête
+        self.genetic_time_budget = float(os.environ.get('GA_TIME_BUDGET', 2.0))
+        self.genetic_patience = int(os.environ.get('GA_PATIENCE', 10))
+        
         # Poids des différents modèles dans l'ensemble
         self.weights = {
             'lstm_numbers': 0.4,
@@ -42,7 +58,8 @@ class EnsembleModel:
         
         logger.info("Système d'ensemble initialisé")
     
-    def load_models(self, lstm_numbers_path=None, lstm_stars_path=None, genetic_path=None):
+    def load_models(self, lstm_numbers_path=None, lstm_stars_path=None, genetic_path=None,
+                    lstm_multihead_path=None):
         """
         Chargement des modèles individuels
         
@@ -50,18 +67,26 @@ class EnsembleModel:
             lstm_numbers_path (str, optional): Chemin du modèle LSTM pour les numéros
             lstm_stars_path (str, optional): Chemin du modèle LSTM pour les étoiles
             genetic_path (str, optional): Chemin de l'algorithme génétique
+            lstm_multihead_path (str, optional): Chemin du modèle LSTM multi-sorties
         """
-        try:
-            self.lstm_numbers_model.load(lstm_numbers_path)
-            logger.info("Modèle LSTM pour les numéros chargé avec succès")
-        except Exception as e:
-            logger.warning(f"Impossible de charger le modèle LSTM pour les numéros: {e}")
-        
-        try:
-            self.lstm_stars_model.load(lstm_stars_path)
-            logger.info("Modèle LSTM pour les étoiles chargé avec succès")
-        except Exception as e:
-            logger.warning(f"Impossible de charger le modèle LSTM pour les étoiles: {e}")
+        if self.unified:
+            try:
+                self.lstm_multihead_model.load(lstm_multihead_path)
+                logger.info("Modèle LSTM multi-sorties chargé avec succès")
+            except Exception as e:
+                logger.warning(f"Impossible de charger le modèle LSTM multi-sorties: {e}")
+        else:
+            try:
+                self.lstm_numbers_model.load(lstm_numbers_path)
+                logger.info("Modèle LSTM pour les numéros chargé avec succès")
+            except Exception as e:
+                logger.warning(f"Impossible de charger le modèle LSTM pour les numéros: {e}")
+            
+            try:
+                self.lstm_stars_model.load(lstm_stars_path)
+                logger.info("Modèle LSTM pour les étoiles chargé avec succès")
+            except Exception as e:
+                logger.warning(f"Impossible de charger le modèle LSTM pour les étoiles: {e}")
         
         try:
             self.genetic_algorithm.load(genetic_path)
@@ -69,24 +94,51 @@ class EnsembleModel:
         except Exception as e:
             logger.warning(f"Impossible de charger l'algorithme génétique: {e}")
     
+    def load_history(self, filepath=None):
+        """
+        Ouverture de l'historique des tirages au format binaire
+        
+        Args:
+            filepath (str, optional): Chemin du fichier .draws. Par défaut None.
+            
+        Returns:
+            DrawStore: Tirages projetés en mémoire
+        """
+        if filepath is None:
+            filepath = os.path.join(DATA_DIR, 'euromillions_history.draws')
+        
+        store = DrawStore.open(filepath)
+        logger.info(f"Historique chargé depuis {filepath}: {len(store)} tirages")
+        return store
+    
     def train_models(self, data):
         """
         Entraînement de tous les modèles
         
         Args:
-            data (DataFrame): DataFrame contenant les tirages historiques
+            data (DataFrame or DrawStore): Tirages historiques (DataFrame ou fichier binaire)
         """
-        # Entraînement du modèle LSTM pour les numéros
-        logger.info("Début de l'entraînement du modèle LSTM pour les numéros")
-        self.lstm_numbers_model.train(data)
-        
-        # Entraînement du modèle LSTM pour les étoiles
-        logger.info("Début de l'entraînement du modèle LSTM pour les étoiles")
-        self.lstm_stars_model.train(data)
+        # Le fichier binaire est transmis tel quel à l'algorithme génétique
+        store = data if isinstance(data, DrawStore) else None
+        if store is not None:
+            data = store.to_dataframe(NUMBER_COLUMNS, STAR_COLUMNS)
+        
+        if self.unified:
+            # Un seul entraînement pour les numéros et les étoiles
+            logger.info("Début de l'entraînement du modèle LSTM multi-sorties")
+            self.lstm_multihead_model.train(data)
+        else:
+            # Entraînement du modèle LSTM pour les numéros
+            logger.info("Début de l'entraînement du modèle LSTM pour les numéros")
+            self.lstm_numbers_model.train(data)
+            
+            # Entraînement du modèle LSTM pour les étoiles
+            logger.info("Début de l'entraînement du modèle LSTM pour les étoiles")
+            self.lstm_stars_model.train(data)
         
         # Chargement des données historiques pour l'algorithme génétique
         logger.info("Chargement des données historiques pour l'algorithme génétique")
-        self.genetic_algorithm.load_historical_data(data)
+        self.genetic_algorithm.load_historical_data(store if store is not None else data)
         
         logger.info("Entraînement de tous les modèles terminé")
     
@@ -95,7 +147,7 @@ class EnsembleModel:
         Génération de combinaisons en utilisant tous les modèles
         
         Args:
-            recent_draws (DataFrame): Tirages récents pour la prédiction
+            recent_draws (DataFrame or DrawStore): Tirages récents pour la prédiction
             num_combinations (int): Nombre de combinaisons à générer
             strategy (str): Stratégie de génération ('balanced', 'conservative', 'risky')
             
@@ -103,31 +155,55 @@ class EnsembleModel:
             list: Liste des combinaisons générées avec leurs scores de confiance
         """
         # Extraction des numéros et étoiles des tirages récents
-        numbers = recent_draws[['numero1', 'numero2', 'numero3', 'numero4', 'numero5']].values
-        stars = recent_draws[['etoile1', 'etoile2']].values
-        
-        # Prédiction avec le modèle LSTM pour les numéros
-        try:
-            lstm_numbers, lstm_numbers_probs = self.lstm_numbers_model.predict(numbers)
-            logger.info(f"Prédiction LSTM pour les numéros: {lstm_numbers}")
-        except Exception as e:
-            logger.error(f"Erreur lors de la prédiction LSTM pour les numéros: {e}")
-            lstm_numbers = []
-            lstm_numbers_probs = np.zeros(self.num_numbers + 1)
-        
-        # Prédiction avec le modèle LSTM pour les étoiles
-        try:
-            lstm_stars, lstm_stars_probs = self.lstm_stars_model.predict(stars)
-            logger.info(f"Prédiction LSTM pour les étoiles: {lstm_stars}")
-        except Exception as e:
-            logger.error(f"Erreur lors de la prédiction LSTM pour les étoiles: {e}")
-            lstm_stars = []
-            lstm_stars_probs = np.zeros(self.num_stars + 1)
+        if isinstance(recent_draws, DrawStore):
+            sequence_length = self.lstm_numbers_model.sequence_length
+            numbers = np.asarray(recent_draws.numbers[-sequence_length:])
+            stars = np.asarray(recent_draws.stars[-self.lstm_stars_model.sequence_length:])
+        else:
+            numbers = recent_draws[NUMBER_COLUMNS].values
+            stars = recent_draws[STAR_COLUMNS].values
+        
+        if self.unified:
+            # Un seul appel du modèle multi-sorties pour les numéros et les étoiles
+            sequence_length = self.lstm_multihead_model.sequence_length
+            try:
+                lstm_numbers, lstm_numbers_probs, lstm_stars, lstm_stars_probs = \
+                    self.lstm_multihead_model.predict(numbers[-sequence_length:], stars[-sequence_length:])
+                logger.info(f"Prédiction LSTM multi-sorties: {lstm_numbers} + {lstm_stars}")
+            except Exception as e:
+                logger.error(f"Erreur lors de la prédiction LSTM multi-sorties: {e}")
+                lstm_numbers, lstm_stars = [], []
+                lstm_numbers_probs = np.zeros(self.num_numbers + 1)
+                lstm_stars_probs = np.zeros(self.num_stars + 1)
+        else:
+            # Prédiction avec le modèle LSTM pour les numéros
+            try:
+                lstm_numbers, lstm_numbers_probs = self.lstm_numbers_model.predict(numbers)
+                logger.info(f"Prédiction LSTM pour les numéros: {lstm_numbers}")
+            except Exception as e:
+                logger.error(f"Erreur lors de la prédiction LSTM pour les numéros: {e}")
+                lstm_numbers = []
+                lstm_numbers_probs = np.zeros(self.num_numbers + 1)
+            
+            # Prédiction avec le modèle LSTM pour les étoiles
+            try:
+                lstm_stars, lstm_stars_probs = self.lstm_stars_model.predict(stars)
+                logger.info(f"Prédiction LSTM pour les étoiles: {lstm_stars}")
+            except Exception as e:
+                logger.error(f"Erreur lors de la prédiction LSTM pour les étoiles: {e}")
+                lstm_stars = []
+                lstm_stars_probs = np.zeros(self.num_stars + 1)
         
         # Génération de combinaisons avec l'algorithme génétique
         try:
-            genetic_combinations = self.genetic_algorithm.generate_combinations(num_combinations=num_combinations)
-            logger.info(f"Combinaisons générées par l'algorithme génétique: {len(genetic_combinations)}")
+            genetic_combinations = self.genetic_algorithm.generate_combinations(
+                num_combinations=num_combinations,
+                time_budget=self.genetic_time_budget,
+                patience=self.genetic_patience,
+                verbose=False
+            )
+            logger.info(f"Combinaisons générées par l'algorithme génétique: {len(genetic_combinations)} "
+                        f"({self.genetic_algorithm.run_stats['stop_reason']})")
         except Exception as e:
             logger.error(f"Erreur lors de la génération de combinaisons avec l'algorithme génétique: {e}")
             genetic_combinations = []
@@ -224,18 +300,24 @@ class EnsembleModel:
             filepath = MODELS_DIR
         
         # Sauvegarde des modèles individuels
-        try:
-            self.lstm_numbers_model.save(os.path.join(filepath, 'lstm_numbers_model.h5'))
-        except Exception as e:
-            logger.error(f"Erreur lors de la sauvegarde du modèle LSTM pour les numéros: {e}")
-        
-        try:
-            self.lstm_stars_model.save(os.path.join(filepath, 'lstm_stars_model.h5'))
-        except Exception as e:
-            logger.error(f"Erreur lors de la sauvegarde du modèle LSTM pour les étoiles: {e}")
+        if self.unified:
+            try:
+                self.lstm_multihead_model.save(os.path.join(filepath, 'lstm_multihead_model.h5'))
+            except Exception as e:
+                logger.error(f"Erreur lors de la sauvegarde du modèle LSTM multi-sorties: {e}")
+        else:
+            try:
+                self.lstm_numbers_model.save(os.path.join(filepath, 'lstm_numbers_model.h5'))
+            except Exception as e:
+                logger.error(f"Erreur lors de la sauvegarde du modèle LSTM pour les numéros: {e}")
+            
+            try:
+                self.lstm_stars_model.save(os.path.join(filepath, 'lstm_stars_model.h5'))
+            except Exception as e:
+                logger.error(f"Erreur lors de la sauvegarde du modèle LSTM pour les étoiles: {e}")
         
         try:
-            self.genetic_algorithm.save(os.path.join(filepath, 'genetic_algorithm.pkl'))
+            self.genetic_algorithm.save(os.path.join(filepath, 'genetic_algorithm.npz'))
         except Exception as e:
             logger.error(f"Erreur lors de la sauvegarde de l'algorithme génétique: {e}")
         
@@ -259,11 +341,17 @@ class EnsembleModel:
         if filepath is None:
             filepath = MODELS_DIR
         
+        # Artefact .npz du GA, ou ancienne sauvegarde pickle à défaut
+        genetic_path = os.path.join(filepath, 'genetic_algorithm.npz')
+        if not os.path.exists(genetic_path):
+            genetic_path = os.path.join(filepath, 'genetic_algorithm.pkl')
+        
         # Chargement des modèles individuels
         self.load_models(
             lstm_numbers_path=os.path.join(filepath, 'lstm_numbers_model.h5'),
             lstm_stars_path=os.path.join(filepath, 'lstm_stars_model.h5'),
-            genetic_path=os.path.join(filepath, 'genetic_algorithm.pkl')
+            genetic_path=genetic_path,
+            lstm_multihead_path=os.path.join(filepath, 'lstm_multihead_model.h5')
         )
         
         # Chargement des poids de l'ensemble
@@ -0,0 +1,137 @@
+import numpy as np
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future
+
+# Ajout du répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import logger
+
+
+class InferenceScheduler:
+    """
+    Ordonnanceur d'inférence par micro-lots
+
+    Les requêtes concurrentes sont regroupées pendant une courte fenêtre puis
+    évaluées en un seul appel `predict()` du modèle, ce qui amortit le coût
+    fixe de Keras par appel. Chaque requête récupère ensuite sa propre ligne
+    de résultat. L'ordonnanceur expose la même méthode `predict()` qu'un
+    modèle Keras et peut donc le remplacer directement.
+    """
+
+    def __init__(self, model, max_batch_size=32, max_wait_ms=5, name='model'):
+        """
+        Initialisation de l'ordonnanceur
+
+        Args:
+            model: Modèle exposant une méthode predict(batch)
+            max_batch_size (int): Nombre maximal d'exemples par appel au modèle
+            max_wait_ms (float): Attente maximale pour compléter un lot (ms)
+            name (str): Nom du modèle pour les logs
+        """
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.name = name
+
+        self._queue = queue.Queue()
+
+        # Compteurs pour le suivi
+        self.batches = 0
+        self.samples = 0
+
+        self._worker = threading.Thread(target=self._run, name=f"inference-{name}", daemon=True)
+        self._worker.start()
+
+        logger.info(f"Ordonnanceur d'inférence '{name}' initialisé avec max_batch_size={max_batch_size}, max_wait_ms={max_wait_ms}")
+
+    def predict(self, X):
+        """
+        Prédiction bloquante, regroupée avec les requêtes concurrentes
+
+        Args:
+            X (array): Entrées du modèle (un ou plusieurs exemples)
+
+        Returns:
+            array: Sorties du modèle pour ces entrées
+        """
+        return self.submit(X).result()
+
+    def submit(self, X):
+        """
+        Soumission non bloquante d'une requête d'inférence
+
+        Args:
+            X (array): Entrées du modèle (un ou plusieurs exemples)
+
+        Returns:
+            Future: Résultat futur de l'inférence
+        """
+        future = Future()
+        self._queue.put((np.asarray(X), future))
+        return future
+
+    def _collect_batch(self):
+        """
+        Attente de la première requête puis regroupement jusqu'à remplir le
+        lot ou atteindre la fenêtre d'attente maximale
+        """
+        first = self._queue.get()
+        batch = [first]
+        size = len(first[0])
+        deadline = time.monotonic() + self.max_wait
+
+        while size < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(item)
+            size += len(item[0])
+
+        return batch
+
+    def _run(self):
+        """
+        Boucle du thread d'inférence
+        """
+        while True:
+            batch = self._collect_batch()
+            inputs = [X for X, _ in batch]
+            futures = [future for _, future in batch]
+
+            try:
+                outputs = self.model.predict(np.concatenate(inputs, axis=0))
+            except Exception as e:
+                logger.error(f"Erreur lors de l'inférence par lot '{self.name}': {e}")
+                for future in futures:
+                    future.set_exception(e)
+                continue
+
+            # Redistribution des résultats aux requêtes en attente
+            offset = 0
+            for X, future in zip(inputs, futures):
+                future.set_result(outputs[offset:offset + len(X)])
+                offset += len(X)
+
+            self.batches += 1
+            self.samples += offset
+
+    def stats(self):
+        """
+        Statistiques de regroupement
+
+        Returns:
+            dict: Nombre de lots, d'exemples et taille moyenne des lots
+        """
+        return {
+            'batches': self.batches,
+            'samples': self.samples,
+            'mean_batch_size': round(self.samples / self.batches, 2) if self.batches else 0.0
+        }
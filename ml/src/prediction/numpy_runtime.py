@@ -0,0 +1,188 @@
+import json
+import numpy as np
+import os
+import sys
+
+# Ajout du répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import logger
+
+# Version du format d'export .npz (voir training/export_numpy.py)
+FORMAT_VERSION = 1
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def _hard_sigmoid(x):
+    return np.clip(0.2 * x + 0.5, 0.0, 1.0)
+
+
+def _softmax(x):
+    e = np.exp(x - x.max(axis=-1, keepdims=True))
+    return e / e.sum(axis=-1, keepdims=True)
+
+
+ACTIVATIONS = {
+    'linear': lambda x: x,
+    'relu': lambda x: np.maximum(x, 0.0),
+    'tanh': np.tanh,
+    'sigmoid': _sigmoid,
+    'hard_sigmoid': _hard_sigmoid,
+    'softmax': _softmax
+}
+
+
+class NumpyModel:
+    """
+    Exécution en NumPy pur des modèles LSTM exportés
+
+    Implémente exactement les couches utilisées par les modèles EuroGenius
+    (Embedding, LSTM, Bidirectional(LSTM), Dense, Dropout) en inférence
+    seule, à partir d'un export .npz. Aucun import de TensorFlow n'est
+    nécessaire. La méthode `predict()` a la même signature que celle d'un
+    modèle Keras.
+    """
+
+    def __init__(self, layers, dtype=np.float32):
+        """
+        Initialisation du modèle
+
+        Args:
+            layers (list): Description des couches avec leurs poids
+            dtype: Type flottant utilisé pour les calculs
+        """
+        self.layers = layers
+        self.dtype = dtype
+
+    @classmethod
+    def load(cls, filepath):
+        """
+        Chargement d'un modèle exporté
+
+        Args:
+            filepath (str): Chemin du fichier .npz
+
+        Returns:
+            NumpyModel: Modèle prêt pour l'inférence
+        """
+        if not os.path.exists(filepath):
+            raise FileNotFoundError(f"Le fichier modèle {filepath} n'existe pas")
+
+        with np.load(filepath, allow_pickle=False) as archive:
+            header = json.loads(str(archive['header']))
+            if header['format_version'] != FORMAT_VERSION:
+                raise ValueError(f"Version de format non supportée: {header['format_version']}")
+
+            layers = []
+            for i, spec in enumerate(header['layers']):
+                weights = {name: archive[f"layer{i}/{name}"] for name in spec['weights']}
+                layers.append(dict(spec, weights=weights))
+
+        logger.info(f"Modèle NumPy chargé depuis {filepath} ({len(layers)} couches)")
+        return cls(layers)
+
+    def predict(self, X, **kwargs):
+        """
+        Propagation avant
+
+        Args:
+            X (array): Entrées du modèle (même forme que pour le modèle Keras)
+
+        Returns:
+            array: Sorties du modèle
+        """
+        output = np.asarray(X)
+        for layer in self.layers:
+            output = self._apply(layer, output)
+        return output
+
+    def __call__(self, X):
+        return self.predict(X)
+
+    def _apply(self, layer, x):
+        """
+        Application d'une couche
+        """
+        kind = layer['type']
+        weights = layer['weights']
+
+        if kind == 'Embedding':
+            return weights['embeddings'][x.astype(np.int64)]
+        if kind == 'Dense':
+            output = x.astype(self.dtype, copy=False) @ weights['kernel']
+            if 'bias' in weights:
+                output = output + weights['bias']
+            return ACTIVATIONS[layer['activation']](output)
+        if kind == 'Dropout':
+            # Le dropout est inactif en inférence
+            return x
+        if kind == 'LSTM':
+            return self._lstm(layer, weights, x)
+        if kind == 'Bidirectional':
+            forward = self._lstm(layer['forward'], {
+                name[len('forward/'):]: value for name, value in weights.items() if name.startswith('forward/')
+            }, x)
+            backward = self._lstm(layer['backward'], {
+                name[len('backward/'):]: value for name, value in weights.items() if name.startswith('backward/')
+            }, x)
+            if layer['forward']['return_sequences']:
+                # Réalignement temporel des sorties de la couche arrière
+                backward = backward[:, ::-1]
+            return self._merge(forward, backward, layer['merge_mode'])
+
+        raise ValueError(f"Couche non supportée par le runtime NumPy: {kind}")
+
+    @staticmethod
+    def _merge(forward, backward, merge_mode):
+        """
+        Fusion des sorties d'une couche bidirectionnelle
+        """
+        if merge_mode == 'concat':
+            return np.concatenate([forward, backward], axis=-1)
+        if merge_mode == 'sum':
+            return forward + backward
+        if merge_mode == 'mul':
+            return forward * backward
+        if merge_mode == 'ave':
+            return (forward + backward) / 2
+        raise ValueError(f"Mode de fusion non supporté: {merge_mode}")
+
+    def _lstm(self, config, weights, x):
+        """
+        Couche LSTM (ordre des portes Keras: entrée, oubli, cellule, sortie)
+        """
+        x = x.astype(self.dtype, copy=False)
+        kernel = weights['kernel']
+        recurrent_kernel = weights['recurrent_kernel']
+        bias = weights.get('bias')
+        units = recurrent_kernel.shape[0]
+        activation = ACTIVATIONS[config['activation']]
+        recurrent_activation = ACTIVATIONS[config['recurrent_activation']]
+
+        if config.get('go_backwards'):
+            x = x[:, ::-1]
+
+        # Projection des entrées pour tous les pas de temps en une seule opération
+        projected = x @ kernel
+        if bias is not None:
+            projected = projected + bias
+
+        batch_size, timesteps = x.shape[0], x.shape[1]
+        h = np.zeros((batch_size, units), dtype=self.dtype)
+        c = np.zeros((batch_size, units), dtype=self.dtype)
+        outputs = np.empty((batch_size, timesteps, units), dtype=self.dtype) if config['return_sequences'] else None
+
+        for t in range(timesteps):
+            z = projected[:, t] + h @ recurrent_kernel
+            i = recurrent_activation(z[:, :units])
+            f = recurrent_activation(z[:, units:2 * units])
+            g = activation(z[:, 2 * units:3 * units])
+            o = recurrent_activation(z[:, 3 * units:])
+            c = f * c + i * g
+            h = o * activation(c)
+            if outputs is not None:
+                outputs[:, t] = h
+
+        return outputs if outputs is not None else h
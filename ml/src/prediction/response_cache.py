@@ -0,0 +1,147 @@
+import hashlib
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+# Ajout du répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import logger
+
+
+class ResponseCache:
+    """
+    Cache LRU/TTL borné des réponses déterministes de l'API ML
+
+    Les entrées sont indexées par (endpoint, stratégie, n, version des données):
+    un changement d'historique rend donc automatiquement les anciennes entrées
+    inaccessibles. Chaque entrée conserve le corps JSON sérialisé et son ETag
+    afin de permettre la revalidation conditionnelle (If-None-Match).
+    """
+
+    def __init__(self, max_entries=256, ttl=3600):
+        """
+        Initialisation du cache
+
+        Args:
+            max_entries (int): Nombre maximal d'entrées conservées
+            ttl (float): Durée de vie d'une entrée en secondes (0 = illimitée)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Compteurs exposés pour le suivi
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        logger.info(f"Cache de réponses initialisé avec max_entries={max_entries}, ttl={ttl}")
+
+    @staticmethod
+    def make_key(endpoint, strategy=None, n=None, version=0):
+        """
+        Construction de la clé de cache
+
+        Args:
+            endpoint (str): Nom de la route
+            strategy (str, optional): Stratégie de génération
+            n (int, optional): Nombre de combinaisons demandées
+            version (int): Version de l'historique des tirages
+
+        Returns:
+            tuple: Clé de cache
+        """
+        return (endpoint, strategy, n, version)
+
+    @staticmethod
+    def compute_etag(body):
+        """
+        Calcul de l'ETag d'un corps de réponse
+
+        Args:
+            body (bytes): Corps JSON sérialisé
+
+        Returns:
+            str: Empreinte SHA-1 du corps
+        """
+        return hashlib.sha1(body).hexdigest()
+
+    def get(self, key):
+        """
+        Lecture d'une entrée du cache
+
+        Args:
+            key (tuple): Clé de cache
+
+        Returns:
+            tuple: (body, etag) ou None si absente ou expirée
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl and entry[2] < time.monotonic():
+                # Entrée expirée
+                del self._entries[key]
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0], entry[1]
+
+    def put(self, key, body):
+        """
+        Enregistrement d'une réponse dans le cache
+
+        Args:
+            key (tuple): Clé de cache
+            body (bytes): Corps JSON sérialisé
+
+        Returns:
+            str: ETag associé au corps
+        """
+        etag = self.compute_etag(body)
+        expires_at = time.monotonic() + self.ttl if self.ttl else float('inf')
+
+        with self._lock:
+            self._entries[key] = (body, etag, expires_at)
+            self._entries.move_to_end(key)
+
+            # Éviction des entrées les moins récemment utilisées
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+        return etag
+
+    def invalidate(self):
+        """
+        Suppression de toutes les entrées (changement d'historique)
+        """
+        with self._lock:
+            self._entries.clear()
+        logger.info("Cache de réponses invalidé")
+
+    def stats(self):
+        """
+        Statistiques d'utilisation du cache
+
+        Returns:
+            dict: Compteurs de hits/misses, taille et taux de succès
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0
+            }
@@ -0,0 +1,341 @@
+import numpy as np
+import os
+import struct
+import sys
+import tempfile
+from math import comb
+
+# Ajout du répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import logger
+from preprocessing.draw_store import history_fingerprint
+
+# Signature et version du format binaire de la table des scores
+MAGIC = b'EGST'
+FORMAT_VERSION = 1
+
+# En-tête: signature, version, numéros max, étoiles max, numéros et étoiles
+# par grille, nombre d'ensembles de numéros, nombre de paires d'étoiles,
+# tirages de l'historique, constante de la fitness, empreinte de
+# l'historique (128 octets au total)
+HEADER_FORMAT = '<4sHBBBBxxQQQd32s'
+HEADER_SIZE = 128
+
+# Extension des fichiers de table des scores
+TABLE_EXTENSION = '.scores'
+
+
+# Tables des coefficients binomiaux, calculées une fois par processus
+_binomial_tables = {}
+
+
+def _binomials(max_value, k):
+    """
+    Table des coefficients binomiaux C(n, r) pour n <= max_value, r <= k
+    """
+    key = (max_value, k)
+    if key not in _binomial_tables:
+        _binomial_tables[key] = np.array([[comb(n, r) for r in range(k + 1)] for n in range(max_value + 1)],
+                                         dtype=np.int64)
+    return _binomial_tables[key]
+
+
+def combination_rank(combinations, max_value):
+    """
+    Rang lexicographique de combinaisons triées (système de numération combinatoire)
+
+    Le rang d'une combinaison c1 < ... < ck de 1..n est
+    C(n, k) - 1 - somme des C(n - ci, k - i + 1): c'est sa position dans
+    l'énumération de itertools.combinations(range(1, n + 1), k).
+
+    Args:
+        combinations (array): Combinaisons triées, forme (m, k) ou (k,)
+        max_value (int): Valeur maximale n
+
+    Returns:
+        array: Rangs int64 (ou un entier pour une seule combinaison)
+    """
+    values = np.asarray(combinations, dtype=np.int64)
+    single = values.ndim == 1
+    values = values.reshape(-1, values.shape[-1])
+    k = values.shape[1]
+
+    binomials = _binomials(max_value, k)
+    remaining = k - np.arange(k)
+    ranks = comb(max_value, k) - 1 - binomials[max_value - values, remaining].sum(axis=1)
+    return int(ranks[0]) if single else ranks
+
+
+def descending_ranks(scores):
+    """
+    Rang de chaque score dans l'ordre décroissant (1 + nombre de scores strictement supérieurs)
+
+    Args:
+        scores (array): Scores
+
+    Returns:
+        tuple: (rangs uint32, scores triés par ordre croissant)
+    """
+    sorted_scores = np.sort(scores)
+    ranks = len(scores) - np.searchsorted(sorted_scores, scores, side='right') + 1
+    return ranks.astype(np.uint32), sorted_scores
+
+
+class ScoreTable:
+    """
+    Scores et rangs de toutes les grilles pour une version de l'historique,
+    ouverts par np.memmap
+
+    La fitness du GA se décompose en une partie numéros, une partie étoiles
+    et une constante (voir training/exact_search.py). Le fichier contient,
+    pour chaque ensemble de numéros (indexé par son rang lexicographique) et
+    chaque paire d'étoiles, le score partiel et son rang, ainsi que les
+    scores des numéros triés: le rang d'une grille complète parmi les
+    C(50,5) x C(12,2) grilles s'en déduit par une recherche dichotomique
+    par paire d'étoiles.
+
+    Disposition du fichier (petit-boutiste):
+        - en-tête de 128 octets (voir HEADER_FORMAT)
+        - scores des ensembles de numéros: float64, ordre lexicographique
+        - scores des numéros triés par ordre croissant: float64
+        - rangs des ensembles de numéros: uint32
+        - scores puis rangs des paires d'étoiles: float64, uint32
+    """
+
+    def __init__(self, path, header, number_scores, sorted_number_scores, number_ranks,
+                 star_scores, star_ranks):
+        """
+        Initialisation (utiliser open() ou write())
+        """
+        self.path = path
+        (self.num_numbers, self.num_stars, self.numbers_to_draw, self.stars_to_draw,
+         self.history_size, self.offset, self.fingerprint) = header
+        # Vues ndarray sur les projections (sans le surcoût d'indexation de np.memmap)
+        self.number_scores = number_scores.view(np.ndarray)
+        self.sorted_number_scores = sorted_number_scores.view(np.ndarray)
+        self.number_ranks = number_ranks.view(np.ndarray)
+        self.star_scores = star_scores.view(np.ndarray)
+        self.star_ranks = star_ranks.view(np.ndarray)
+
+    @property
+    def n_combinations(self):
+        return len(self.number_scores) * len(self.star_scores)
+
+    @staticmethod
+    def _layout(n_number_sets, n_star_pairs):
+        """
+        Positions des sections dans le fichier
+        """
+        number_scores_offset = HEADER_SIZE
+        sorted_offset = number_scores_offset + 8 * n_number_sets
+        number_ranks_offset = sorted_offset + 8 * n_number_sets
+        star_scores_offset = -(-(number_ranks_offset + 4 * n_number_sets) // 8) * 8
+        star_ranks_offset = star_scores_offset + 8 * n_star_pairs
+        return number_scores_offset, sorted_offset, number_ranks_offset, star_scores_offset, star_ranks_offset
+
+    @classmethod
+    def write(cls, path, number_scores, star_scores, offset, history_size, fingerprint,
+              num_numbers=50, num_stars=12, numbers_to_draw=5, stars_to_draw=2):
+        """
+        Écriture d'une table des scores
+
+        Args:
+            path (str): Chemin du fichier
+            number_scores (array): Score de chaque ensemble de numéros (ordre lexicographique)
+            star_scores (array): Score de chaque paire d'étoiles (ordre lexicographique)
+            offset (float): Constante ajoutée à la somme des deux scores pour obtenir la fitness
+            history_size (int): Nombre de tirages de l'historique
+            fingerprint (bytes): Empreinte de l'historique (voir history_fingerprint)
+
+        Returns:
+            ScoreTable: Table ouverte après écriture
+        """
+        number_scores = np.ascontiguousarray(number_scores, dtype='<f8')
+        star_scores = np.ascontiguousarray(star_scores, dtype='<f8')
+        if len(number_scores) != comb(num_numbers, numbers_to_draw):
+            raise ValueError(f"{len(number_scores)} scores pour C({num_numbers},{numbers_to_draw}) ensembles")
+        if len(star_scores) != comb(num_stars, stars_to_draw):
+            raise ValueError(f"{len(star_scores)} scores pour C({num_stars},{stars_to_draw}) paires")
+
+        number_ranks, sorted_number_scores = descending_ranks(number_scores)
+        star_ranks, _ = descending_ranks(star_scores)
+        _, _, _, star_scores_offset, _ = cls._layout(len(number_scores), len(star_scores))
+
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                header = struct.pack(HEADER_FORMAT, MAGIC, FORMAT_VERSION, num_numbers, num_stars,
+                                     numbers_to_draw, stars_to_draw, len(number_scores), len(star_scores),
+                                     history_size, offset, fingerprint)
+                f.write(header.ljust(HEADER_SIZE, b'\0'))
+                f.write(number_scores.tobytes())
+                f.write(sorted_number_scores.astype('<f8').tobytes())
+                f.write(number_ranks.astype('<u4').tobytes())
+                f.seek(star_scores_offset)
+                f.write(star_scores.tobytes())
+                f.write(star_ranks.astype('<u4').tobytes())
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        logger.info(f"Table des scores enregistrée: {path} ({len(number_scores)} ensembles de numéros, "
+                    f"{len(star_scores)} paires d'étoiles, {history_size} tirages)")
+        return cls.open(path)
+
+    @classmethod
+    def open(cls, path):
+        """
+        Ouverture d'une table des scores en lecture seule
+
+        Args:
+            path (str): Chemin du fichier
+
+        Returns:
+            ScoreTable: Table projetée en mémoire
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"La table des scores {path} n'existe pas")
+
+        with open(path, 'rb') as f:
+            header = f.read(HEADER_SIZE)
+        (magic, version, num_numbers, num_stars, numbers_to_draw, stars_to_draw, n_number_sets,
+         n_star_pairs, history_size, offset, fingerprint) = struct.unpack_from(HEADER_FORMAT, header)
+        if magic != MAGIC:
+            raise ValueError(f"{path} n'est pas une table des scores EuroGenius")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Version de format non supportée: {version}")
+
+        offsets = cls._layout(n_number_sets, n_star_pairs)
+        arrays = [
+            np.memmap(path, dtype=dtype, mode='r', offset=section_offset, shape=(count,))
+            for section_offset, dtype, count in zip(
+                offsets, ['<f8', '<f8', '<u4', '<f8', '<u4'],
+                [n_number_sets, n_number_sets, n_number_sets, n_star_pairs, n_star_pairs]
+            )
+        ]
+        header = (num_numbers, num_stars, numbers_to_draw, stars_to_draw, history_size, offset, fingerprint)
+        return cls(path, header, *arrays)
+
+    def matches(self, fingerprint):
+        """
+        Vérifie que la table correspond à un historique donné
+        """
+        return self.fingerprint == fingerprint
+
+    def _validate(self, numbers, stars):
+        """
+        Numéros et étoiles triés d'une grille, après validation
+        """
+        numbers = sorted(int(n) for n in numbers)
+        stars = sorted(int(s) for s in stars)
+        if len(numbers) != self.numbers_to_draw or len(set(numbers)) != self.numbers_to_draw:
+            raise ValueError(f"Une grille doit contenir {self.numbers_to_draw} numéros distincts")
+        if len(stars) != self.stars_to_draw or len(set(stars)) != self.stars_to_draw:
+            raise ValueError(f"Une grille doit contenir {self.stars_to_draw} étoiles distinctes")
+        if not all(1 <= n <= self.num_numbers for n in numbers):
+            raise ValueError(f"Les numéros doivent être des entiers entre 1 et {self.num_numbers}")
+        if not all(1 <= s <= self.num_stars for s in stars):
+            raise ValueError(f"Les étoiles doivent être des entiers entre 1 et {self.num_stars}")
+        return numbers, stars
+
+    def lookup(self, numbers, stars):
+        """
+        Score, rang et percentile d'une grille
+
+        Le rang de la grille complète est 1 + le nombre de grilles de score
+        strictement supérieur: pour chaque paire d'étoiles, le nombre
+        d'ensembles de numéros dépassant le score restant est lu dans les
+        scores triés.
+
+        Args:
+            numbers (list): Numéros de la grille
+            stars (list): Étoiles de la grille
+
+        Returns:
+            dict: Fitness, rangs et percentiles (100 = meilleure grille)
+        """
+        numbers, stars = self._validate(numbers, stars)
+        number_index = combination_rank(numbers, self.num_numbers)
+        star_index = combination_rank(stars, self.num_stars)
+
+        number_score = float(self.number_scores[number_index])
+        star_score = float(self.star_scores[star_index])
+        score = number_score + star_score
+
+        # Ensembles de numéros dont le score dépasse strictement score - g pour chaque paire
+        star_scores = self.star_scores
+        sorted_scores = self.sorted_number_scores
+        n_number_sets = len(sorted_scores)
+
+        # Hors d'une marge de quelques ulps autour de score - g, la comparaison
+        # est sûre; dans la marge, f + g > score est testé tel quel (arrondis)
+        margin = 4 * np.spacing(max(abs(score), 1.0))
+        lows = np.searchsorted(sorted_scores, score - star_scores - margin, side='left')
+        highs = np.searchsorted(sorted_scores, score - star_scores + margin, side='right')
+        rank = 1 + int((n_number_sets - highs).sum())
+        for low, high, g in zip(lows.tolist(), highs.tolist(), star_scores.tolist()):
+            if high > low:
+                rank += int(np.count_nonzero(sorted_scores[low:high] + g > score))
+
+        n_star_pairs = len(star_scores)
+        return {
+            'numbers': numbers,
+            'stars': stars,
+            'fitness': score + self.offset,
+            'rank': rank,
+            'percentile': self._percentile(rank, self.n_combinations),
+            'number_rank': int(self.number_ranks[number_index]),
+            'number_percentile': self._percentile(int(self.number_ranks[number_index]), n_number_sets),
+            'star_rank': int(self.star_ranks[star_index]),
+            'star_percentile': self._percentile(int(self.star_ranks[star_index]), n_star_pairs),
+            'total': self.n_combinations
+        }
+
+    @staticmethod
+    def _percentile(rank, total):
+        """
+        Part des grilles classées derrière la grille (en %)
+        """
+        return round(100.0 * (total - rank) / total, 4)
+
+
+# Fonction pour vérifier le rang combinatoire et les rangs de la table
+def test_score_table(path=None, seed=0):
+    """
+    Comparaison avec itertools et avec un classement complet par force brute
+    (table réduite: 5 numéros parmi 20, 2 étoiles parmi 6)
+    """
+    import itertools
+    import tempfile
+
+    combinations = np.array(list(itertools.combinations(range(1, 21), 5)))
+    assert np.array_equal(combination_rank(combinations, 20), np.arange(len(combinations)))
+    assert combination_rank([46, 47, 48, 49, 50], 50) == comb(50, 5) - 1
+
+    rng = np.random.default_rng(seed)
+    star_pairs = np.array(list(itertools.combinations(range(1, 7), 2)))
+    # Scores arrondis pour avoir des ex aequo
+    number_scores = np.round(rng.random(len(combinations)), 3)
+    star_scores = np.round(rng.random(len(star_pairs)), 2)
+
+    path = path or os.path.join(tempfile.mkdtemp(), f"test{TABLE_EXTENSION}")
+    fingerprint = history_fingerprint([[1, 2, 3, 4, 5]], [[1, 2]])
+    table = ScoreTable.write(path, number_scores, star_scores, 0.5, 1, fingerprint,
+                             num_numbers=20, num_stars=6)
+    assert table.matches(fingerprint)
+
+    totals = (number_scores[:, None] + star_scores[None, :]).ravel()
+    for index in rng.choice(len(totals), size=50, replace=False).tolist():
+        n, s = divmod(index, len(star_pairs))
+        result = table.lookup(combinations[n][::-1].tolist(), star_pairs[s].tolist())
+        assert result['rank'] == int((totals > totals[index]).sum()) + 1
+        assert result['number_rank'] == int((number_scores > number_scores[n]).sum()) + 1
+        assert result['fitness'] == totals[index] + 0.5
+
+    logger.info(f"Table des scores vérifiée: {table.n_combinations} grilles")
+    return table
+
+
+if __name__ == "__main__":
+    test_score_table()
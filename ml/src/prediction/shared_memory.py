@@ -0,0 +1,346 @@
+import json
+import numpy as np
+import os
+import struct
+import sys
+import tempfile
+
+# Ajout du répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import logger
+from prediction.numpy_runtime import NumpyModel
+
+# Version du format du segment partagé
+SEGMENT_FORMAT_VERSION = 1
+
+# Emplacement par défaut du segment (mémoire partagée du système)
+DEFAULT_SEGMENT_PATH = os.path.join('/dev/shm', 'eurogenius_ml.seg')
+
+# Alignement des tableaux dans le segment (octets)
+ALIGNMENT = 64
+
+
+class SharedSegment:
+    """
+    Segment mémoire partagé en lecture seule entre les workers gunicorn
+
+    Le segment regroupe dans un seul fichier projeté en mémoire (par défaut
+    dans /dev/shm) les tirages historiques, l'état de l'index des tirages et
+    les poids des modèles NumPy. Il est écrit une fois par le processus
+    maître (`publish()`), puis chaque worker s'y attache (`attach()`) et
+    obtient des vues NumPy sans copie: les pages physiques sont communes à
+    tous les workers. Seuls les matrices de l'index et les poids sont
+    utilisés tels quels; les tirages sont recopiés dans le DataFrame
+    compact de chaque worker (voir attach_service_state).
+
+    Format: 8 octets (longueur de l'en-tête) + en-tête JSON + tableaux alignés.
+    """
+
+    def __init__(self, path, header, buffer):
+        """
+        Initialisation (utiliser publish() ou attach())
+        """
+        self.path = path
+        self.header = header
+        self._buffer = buffer
+
+    @classmethod
+    def publish(cls, path, arrays, metadata=None):
+        """
+        Écriture d'un segment contenant des tableaux nommés
+
+        Args:
+            path (str): Chemin du segment
+            arrays (dict): Tableaux NumPy à partager
+            metadata (dict, optional): Informations complémentaires (JSON)
+
+        Returns:
+            SharedSegment: Segment attaché après écriture
+        """
+        entries = {}
+        offset = 0
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            offset = -(-offset // ALIGNMENT) * ALIGNMENT
+            entries[name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+            offset += array.nbytes
+
+        header = {
+            'format_version': SEGMENT_FORMAT_VERSION,
+            'arrays': entries,
+            'metadata': metadata or {}
+        }
+        header_bytes = json.dumps(header).encode('utf-8')
+        data_start = -(-(8 + len(header_bytes)) // ALIGNMENT) * ALIGNMENT
+
+        # Écriture dans un fichier temporaire unique du même répertoire puis renommage atomique
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(struct.pack('<Q', len(header_bytes)))
+                f.write(header_bytes)
+                for name, array in arrays.items():
+                    f.seek(data_start + entries[name]['offset'])
+                    f.write(np.ascontiguousarray(array).tobytes())
+                f.truncate(data_start + offset)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        logger.info(f"Segment partagé publié: {path} ({(data_start + offset) / 1e6:.1f} Mo)")
+        return cls.attach(path)
+
+    @classmethod
+    def attach(cls, path):
+        """
+        Attachement à un segment existant en lecture seule
+
+        Args:
+            path (str): Chemin du segment
+
+        Returns:
+            SharedSegment: Segment attaché
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Le segment partagé {path} n'existe pas")
+
+        buffer = np.memmap(path, dtype=np.uint8, mode='r')
+        header_length = struct.unpack('<Q', buffer[:8].tobytes())[0]
+        header = json.loads(buffer[8:8 + header_length].tobytes().decode('utf-8'))
+        if header['format_version'] != SEGMENT_FORMAT_VERSION:
+            raise ValueError(f"Version de segment non supportée: {header['format_version']}")
+
+        header['data_start'] = -(-(8 + header_length) // ALIGNMENT) * ALIGNMENT
+        return cls(path, header, buffer)
+
+    @property
+    def metadata(self):
+        return self.header['metadata']
+
+    def names(self, prefix=''):
+        """
+        Noms des tableaux du segment commençant par `prefix`
+        """
+        return [name for name in self.header['arrays'] if name.startswith(prefix)]
+
+    def array(self, name):
+        """
+        Vue en lecture seule (sans copie) sur un tableau du segment
+
+        Args:
+            name (str): Nom du tableau
+
+        Returns:
+            array: Vue NumPy sur la mémoire partagée
+        """
+        entry = self.header['arrays'][name]
+        dtype = np.dtype(entry['dtype'])
+        shape = tuple(entry['shape'])
+        start = self.header['data_start'] + entry['offset']
+        count = int(np.prod(shape, dtype=np.int64))
+        view = np.frombuffer(self._buffer, dtype=dtype, count=count, offset=start).reshape(shape)
+        view.flags.writeable = False
+        return view
+
+    def arrays(self, prefix):
+        """
+        Tableaux d'un même groupe, sans leur préfixe
+
+        Args:
+            prefix (str): Préfixe du groupe (par exemple 'index/')
+
+        Returns:
+            dict: Vues NumPy indexées par nom court
+        """
+        return {name[len(prefix):]: self.array(name) for name in self.names(prefix)}
+
+
+def model_to_arrays(model, prefix):
+    """
+    Conversion d'un modèle NumPy en description de couches et tableaux nommés
+
+    Args:
+        model (NumpyModel): Modèle à partager
+        prefix (str): Préfixe des tableaux dans le segment
+
+    Returns:
+        tuple: (description des couches, tableaux)
+    """
+    specs = []
+    arrays = {}
+    for i, layer in enumerate(model.layers):
+        spec = {key: value for key, value in layer.items() if key != 'weights'}
+        spec['weights'] = list(layer['weights'])
+        for name, value in layer['weights'].items():
+            arrays[f"{prefix}layer{i}/{name}"] = value
+        specs.append(spec)
+    return specs, arrays
+
+
+def model_from_segment(segment, specs, prefix):
+    """
+    Reconstruction d'un modèle NumPy dont les poids sont des vues partagées
+
+    Args:
+        segment (SharedSegment): Segment attaché
+        specs (list): Description des couches
+        prefix (str): Préfixe des tableaux dans le segment
+
+    Returns:
+        NumpyModel: Modèle prêt pour l'inférence
+    """
+    layers = []
+    for i, spec in enumerate(specs):
+        weights = {name: segment.array(f"{prefix}layer{i}/{name}") for name in spec['weights']}
+        layers.append(dict(spec, weights=weights))
+    return NumpyModel(layers)
+
+
+def history_file_identity(path):
+    """
+    Identité d'un fichier de tirages: chemin absolu, inode, date de
+    modification et taille (un ajout ou un remplacement la change)
+
+    Args:
+        path (str): Chemin du fichier (ou None)
+
+    Returns:
+        list: [chemin, inode, date de modification (ns), taille], ou None sans fichier
+    """
+    try:
+        stat = os.stat(path) if path else None
+    except FileNotFoundError:
+        stat = None
+    if stat is None:
+        return None
+    return [os.path.abspath(path), stat.st_ino, stat.st_mtime_ns, stat.st_size]
+
+
+def publish_service_state(path, data, draw_index, models=None, source=None):
+    """
+    Publication de l'état du service ML (tirages, index, poids des modèles)
+
+    Args:
+        path (str): Chemin du segment
+        data (DataFrame): Tirages historiques (colonnes date, n1-n5, s1-s2)
+        draw_index (DrawIndex): Index des tirages
+        models (tuple, optional): (modèle numéros, modèle étoiles) NumPy
+        source (list, optional): Identité du fichier lu (history_file_identity)
+
+    Returns:
+        SharedSegment: Segment publié
+    """
+    import pandas as pd
+
+    dates = pd.to_datetime(data['date']).to_numpy().astype('datetime64[D]').astype(np.int32)
+    arrays = {
+        'draws/numbers': data[draw_index.number_columns].to_numpy().astype(np.uint8),
+        'draws/stars': data[draw_index.star_columns].to_numpy().astype(np.uint8),
+        'draws/days': dates
+    }
+    arrays.update({f"index/{name}": value for name, value in draw_index.state().items()})
+
+    metadata = {'index_version': draw_index.version, 'models': None, 'source': source}
+    if models is not None:
+        metadata['models'] = {}
+        for name, model in zip(['numbers', 'stars'], models):
+            specs, model_arrays = model_to_arrays(model, f"models/{name}/")
+            metadata['models'][name] = specs
+            arrays.update(model_arrays)
+
+    return SharedSegment.publish(path, arrays, metadata)
+
+
+def attach_service_state(path, source=None):
+    """
+    Attachement d'un worker à l'état publié du service ML
+
+    Le segment est publié une seule fois par le maître: un worker relancé
+    après une ingestion le trouverait en retard sur le fichier de tirages.
+    Ses tirages et son index ne sont donc utilisés que si l'identité du
+    fichier qu'il a enregistrée est celle du fichier courant; sinon le
+    worker recharge l'historique lui-même et ne garde que les modèles.
+
+    Args:
+        path (str): Chemin du segment
+        source (list, optional): Identité du fichier de tirages courant (history_file_identity)
+
+    Returns:
+        tuple: (DataFrame des tirages, DrawIndex, modèles NumPy ou None);
+            tirages et index valent None si le segment ne correspond pas au fichier
+    """
+    import pandas as pd
+    from preprocessing.draw_index import DrawIndex, NUMBER_COLUMNS, STAR_COLUMNS
+
+    segment = SharedSegment.attach(path)
+
+    models = None
+    if segment.metadata['models'] is not None:
+        models = tuple(
+            model_from_segment(segment, segment.metadata['models'][name], f"models/{name}/")
+            for name in ['numbers', 'stars']
+        )
+
+    if segment.metadata.get('source') != source:
+        logger.warning(f"Segment partagé {path} publié pour un autre état du fichier de tirages: "
+                       f"historique rechargé depuis le fichier")
+        return None, None, models
+
+    # Le DataFrame attendu par app.py est une copie locale, gardée compacte:
+    # 7 octets de tirage (uint8, comme DrawStore.to_dataframe) et 8 octets de
+    # date par tirage. Seuls l'index et les poids restent partagés.
+    numbers = segment.array('draws/numbers')
+    stars = segment.array('draws/stars')
+    data = pd.DataFrame(np.hstack([numbers, stars]), columns=NUMBER_COLUMNS + STAR_COLUMNS)
+    data.insert(0, 'date', pd.to_datetime(segment.array('draws/days').astype('datetime64[D]')))
+
+    # Les matrices d'occurrence restent des vues sur la mémoire partagée
+    draw_index = DrawIndex.from_state(segment.arrays('index/'), version=segment.metadata['index_version'])
+
+    logger.info(f"Attaché au segment partagé {path} ({len(data)} tirages)")
+    return data, draw_index, models
+
+
+def publish_from_files(path, data_path, models_dir):
+    """
+    Publication du segment à partir des fichiers du service (processus maître)
+
+    Les tirages sont lus depuis le fichier binaire (.draws) s'il existe, sinon
+    depuis le CSV historique, et les poids depuis les exports .npz. Sans
+    fichier de tirages, rien n'est publié et chaque worker charge ses propres
+    données.
+
+    Args:
+        path (str): Chemin du segment
+        data_path (str): Chemin du CSV des tirages historiques
+        models_dir (str): Répertoire des modèles exportés (.npz)
+
+    Returns:
+        SharedSegment: Segment publié, ou None
+    """
+    import pandas as pd
+    from preprocessing.draw_index import DrawIndex, NUMBER_COLUMNS, STAR_COLUMNS
+    from preprocessing.draw_store import DrawStore, STORE_EXTENSION
+
+    store_path = os.path.splitext(data_path)[0] + STORE_EXTENSION
+    # Identité relevée avant la lecture: une écriture concurrente rend le segment périmé
+    if os.path.exists(store_path):
+        source = history_file_identity(store_path)
+        data = DrawStore.open(store_path).to_dataframe(NUMBER_COLUMNS, STAR_COLUMNS)
+    elif os.path.exists(data_path):
+        source = history_file_identity(data_path)
+        data = pd.read_csv(data_path)
+    else:
+        logger.error(f"Le fichier de données n'existe pas: {data_path}, segment partagé non publié")
+        return None
+
+    draw_index = DrawIndex(data)
+
+    models = None
+    numbers_model_path = os.path.join(models_dir, 'lstm_numbers_model.npz')
+    stars_model_path = os.path.join(models_dir, 'lstm_stars_model.npz')
+    if os.path.exists(numbers_model_path) and os.path.exists(stars_model_path):
+        models = (NumpyModel.load(numbers_model_path), NumpyModel.load(stars_model_path))
+
+    return publish_service_state(path, data, draw_index, models, source)
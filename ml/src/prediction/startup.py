@@ -0,0 +1,118 @@
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# Ajout du répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import logger
+
+
+class StartupTracker:
+    """
+    Suivi des étapes de démarrage du service ML
+
+    Chaque étape (import de TensorFlow, chargement des modèles, des données,
+    préchauffage...) est chronométrée. Le service n'est déclaré prêt qu'une
+    fois toutes les étapes terminées, ce qui alimente les sondes
+    `/health/live` et `/health/ready`.
+    """
+
+    def __init__(self):
+        """
+        Initialisation du suivi
+        """
+        self.started_at = time.monotonic()
+        self.stages = {}
+        self.ready = False
+        self.error = None
+        self._ready_event = threading.Event()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Chronométrage d'une étape de démarrage
+
+        Args:
+            name (str): Nom de l'étape
+        """
+        with self._lock:
+            self.stages[name] = {'status': 'running', 'duration_ms': None}
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            with self._lock:
+                self.stages[name] = {
+                    'status': 'failed',
+                    'duration_ms': round((time.perf_counter() - start) * 1000, 1)
+                }
+                self.error = f"{name}: {e}"
+            raise
+        duration_ms = round((time.perf_counter() - start) * 1000, 1)
+        with self._lock:
+            self.stages[name] = {'status': 'done', 'duration_ms': duration_ms}
+        logger.info(f"Étape de démarrage '{name}' terminée en {duration_ms} ms")
+
+    def mark_ready(self):
+        """
+        Déclaration du service comme prêt à recevoir du trafic
+        """
+        self.ready = True
+        self._ready_event.set()
+        logger.info(f"Service ML prêt en {self.uptime_ms()} ms")
+
+    def wait_ready(self, timeout=None):
+        """
+        Attente de la fin du démarrage
+
+        Args:
+            timeout (float, optional): Délai maximal en secondes
+
+        Returns:
+            bool: True si le service est prêt
+        """
+        return self._ready_event.wait(timeout)
+
+    def uptime_ms(self):
+        """
+        Temps écoulé depuis le début du démarrage (ms)
+        """
+        return round((time.monotonic() - self.started_at) * 1000, 1)
+
+    def status(self):
+        """
+        État détaillé du démarrage
+
+        Returns:
+            dict: Étapes avec leurs durées, disponibilité et erreur éventuelle
+        """
+        with self._lock:
+            return {
+                'ready': self.ready,
+                'uptime_ms': self.uptime_ms(),
+                'stages': {name: dict(stage) for name, stage in self.stages.items()},
+                'error': self.error
+            }
+
+    def run_in_background(self, target):
+        """
+        Exécution du chargement dans un thread d'arrière-plan
+
+        Args:
+            target (callable): Fonction de chargement du service
+
+        Returns:
+            Thread: Thread de chargement démarré
+        """
+        def run():
+            try:
+                target()
+            except Exception as e:
+                logger.error(f"Échec du démarrage du service ML: {e}")
+
+        thread = threading.Thread(target=run, name='ml-startup', daemon=True)
+        thread.start()
+        return thread
@@ -0,0 +1,189 @@
+import numpy as np
+import os
+import sys
+
+# Ajout du répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from preprocessing.draw_index import DrawIndex
+
+# Stratégies de génération des grilles du service ML, sans dépendance à
+# Flask ni aux modèles: partagées par app.py et le backtesting (evaluation/)
+
+# Génération de combinaisons aléatoires
+def generate_random_combinations(n_combinations):
+    combinations = []
+    
+    for _ in range(n_combinations):
+        # Génération de 5 numéros uniques entre 1 et 50
+        numbers = np.sort(np.random.choice(range(1, 51), 5, replace=False))
+        # Génération de 2 étoiles uniques entre 1 et 12
+        stars = np.sort(np.random.choice(range(1, 13), 2, replace=False))
+        
+        combination = {
+            'numbers': numbers.tolist(),
+            'stars': stars.tolist(),
+            'confidence': round(np.random.uniform(0.1, 0.9), 2)
+        }
+        
+        combinations.append(combination)
+    
+    return combinations
+
+# Génération de combinaisons basées sur les statistiques
+def generate_statistical_combinations(data, n_combinations, index=None, window=None):
+    combinations = []
+    
+    # Calcul des fréquences à partir de l'index (sur les `window` derniers tirages si précisé)
+    if index is None:
+        index = DrawIndex(data)
+    number_counts = index.number_counts(window)
+    star_counts = index.star_counts(window)
+    
+    # Tri des numéros et étoiles par fréquence (tri stable, comme sorted(reverse=True))
+    sorted_numbers = (np.argsort(-number_counts, kind='stable') + 1).tolist()
+    sorted_stars = (np.argsort(-star_counts, kind='stable') + 1).tolist()
+    
+    for i in range(n_combinations):
+        # Sélection des numéros et étoiles les plus fréquents avec une légère variation
+        start_idx = i % 10
+        numbers = sorted(sorted_numbers[start_idx:start_idx+5])
+        stars = sorted(sorted_stars[i % 5:i % 5+2])
+        
+        combination = {
+            'numbers': numbers,
+            'stars': stars,
+            'confidence': round(0.7 - (i * 0.05), 2)  # Confiance décroissante
+        }
+        
+        combinations.append(combination)
+    
+    return combinations
+
+# Génération de combinaisons basées sur les numéros "chauds"
+def generate_hot_combinations(data, n_combinations, index=None):
+    # Utilisation des 20 derniers tirages pour déterminer les numéros "chauds"
+    return generate_statistical_combinations(data, n_combinations, index, window=20)
+
+# Génération de combinaisons basées sur les numéros "froids"
+def generate_cold_combinations(data, n_combinations, index=None):
+    combinations = []
+    
+    # Écarts (nombre de tirages depuis la dernière apparition) maintenus par l'index
+    if index is None:
+        index = DrawIndex(data)
+    number_gaps = index.number_gaps()
+    star_gaps = index.star_gaps()
+    
+    # Tri des numéros et étoiles par écart
+    sorted_numbers = (np.argsort(-number_gaps, kind='stable') + 1).tolist()
+    sorted_stars = (np.argsort(-star_gaps, kind='stable') + 1).tolist()
+    
+    for i in range(n_combinations):
+        # Sélection des numéros et étoiles avec les plus grands écarts avec une légère variation
+        start_idx = i % 10
+        numbers = sorted(sorted_numbers[start_idx:start_idx+5])
+        stars = sorted(sorted_stars[i % 5:i % 5+2])
+        
+        combination = {
+            'numbers': numbers,
+            'stars': stars,
+            'confidence': round(0.6 - (i * 0.05), 2)  # Confiance décroissante
+        }
+        
+        combinations.append(combination)
+    
+    return combinations
+
+# Génération de combinaisons rares basées sur les probabilités
+def generate_rare_combinations(numbers_probs, stars_probs, n_combinations):
+    combinations = []
+    
+    for _ in range(n_combinations):
+        # Sélection des numéros avec les probabilités les plus faibles
+        numbers_indices = np.argsort(numbers_probs)[:5]
+        numbers = sorted([int(i) + 1 for i in numbers_indices])
+        
+        # Sélection des étoiles avec les probabilités les plus faibles
+        stars_indices = np.argsort(stars_probs)[:2]
+        stars = sorted([int(i) + 1 for i in stars_indices])
+        
+        # Ajout d'une légère randomisation
+        if np.random.random() < 0.3:
+            random_idx = np.random.randint(0, 5)
+            new_number = np.random.randint(1, 51)
+            while new_number in numbers:
+                new_number = np.random.randint(1, 51)
+            numbers[random_idx] = new_number
+            numbers.sort()
+        
+        if np.random.random() < 0.3:
+            random_idx = np.random.randint(0, 2)
+            new_star = np.random.randint(1, 13)
+            while new_star in stars:
+                new_star = np.random.randint(1, 13)
+            stars[random_idx] = new_star
+            stars.sort()
+        
+        combination = {
+            'numbers': numbers,
+            'stars': stars,
+            'confidence': round(np.random.uniform(0.2, 0.5), 2)  # Confiance faible
+        }
+        
+        combinations.append(combination)
+    
+    return combinations
+
+# Génération de combinaisons équilibrées
+def generate_balanced_combinations(numbers_probs, stars_probs, data, n_combinations, index=None):
+    combinations = []
+    
+    # Mélange de différentes stratégies
+    if index is None:
+        index = DrawIndex(data)
+    statistical_combinations = generate_statistical_combinations(data, n_combinations // 3, index)
+    hot_combinations = generate_hot_combinations(data, n_combinations // 3, index)
+    
+    # Génération de combinaisons basées sur les probabilités du modèle
+    model_combinations = []
+    for _ in range(n_combinations - len(statistical_combinations) - len(hot_combinations)):
+        # Sélection des numéros avec les probabilités les plus élevées
+        numbers_indices = np.argsort(numbers_probs)[-10:]  # Top 10
+        selected_indices = np.random.choice(numbers_indices, 5, replace=False)
+        numbers = sorted([int(i) + 1 for i in selected_indices])
+        
+        # Sélection des étoiles avec les probabilités les plus élevées
+        stars_indices = np.argsort(stars_probs)[-5:]  # Top 5
+        selected_indices = np.random.choice(stars_indices, 2, replace=False)
+        stars = sorted([int(i) + 1 for i in selected_indices])
+        
+        combination = {
+            'numbers': numbers,
+            'stars': stars,
+            'confidence': round(np.random.uniform(0.6, 0.9), 2)  # Confiance élevée
+        }
+        
+        model_combinations.append(combination)
+    
+    # Combinaison des différentes stratégies
+    combinations = statistical_combinations + hot_combinations + model_combinations
+    
+    return combinations
+
+# Calcul des scores de confiance
+def calculate_confidence_scores(combinations, numbers_probs, stars_probs):
+    for combination in combinations:
+        numbers = combination['numbers']
+        stars = combination['stars']
+        
+        # Calcul du score basé sur les probabilités du modèle
+        number_score = sum(numbers_probs[n-1] for n in numbers) / 5
+        star_score = sum(stars_probs[s-1] for s in stars) / 2
+        
+        # Score combiné
+        combined_score = 0.7 * number_score + 0.3 * star_score
+        
+        # Ajustement du score de confiance existant
+        combination['confidence'] = round(float(combination['confidence'] + combined_score) / 2, 2)
+    
+    return combinations
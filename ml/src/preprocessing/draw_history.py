@@ -0,0 +1,180 @@
+import numpy as np
+import os
+import sys
+
+# Ajout du répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import logger
+from preprocessing.draw_index import NUMBER_COLUMNS, STAR_COLUMNS
+
+
+class DrawHistory:
+    """
+    Tirages historiques servis par l'API, dans des tableaux à capacité libre
+
+    Remplace le DataFrame complet que l'ingestion recopiait à chaque tirage:
+    `append()` écrit le tirage dans la capacité libre (temps constant amorti,
+    doublement de capacité comme DrawIndex) et `copy()` donne un nouvel
+    instantané qui partage les tableaux. Un instantané ne lit que ses
+    `len()` premières lignes: les ajouts de la copie lui restent invisibles,
+    mais seule la copie la plus récente doit recevoir des ajouts.
+
+    Les dates sont gardées telles que chargées (datetime64, ou chaînes pour
+    un CSV), et seules les dernières lignes sont converties en DataFrame
+    (`tail()`).
+    """
+
+    def __init__(self, dates, numbers, stars, n_draws=None):
+        """
+        Initialisation à partir de tableaux (éventuellement plus longs que l'historique)
+
+        Args:
+            dates (array): Dates des tirages (datetime64 ou objets)
+            numbers (array): Numéros, forme (capacité, 5)
+            stars (array): Étoiles, forme (capacité, 2)
+            n_draws (int, optional): Nombre de tirages valides (par défaut tous)
+        """
+        self._dates = dates
+        self._numbers = numbers
+        self._stars = stars
+        self._n_draws = len(numbers) if n_draws is None else n_draws
+
+    @classmethod
+    def from_dataframe(cls, data, number_columns=None, star_columns=None, date_column='date'):
+        """
+        Historique à partir d'un DataFrame de tirages
+
+        Args:
+            data (DataFrame): Tirages (colonnes date, n1-n5, s1-s2)
+
+        Returns:
+            DrawHistory: Historique (copie des colonnes utiles)
+        """
+        numbers = np.array(data[number_columns or NUMBER_COLUMNS].to_numpy())
+        stars = np.array(data[star_columns or STAR_COLUMNS].to_numpy())
+        if date_column in data.columns:
+            dates = np.array(data[date_column].to_numpy())
+        else:
+            dates = np.full(len(data), None, dtype=object)
+        return cls(dates, numbers, stars)
+
+    def __len__(self):
+        return self._n_draws
+
+    @property
+    def numbers(self):
+        """
+        Numéros des tirages (vue sur les tableaux)
+        """
+        return self._numbers[:self._n_draws]
+
+    @property
+    def stars(self):
+        """
+        Étoiles des tirages (vue sur les tableaux)
+        """
+        return self._stars[:self._n_draws]
+
+    @property
+    def dates(self):
+        """
+        Dates des tirages (vue sur les tableaux)
+        """
+        return self._dates[:self._n_draws]
+
+    def copy(self):
+        """
+        Nouvel instantané partageant les tableaux (rien n'est recopié)
+
+        Returns:
+            DrawHistory: Copie qui peut recevoir les ajouts suivants
+        """
+        return DrawHistory(self._dates, self._numbers, self._stars, self._n_draws)
+
+    def append(self, date, numbers, stars):
+        """
+        Ajout d'un tirage en temps constant (amorti)
+
+        Args:
+            date (Timestamp): Date du tirage (ou chaîne 'AAAA-MM-JJ', gardée telle quelle)
+            numbers (list): 5 numéros du tirage
+            stars (list): 2 étoiles du tirage
+        """
+        position = self._n_draws
+        if position == len(self._numbers):
+            self._dates, self._numbers, self._stars = (
+                self._grow(values) for values in (self._dates, self._numbers, self._stars)
+            )
+
+        if np.issubdtype(self._dates.dtype, np.datetime64):
+            self._dates[position] = np.datetime64(date, 'ns')
+        elif hasattr(date, 'strftime'):
+            self._dates[position] = date.strftime('%Y-%m-%d')
+        else:
+            self._dates[position] = date
+        self._numbers[position] = numbers
+        self._stars[position] = stars
+        self._n_draws = position + 1
+
+    @staticmethod
+    def _grow(values):
+        """
+        Doublement de la capacité d'un tableau
+        """
+        grown = np.empty((max(2 * len(values), 16),) + values.shape[1:], dtype=values.dtype)
+        grown[:len(values)] = values
+        return grown
+
+    def tail(self, n_draws):
+        """
+        Derniers tirages sous forme de DataFrame
+
+        Args:
+            n_draws (int): Nombre de tirages
+
+        Returns:
+            DataFrame: Colonnes date, n1-n5, s1-s2 (index 0..n-1)
+        """
+        import pandas as pd
+
+        start = max(self._n_draws - n_draws, 0)
+        data = pd.DataFrame(np.hstack([self._numbers[start:self._n_draws], self._stars[start:self._n_draws]]),
+                            columns=NUMBER_COLUMNS + STAR_COLUMNS)
+        data.insert(0, 'date', self._dates[start:self._n_draws])
+        return data
+
+
+# Fonction pour vérifier les ajouts et l'isolation des instantanés
+def test_draw_history(n_draws=100, n_appends=40, seed=42):
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    numbers = np.sort(rng.random((n_draws + n_appends, 50)).argsort(axis=1)[:, :5] + 1, axis=1)
+    stars = np.sort(rng.random((n_draws + n_appends, 12)).argsort(axis=1)[:, :2] + 1, axis=1)
+    dates = pd.date_range('2004-02-13', periods=n_draws + n_appends, freq='W-FRI')
+    data = pd.DataFrame(np.hstack([numbers, stars]), columns=NUMBER_COLUMNS + STAR_COLUMNS)
+    data.insert(0, 'date', dates)
+
+    # Dates chargées en datetime64 ou en chaînes (CSV)
+    for date_values in [dates, dates.strftime('%Y-%m-%d')]:
+        data['date'] = date_values
+        first = DrawHistory.from_dataframe(data.iloc[:n_draws])
+        snapshots = [first]
+        for i in range(n_draws, n_draws + n_appends):
+            history = snapshots[-1].copy()
+            history.append(dates[i], numbers[i].tolist(), stars[i].tolist())
+            snapshots.append(history)
+
+        # Chaque instantané ne voit que ses tirages, malgré le partage des tableaux
+        for size, history in enumerate(snapshots, start=n_draws):
+            assert len(history) == size and np.array_equal(history.numbers, numbers[:size])
+        pd.testing.assert_frame_equal(snapshots[-1].tail(10), data.tail(10).reset_index(drop=True),
+                                      check_dtype=False)
+        assert len(first.tail(1000)) == n_draws and np.shares_memory(snapshots[1].numbers, snapshots[-1].numbers)
+
+    logger.info(f"Historique vérifié: {n_appends} tirages ajoutés à {n_draws} tirages")
+    return snapshots[-1]
+
+
+if __name__ == "__main__":
+    test_draw_history()
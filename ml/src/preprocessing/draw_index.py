@@ -0,0 +1,451 @@
+import numpy as np
+import os
+import sys
+import threading
+
+# Ajout du répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import logger
+
+# Colonnes utilisées par l'API ML pour les tirages historiques
+NUMBER_COLUMNS = ['n1', 'n2', 'n3', 'n4', 'n5']
+STAR_COLUMNS = ['s1', 's2']
+
+
+class DrawIndex:
+    """
+    Index en mémoire des tirages historiques EuroMillions
+
+    L'index est construit une seule fois au chargement des données et conserve
+    des matrices d'occurrence compactes (tirages x 50 pour les numéros,
+    tirages x 12 pour les étoiles) ainsi que les comptes cumulés. Les
+    fréquences et les numéros "chauds"/"froids" sont ensuite obtenus par
+    quelques réductions vectorisées au lieu de masques pandas par valeur.
+
+    Les nouveaux tirages sont ajoutés avec `append()`, qui met à jour les
+    comptes, les dernières positions d'apparition et les comptes de paires
+    en temps constant, sans jamais reconstruire l'index. `copy()` donne un
+    index indépendant (pour un nouvel instantané) sans recopier les matrices.
+    """
+
+    def __init__(self, data, number_columns=None, star_columns=None):
+        """
+        Construction de l'index
+
+        Args:
+            data (DataFrame): DataFrame contenant les tirages historiques
+            number_columns (list, optional): Colonnes des numéros. Par défaut n1-n5.
+            star_columns (list, optional): Colonnes des étoiles. Par défaut s1-s2.
+        """
+        self.number_columns = number_columns or NUMBER_COLUMNS
+        self.star_columns = star_columns or STAR_COLUMNS
+
+        # Paramètres spécifiques à EuroMillions
+        self.num_numbers = 50  # Numéros de 1 à 50
+        self.num_stars = 12    # Étoiles de 1 à 12
+
+        # Verrou protégeant les ajouts concurrents aux lectures
+        self._lock = threading.RLock()
+
+        numbers = data[self.number_columns].to_numpy()
+        stars = data[self.star_columns].to_numpy()
+        self._n_draws = len(numbers)
+
+        # Les matrices sont surdimensionnées pour des ajouts en O(1) amorti
+        self._number_matrix = self._build_matrix(numbers, self.num_numbers)
+        self._star_matrix = self._build_matrix(stars, self.num_stars)
+        number_matrix = self.number_matrix
+        star_matrix = self.star_matrix
+
+        # Comptes cumulés sur l'ensemble de l'historique
+        self.number_totals = number_matrix.sum(axis=0, dtype=np.int64)
+        self.star_totals = star_matrix.sum(axis=0, dtype=np.int64)
+
+        # Dernière position d'apparition (-1 si jamais apparu)
+        self.number_last_seen = self._last_seen(number_matrix)
+        self.star_last_seen = self._last_seen(star_matrix)
+
+        # Nombre de tirages contenant chaque paire de numéros (matrice symétrique)
+        self.pair_counts = self._pair_counts(number_matrix)
+
+        # Version de l'historique, incrémentée à chaque ajout de tirage
+        self.version = 0
+
+        logger.info(f"Index des tirages construit: {self.n_draws} tirages")
+
+    # Tableaux constituant l'état de l'index (voir state() et from_state())
+    STATE_ARRAYS = [
+        'number_matrix', 'star_matrix', 'number_totals', 'star_totals',
+        'number_last_seen', 'star_last_seen', 'pair_counts'
+    ]
+
+    def state(self):
+        """
+        État de l'index sous forme de tableaux, pour le partage entre processus
+
+        Returns:
+            dict: Tableaux de l'index (matrices limitées aux tirages indexés)
+        """
+        with self._lock:
+            return {name: getattr(self, name) for name in self.STATE_ARRAYS}
+
+    @classmethod
+    def from_state(cls, state, version=0, number_columns=None, star_columns=None, n_draws=None):
+        """
+        Reconstruction d'un index à partir de son état, sans recalcul
+
+        Les matrices d'occurrence sont utilisées telles quelles (par exemple
+        des vues en lecture seule sur un segment de mémoire partagée): le
+        premier ajout de tirage écrit dans leur capacité libre, ou en fait une
+        copie privée agrandie si elles sont pleines.
+
+        Args:
+            state (dict): Tableaux produits par state()
+            version (int): Version de l'historique
+            n_draws (int, optional): Tirages indexés, si les matrices ont une
+                capacité supérieure. Par défaut leur nombre de lignes.
+
+        Returns:
+            DrawIndex: Index prêt à l'emploi
+        """
+        index = cls.__new__(cls)
+        index.number_columns = number_columns or NUMBER_COLUMNS
+        index.star_columns = star_columns or STAR_COLUMNS
+        index.num_numbers = 50
+        index.num_stars = 12
+        index._lock = threading.RLock()
+        index._number_matrix = state['number_matrix']
+        index._star_matrix = state['star_matrix']
+        index._n_draws = len(state['number_matrix']) if n_draws is None else n_draws
+
+        # Les petits tableaux mis à jour à chaque ajout sont copiés
+        for name in ['number_totals', 'star_totals', 'number_last_seen', 'star_last_seen', 'pair_counts']:
+            setattr(index, name, np.array(state[name], dtype=np.int64))
+
+        index.version = version
+        return index
+
+    def copy(self):
+        """
+        Copie de l'index partageant la capacité des matrices d'occurrence
+
+        Seuls les comptes (quelques Ko) sont copiés. Les tirages ajoutés à la
+        copie sont écrits après ceux de l'original, qui ne les voit pas:
+        l'original reste valide mais ne doit plus recevoir d'ajouts.
+
+        Returns:
+            DrawIndex: Copie indépendante pour les lectures
+        """
+        with self._lock:
+            state = self.state()
+            state['number_matrix'] = self._number_matrix
+            state['star_matrix'] = self._star_matrix
+            return DrawIndex.from_state(state, self.version, self.number_columns, self.star_columns,
+                                        n_draws=self._n_draws)
+
+    @staticmethod
+    def _pair_counts(matrix, block_size=65536):
+        """
+        Nombre de tirages contenant chaque paire de valeurs, en entiers
+
+        Les valeurs de chaque tirage sont alignées à gauche (une valeur
+        fictive complète les tirages plus courts), puis les identifiants de
+        paires sont comptés par np.bincount, bloc par bloc.
+
+        Args:
+            matrix (array): Matrice d'occurrence (tirages x valeurs)
+            block_size (int): Nombre de tirages traités par bloc
+
+        Returns:
+            array: Comptes (valeurs x valeurs), diagonale = comptes par valeur
+        """
+        num_values = matrix.shape[1]
+        size = num_values + 1
+        pairs = np.zeros(size * size, dtype=np.int64)
+        for start in range(0, len(matrix), block_size):
+            rows, columns = np.nonzero(matrix[start:start + block_size])
+            if len(rows) == 0:
+                continue
+            counts = np.bincount(rows)
+            first = np.cumsum(counts) - counts
+            values = np.full((len(counts), counts.max()), num_values, dtype=np.intp)
+            values[rows, np.arange(len(rows)) - first[rows]] = columns
+            pairs += np.bincount((values[:, :, None] * size + values[:, None, :]).ravel(),
+                                 minlength=size * size)
+        return pairs.reshape(size, size)[:num_values, :num_values].copy()
+
+    @staticmethod
+    def _last_seen(matrix):
+        """
+        Dernière position d'apparition de chaque valeur
+
+        Args:
+            matrix (array): Matrice d'occurrence (tirages x valeurs)
+
+        Returns:
+            array: Position du dernier tirage contenant la valeur, -1 si absente
+        """
+        if len(matrix) == 0:
+            return np.full(matrix.shape[1], -1, dtype=np.int64)
+        last = len(matrix) - 1 - matrix[::-1].argmax(axis=0)
+        return np.where(matrix.any(axis=0), last, -1).astype(np.int64)
+
+    @staticmethod
+    def _build_matrix(values, num_values):
+        """
+        Construction d'une matrice d'occurrence booléenne
+
+        Args:
+            values (array): Valeurs tirées, une ligne par tirage
+            num_values (int): Valeur maximale possible
+
+        Returns:
+            array: Matrice (capacité x num_values), True si la valeur est sortie
+        """
+        n_draws = len(values)
+        matrix = np.zeros((max(2 * n_draws, 16), num_values), dtype=bool)
+        if n_draws == 0:
+            return matrix
+
+        values = values.astype(np.int64, copy=False)
+        rows = np.broadcast_to(np.arange(n_draws)[:, None], values.shape)
+
+        # Les valeurs hors plage sont ignorées, comme avec les masques pandas
+        valid = (values >= 1) & (values <= num_values)
+        matrix[rows[valid], values[valid] - 1] = True
+        return matrix
+
+    @property
+    def n_draws(self):
+        """
+        Nombre de tirages indexés
+        """
+        return self._n_draws
+
+    @property
+    def number_matrix(self):
+        """
+        Matrice d'occurrence des numéros (tirages x 50)
+        """
+        return self._number_matrix[:self._n_draws]
+
+    @property
+    def star_matrix(self):
+        """
+        Matrice d'occurrence des étoiles (tirages x 12)
+        """
+        return self._star_matrix[:self._n_draws]
+
+    def append(self, numbers, stars):
+        """
+        Ajout d'un nouveau tirage à l'index en temps constant (amorti)
+
+        Args:
+            numbers (list): 5 numéros du tirage (1-50)
+            stars (list): 2 étoiles du tirage (1-12)
+
+        Returns:
+            int: Nouvelle version de l'historique
+        """
+        number_values = np.unique(np.asarray(numbers, dtype=np.int64))
+        star_values = np.unique(np.asarray(stars, dtype=np.int64))
+        if number_values.min() < 1 or number_values.max() > self.num_numbers:
+            raise ValueError("Les numéros doivent être compris entre 1 et 50")
+        if star_values.min() < 1 or star_values.max() > self.num_stars:
+            raise ValueError("Les étoiles doivent être comprises entre 1 et 12")
+
+        with self._lock:
+            position = self._n_draws
+
+            # Agrandissement des matrices par doublement de capacité
+            if position == len(self._number_matrix):
+                self._number_matrix = self._grow(self._number_matrix)
+                self._star_matrix = self._grow(self._star_matrix)
+
+            self._number_matrix[position, number_values - 1] = True
+            self._star_matrix[position, star_values - 1] = True
+
+            self.number_totals[number_values - 1] += 1
+            self.star_totals[star_values - 1] += 1
+            self.number_last_seen[number_values - 1] = position
+            self.star_last_seen[star_values - 1] = position
+            self.pair_counts[np.ix_(number_values - 1, number_values - 1)] += 1
+
+            self._n_draws = position + 1
+            self.version += 1
+            return self.version
+
+    @staticmethod
+    def _grow(matrix):
+        """
+        Doublement de la capacité d'une matrice d'occurrence
+        """
+        grown = np.zeros((max(2 * len(matrix), 16), matrix.shape[1]), dtype=matrix.dtype)
+        grown[:len(matrix)] = matrix
+        return grown
+
+    def number_counts(self, window=None):
+        """
+        Nombre de tirages contenant chaque numéro
+
+        Args:
+            window (int, optional): Limite aux `window` derniers tirages. Par défaut None.
+
+        Returns:
+            array: Comptes pour les numéros 1 à 50 (indice 0 = numéro 1)
+        """
+        with self._lock:
+            if window is None:
+                return self.number_totals.copy()
+            if window <= 0:
+                return np.zeros_like(self.number_totals)
+            return self.number_matrix[-window:].sum(axis=0, dtype=np.int64)
+
+    def star_counts(self, window=None):
+        """
+        Nombre de tirages contenant chaque étoile
+
+        Args:
+            window (int, optional): Limite aux `window` derniers tirages. Par défaut None.
+
+        Returns:
+            array: Comptes pour les étoiles 1 à 12 (indice 0 = étoile 1)
+        """
+        with self._lock:
+            if window is None:
+                return self.star_totals.copy()
+            if window <= 0:
+                return np.zeros_like(self.star_totals)
+            return self.star_matrix[-window:].sum(axis=0, dtype=np.int64)
+
+    def frequencies(self):
+        """
+        Fréquences d'apparition des numéros et des étoiles
+
+        Returns:
+            tuple: (number_frequencies, star_frequencies) au format de l'API
+        """
+        with self._lock:
+            n_draws = self.n_draws
+            number_totals = self.number_totals.copy()
+            star_totals = self.star_totals.copy()
+
+        def to_dict(counts):
+            # Arrondi numpy, identique à round() appliqué à un np.float64
+            frequencies = np.round(counts / n_draws, 4) if n_draws else np.zeros(len(counts))
+            return {
+                i + 1: {
+                    'count': int(count),
+                    'frequency': float(frequency)
+                }
+                for i, (count, frequency) in enumerate(zip(counts, frequencies))
+            }
+
+        return to_dict(number_totals), to_dict(star_totals)
+
+    def hot_cold(self, window=20, hot_threshold=3):
+        """
+        Numéros et étoiles "chauds" et "froids" sur les derniers tirages
+
+        Args:
+            window (int): Nombre de tirages récents considérés
+            hot_threshold (int): Nombre minimal d'apparitions pour être "chaud"
+
+        Returns:
+            dict: hot_numbers, cold_numbers, hot_stars, cold_stars
+        """
+        with self._lock:
+            recent_numbers = self.number_counts(window)
+            recent_stars = self.star_counts(window)
+
+        return {
+            'hot_numbers': (np.flatnonzero(recent_numbers >= hot_threshold) + 1).tolist(),
+            'cold_numbers': (np.flatnonzero(recent_numbers == 0) + 1).tolist(),
+            'hot_stars': (np.flatnonzero(recent_stars >= hot_threshold) + 1).tolist(),
+            'cold_stars': (np.flatnonzero(recent_stars == 0) + 1).tolist()
+        }
+
+    def number_gaps(self):
+        """
+        Écart de chaque numéro (nombre de tirages depuis sa dernière apparition)
+
+        Returns:
+            array: Écarts pour les numéros 1 à 50, égal au nombre de tirages si jamais apparu
+        """
+        with self._lock:
+            return self._gaps(self.number_last_seen)
+
+    def star_gaps(self):
+        """
+        Écart de chaque étoile (nombre de tirages depuis sa dernière apparition)
+
+        Returns:
+            array: Écarts pour les étoiles 1 à 12, égal au nombre de tirages si jamais apparue
+        """
+        with self._lock:
+            return self._gaps(self.star_last_seen)
+
+    def _gaps(self, last_seen):
+        """
+        Conversion des dernières positions d'apparition en écarts
+        """
+        return np.where(last_seen >= 0, self._n_draws - last_seen, self._n_draws)
+
+
+# Fonction pour tester l'index avec des données synthétiques
+def test_draw_index(n_draws=500, n_appends=300, seed=42):
+    """
+    Test de propriété: un index alimenté tirage par tirage doit rester
+    strictement identique à un index reconstruit à partir de zéro
+    """
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+
+    def random_draws(count):
+        numbers = np.sort(rng.random((count, 50)).argsort(axis=1)[:, :5] + 1, axis=1)
+        stars = np.sort(rng.random((count, 12)).argsort(axis=1)[:, :2] + 1, axis=1)
+        return pd.DataFrame(np.hstack([numbers, stars]), columns=NUMBER_COLUMNS + STAR_COLUMNS)
+
+    # Historique de départ de taille aléatoire (éventuellement vide)
+    data = random_draws(int(rng.integers(0, n_draws)))
+    new_draws = random_draws(n_appends)
+
+    index = DrawIndex(data)
+    for i in range(n_appends):
+        draw = new_draws.iloc[i]
+        index.append(draw[NUMBER_COLUMNS].tolist(), draw[STAR_COLUMNS].tolist())
+
+        # Comparaison à intervalles aléatoires avec une reconstruction complète
+        if rng.random() < 0.1 or i == n_appends - 1:
+            rebuilt = DrawIndex(pd.concat([data, new_draws.iloc[:i + 1]], ignore_index=True))
+            assert index.n_draws == rebuilt.n_draws
+            assert np.array_equal(index.number_matrix, rebuilt.number_matrix)
+            assert np.array_equal(index.star_matrix, rebuilt.star_matrix)
+            assert np.array_equal(index.number_last_seen, rebuilt.number_last_seen)
+            assert np.array_equal(index.star_last_seen, rebuilt.star_last_seen)
+            assert np.array_equal(index.pair_counts, rebuilt.pair_counts)
+            occurrences = rebuilt.number_matrix.astype(np.int64)
+            assert np.array_equal(rebuilt.pair_counts, occurrences.T @ occurrences)
+            assert np.array_equal(index.number_gaps(), rebuilt.number_gaps())
+            assert np.array_equal(index.star_gaps(), rebuilt.star_gaps())
+            assert index.frequencies() == rebuilt.frequencies()
+            assert index.hot_cold(window=20) == rebuilt.hot_cold(window=20)
+
+    # Copie pour un nouvel instantané: capacité partagée, ajouts invisibles pour l'original
+    before = (index.frequencies(), index.number_gaps().tolist(), index.pair_counts.copy())
+    copy = index.copy()
+    copy.append([1, 2, 3, 4, 5], [1, 2])
+    assert copy.n_draws == index.n_draws + 1 and copy.version == index.version + 1
+    assert before[0] == index.frequencies() and before[1] == index.number_gaps().tolist()
+    assert np.array_equal(before[2], index.pair_counts)
+    if index.n_draws < len(index._number_matrix):
+        assert np.shares_memory(copy._number_matrix, index._number_matrix)
+
+    print(f"Index incrémental cohérent avec la reconstruction après {n_appends} ajouts")
+    return index
+
+if __name__ == "__main__":
+    # Test de l'index
+    for seed in range(5):
+        test_draw_index(seed=seed)
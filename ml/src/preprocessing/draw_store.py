@@ -0,0 +1,342 @@
+import hashlib
+import numpy as np
+import os
+import struct
+import sys
+import tempfile
+
+# Ajout du répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import logger
+
+# Signature et version du format binaire des tirages (la version 1, sans
+# capacité réservée, reste lisible)
+MAGIC = b'EGDS'
+FORMAT_VERSION = 2
+SUPPORTED_VERSIONS = (1, 2)
+
+# En-tête: signature, version, nb colonnes numéros, nb colonnes étoiles,
+# présence des dates, nombre de tirages, capacité (64 octets au total)
+HEADER_FORMAT = '<4sHBBBxxxQQ'
+HEADER_SIZE = 64
+N_DRAWS_OFFSET = struct.calcsize('<4sHBBBxxx')
+
+# Extension des fichiers de tirages binaires
+STORE_EXTENSION = '.draws'
+
+
+def history_fingerprint(numbers, stars):
+    """
+    Empreinte d'un historique de tirages, indépendante de l'ordre des
+    valeurs dans un tirage
+
+    Args:
+        numbers (array): Numéros (tirages x 5)
+        stars (array): Étoiles (tirages x 2)
+
+    Returns:
+        bytes: Empreinte SHA-256
+    """
+    draws = np.hstack([np.sort(np.asarray(numbers), axis=1), np.sort(np.asarray(stars), axis=1)])
+    return hashlib.sha256(np.ascontiguousarray(draws, dtype=np.uint8).tobytes()).digest()
+
+
+class DrawStore:
+    """
+    Stockage binaire compact des tirages historiques, ouvert par np.memmap
+
+    Disposition du fichier (petit-boutiste):
+        - en-tête de 64 octets (voir HEADER_FORMAT)
+        - numéros: uint8, capacité x 5 (ligne par tirage)
+        - étoiles: uint8, capacité x 2
+        - dates (optionnelles): int32, jours depuis le 1970-01-01
+
+    L'ouverture ne lit que l'en-tête: les colonnes sont des vues projetées
+    en mémoire, chargées à la demande par le système. Chaque section est
+    dimensionnée pour `capacité` tirages, ce qui permet d'ajouter des tirages
+    sur place (voir append()).
+    """
+
+    def __init__(self, path, numbers, stars, days=None):
+        """
+        Initialisation (utiliser open() ou write())
+        """
+        self.path = path
+        self.numbers = numbers
+        self.stars = stars
+        self.days = days
+
+    def __len__(self):
+        return len(self.numbers)
+
+    @staticmethod
+    def _layout(n_draws, n_number_columns, n_star_columns):
+        """
+        Positions des sections dans le fichier
+        """
+        numbers_offset = HEADER_SIZE
+        stars_offset = numbers_offset + n_draws * n_number_columns
+        days_offset = -(-(stars_offset + n_draws * n_star_columns) // 4) * 4
+        return numbers_offset, stars_offset, days_offset
+
+    @staticmethod
+    def _read_header(f, path):
+        """
+        Lecture et vérification de l'en-tête
+
+        Returns:
+            tuple: (colonnes de numéros, colonnes d'étoiles, dates présentes, tirages, capacité)
+        """
+        f.seek(0)
+        magic, version, n_number_columns, n_star_columns, has_days, n_draws, capacity = \
+            struct.unpack_from(HEADER_FORMAT, f.read(HEADER_SIZE))
+        if magic != MAGIC:
+            raise ValueError(f"{path} n'est pas un fichier de tirages EuroGenius")
+        if version not in SUPPORTED_VERSIONS:
+            raise ValueError(f"Version de format non supportée: {version}")
+        # Version 1: sections pleines, octets de capacité nuls
+        return n_number_columns, n_star_columns, bool(has_days), n_draws, max(capacity, n_draws)
+
+    @classmethod
+    def write(cls, path, numbers, stars, days=None, capacity=None):
+        """
+        Écriture d'un fichier de tirages
+
+        Args:
+            path (str): Chemin du fichier
+            numbers (array): Numéros (tirages x 5)
+            stars (array): Étoiles (tirages x 2)
+            days (array, optional): Jours depuis le 1970-01-01
+            capacity (int, optional): Tirages réservés pour des ajouts sur place.
+                Par défaut le nombre de tirages (fichier compact).
+
+        Returns:
+            DrawStore: Fichier ouvert après écriture
+        """
+        numbers = np.ascontiguousarray(numbers, dtype=np.uint8)
+        stars = np.ascontiguousarray(stars, dtype=np.uint8)
+        n_draws = len(numbers)
+        capacity = max(capacity or 0, n_draws)
+        _, stars_offset, days_offset = cls._layout(capacity, numbers.shape[1], stars.shape[1])
+        end = days_offset + 4 * capacity if days is not None else stars_offset + capacity * stars.shape[1]
+
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                header = struct.pack(HEADER_FORMAT, MAGIC, FORMAT_VERSION, numbers.shape[1],
+                                     stars.shape[1], days is not None, n_draws, capacity)
+                f.write(header.ljust(HEADER_SIZE, b'\0'))
+                f.write(numbers.tobytes())
+                f.seek(stars_offset)
+                f.write(stars.tobytes())
+                if days is not None:
+                    f.seek(days_offset)
+                    f.write(np.ascontiguousarray(days, dtype='<i4').tobytes())
+                # Capacité réservée (fichier creux)
+                f.truncate(end)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        logger.info(f"Tirages enregistrés au format binaire: {path} ({n_draws} tirages)")
+        return cls.open(path)
+
+    @classmethod
+    def open(cls, path):
+        """
+        Ouverture d'un fichier de tirages en lecture seule
+
+        Args:
+            path (str): Chemin du fichier
+
+        Returns:
+            DrawStore: Tirages projetés en mémoire
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Le fichier de tirages {path} n'existe pas")
+
+        with open(path, 'rb') as f:
+            n_number_columns, n_star_columns, has_days, n_draws, capacity = cls._read_header(f, path)
+
+        numbers_offset, stars_offset, days_offset = cls._layout(capacity, n_number_columns, n_star_columns)
+        if n_draws == 0:
+            return cls(path, np.zeros((0, n_number_columns), np.uint8),
+                       np.zeros((0, n_star_columns), np.uint8),
+                       np.zeros(0, np.int32) if has_days else None)
+
+        numbers = np.memmap(path, dtype=np.uint8, mode='r', offset=numbers_offset,
+                            shape=(n_draws, n_number_columns))
+        stars = np.memmap(path, dtype=np.uint8, mode='r', offset=stars_offset,
+                          shape=(n_draws, n_star_columns))
+        days = np.memmap(path, dtype='<i4', mode='r', offset=days_offset, shape=(n_draws,)) if has_days else None
+        return cls(path, numbers, stars, days)
+
+    @classmethod
+    def append(cls, path, numbers, stars, days=None):
+        """
+        Ajout de tirages à la fin d'un fichier existant
+
+        Les tirages sont écrits dans la capacité réservée, puis le nombre de
+        tirages de l'en-tête est mis à jour: les tirages existants ne sont
+        jamais réécrits, et un lecteur ne voit les nouveaux qu'une fois
+        complets. Un fichier plein est réécrit avec une capacité doublée
+        (coût amorti constant). Les écritures concurrentes doivent être
+        sérialisées par l'appelant (verrou de fichier).
+
+        Args:
+            path (str): Chemin du fichier
+            numbers (array): Numéros (tirages x 5)
+            stars (array): Étoiles (tirages x 2)
+            days (array, optional): Jours depuis le 1970-01-01 (ignorés si le fichier n'a pas de dates)
+
+        Returns:
+            int: Nombre de tirages du fichier après l'ajout
+        """
+        with open(path, 'r+b') as f:
+            n_number_columns, n_star_columns, has_days, n_draws, capacity = cls._read_header(f, path)
+            numbers = np.ascontiguousarray(numbers, dtype=np.uint8).reshape(-1, n_number_columns)
+            stars = np.ascontiguousarray(stars, dtype=np.uint8).reshape(-1, n_star_columns)
+            if has_days and days is None:
+                raise ValueError(f"{path} contient des dates: les tirages ajoutés doivent en avoir")
+            count = len(numbers)
+
+            if n_draws + count <= capacity:
+                numbers_offset, stars_offset, days_offset = cls._layout(capacity, n_number_columns, n_star_columns)
+                f.seek(numbers_offset + n_draws * n_number_columns)
+                f.write(numbers.tobytes())
+                f.seek(stars_offset + n_draws * n_star_columns)
+                f.write(stars.tobytes())
+                if has_days:
+                    f.seek(days_offset + 4 * n_draws)
+                    f.write(np.asarray(days, dtype='<i4').reshape(-1).tobytes())
+                # En-tête mis à jour en dernier: les lecteurs ne voient que des tirages complets
+                f.flush()
+                f.seek(N_DRAWS_OFFSET)
+                f.write(struct.pack('<Q', n_draws + count))
+                return n_draws + count
+
+        store = cls.open(path)
+        all_days = np.concatenate([store.days, np.asarray(days).reshape(-1)]) if has_days else None
+        cls.write(path, np.vstack([store.numbers, numbers]), np.vstack([store.stars, stars]), all_days,
+                  capacity=max(2 * (n_draws + count), 16))
+        return n_draws + count
+
+    @classmethod
+    def from_csv(cls, csv_path, path, number_columns, star_columns, date_column='date'):
+        """
+        Conversion d'un historique CSV au format binaire
+
+        Args:
+            csv_path (str): Chemin du CSV source
+            path (str): Chemin du fichier binaire à écrire
+            number_columns (list): Colonnes des numéros
+            star_columns (list): Colonnes des étoiles
+            date_column (str): Colonne des dates (ignorée si absente)
+
+        Returns:
+            DrawStore: Fichier binaire ouvert
+        """
+        import pandas as pd
+
+        data = pd.read_csv(csv_path)
+        return cls.from_dataframe(data, path, number_columns, star_columns, date_column)
+
+    @classmethod
+    def from_dataframe(cls, data, path, number_columns, star_columns, date_column='date', capacity=None):
+        """
+        Enregistrement d'un DataFrame de tirages au format binaire
+        """
+        import pandas as pd
+
+        days = None
+        if date_column in data.columns:
+            days = pd.to_datetime(data[date_column]).to_numpy().astype('datetime64[D]').astype(np.int32)
+        return cls.write(path, data[number_columns].to_numpy(), data[star_columns].to_numpy(), days, capacity)
+
+    def dates(self):
+        """
+        Dates des tirages
+
+        Returns:
+            array: datetime64[D], ou None si le fichier n'a pas de dates
+        """
+        return None if self.days is None else np.asarray(self.days).astype('datetime64[D]')
+
+    def draws(self):
+        """
+        Tirages complets (numéros puis étoiles) dans un seul tableau uint8
+
+        Returns:
+            array: Tirages x 7
+        """
+        return np.hstack([self.numbers, self.stars])
+
+    def to_dataframe(self, number_columns, star_columns, date_column='date'):
+        """
+        Conversion en DataFrame pour les modèles existants
+
+        Args:
+            number_columns (list): Noms des colonnes des numéros
+            star_columns (list): Noms des colonnes des étoiles
+            date_column (str): Nom de la colonne des dates
+
+        Returns:
+            DataFrame: Tirages (colonnes entières compactes)
+        """
+        import pandas as pd
+
+        data = pd.DataFrame(self.draws(), columns=list(number_columns) + list(star_columns))
+        if self.days is not None:
+            data.insert(0, date_column, pd.to_datetime(self.dates()))
+        return data
+
+
+# Vérification des ajouts sur place et de la relecture des fichiers de version 1
+def test_draw_store(n_draws=100, seed=42):
+    rng = np.random.default_rng(seed)
+    numbers = np.sort(rng.random((n_draws, 50)).argsort(axis=1)[:, :5] + 1, axis=1)
+    stars = np.sort(rng.random((n_draws, 12)).argsort(axis=1)[:, :2] + 1, axis=1)
+    days = np.arange(n_draws, dtype=np.int32) * 7
+    path = os.path.join(tempfile.mkdtemp(), 'history.draws')
+
+    # Fichier compact: le premier ajout le réécrit avec une capacité doublée
+    DrawStore.write(path, numbers[:40], stars[:40], days[:40])
+    assert DrawStore.append(path, numbers[40:41], stars[40:41], days[40:41]) == 41
+
+    # Ajouts suivants sur place (capacité 82), puis une réécriture: un fichier
+    # déjà ouvert garde ses tirages
+    before = DrawStore.open(path)
+    inodes = {os.stat(path).st_ino}
+    for i in range(41, n_draws):
+        DrawStore.append(path, numbers[i], stars[i], days[i:i + 1])
+        inodes.add(os.stat(path).st_ino)
+    assert len(inodes) == 2
+    assert len(before) == 41 and np.array_equal(before.numbers, numbers[:41])
+
+    store = DrawStore.open(path)
+    assert np.array_equal(store.numbers, numbers) and np.array_equal(store.stars, stars)
+    assert np.array_equal(store.days, days)
+
+    # Version 1: sections pleines, sans capacité dans l'en-tête
+    header = struct.pack('<4sHBBBxxxQ', MAGIC, 1, 5, 2, False, n_draws)
+    with open(path, 'wb') as f:
+        f.write(header.ljust(HEADER_SIZE, b'\0') + numbers.astype(np.uint8).tobytes()
+                + stars.astype(np.uint8).tobytes())
+    assert np.array_equal(DrawStore.open(path).stars, stars)
+    DrawStore.append(path, numbers[:1], stars[:1])
+    assert np.array_equal(DrawStore.open(path).stars, np.vstack([stars, stars[:1]]))
+
+    logger.info(f"Fichier de tirages vérifié: {n_draws} tirages ajoutés un à un")
+    return store
+
+
+# Conversion en ligne de commande: python draw_store.py historique.csv [sortie.draws]
+# (--test: vérification du format)
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == '--test':
+        test_draw_store()
+    else:
+        csv_path = sys.argv[1]
+        store_path = sys.argv[2] if len(sys.argv) > 2 else os.path.splitext(csv_path)[0] + STORE_EXTENSION
+        DrawStore.from_csv(csv_path, store_path, ['n1', 'n2', 'n3', 'n4', 'n5'], ['s1', 's2'])
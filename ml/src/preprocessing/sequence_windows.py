@@ -0,0 +1,116 @@
+import numpy as np
+import os
+import sys
+
+# Ajout du répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import logger
+
+
+def sliding_windows(values, sequence_length):
+    """
+    Fenêtres glissantes des tirages et tirage suivant, sans copie
+
+    Les tirages étant contigus en mémoire, la fenêtre i (tirages i à
+    i+sequence_length-1 mis bout à bout) est la tranche [i*k, (i+L)*k) du
+    tableau aplati: X est une vue à pas (k, 1) sur les données d'origine.
+
+    Args:
+        values (array): Tirages, forme (n, k) (numéros ou étoiles)
+        sequence_length (int): Nombre de tirages par fenêtre
+
+    Returns:
+        tuple: (X vue en lecture seule (n - L, L*k), cibles vue (n - L, k))
+    """
+    values = np.ascontiguousarray(values)
+    n_draws, k = values.shape
+    n_windows = max(n_draws - sequence_length, 0)
+    if n_windows == 0:
+        return np.zeros((0, sequence_length * k), dtype=values.dtype), values[:0]
+
+    flat = values.reshape(-1)
+    X = np.lib.stride_tricks.sliding_window_view(flat, sequence_length * k)[::k][:n_windows]
+    return X, values[sequence_length:]
+
+
+def one_hot_targets(targets, num_classes, dtype=np.float32):
+    """
+    Encodage one-hot par indexation (une ligne par valeur du tirage)
+
+    Args:
+        targets (array): Valeurs cibles, forme (n, k), entre 0 et num_classes - 1
+        num_classes (int): Nombre de classes (valeur maximale + 1)
+        dtype: Type du tableau produit
+
+    Returns:
+        array: Cibles one-hot, forme (n, k, num_classes)
+    """
+    targets = np.asarray(targets)
+    n, k = targets.shape
+    encoded = np.zeros((n, k, num_classes), dtype=dtype)
+    encoded[np.arange(n)[:, None], np.arange(k), targets] = 1
+    return encoded
+
+
+def target_distribution(targets, num_classes, dtype=np.float32):
+    """
+    Distribution cible du tirage suivant: 1/k sur chacune de ses k valeurs
+
+    Forme attendue par la sortie softmax unique des LSTM (une probabilité
+    par classe) avec categorical_crossentropy. Les valeurs d'un tirage
+    étant distinctes, l'affectation par indexation suffit.
+
+    Args:
+        targets (array): Valeurs cibles, forme (n, k), entre 0 et num_classes - 1
+        num_classes (int): Nombre de classes (valeur maximale + 1)
+        dtype: Type du tableau produit
+
+    Returns:
+        array: Distributions cibles, forme (n, num_classes)
+    """
+    targets = np.asarray(targets)
+    n, k = targets.shape
+    encoded = np.zeros((n, num_classes), dtype=dtype)
+    encoded[np.arange(n)[:, None], targets] = 1 / k
+    return encoded
+
+
+def sparse_targets(targets, num_classes):
+    """
+    Cibles entières compactes (indices des classes), alternative au one-hot
+
+    Args:
+        targets (array): Valeurs cibles, forme (n, k)
+        num_classes (int): Nombre de classes (valeur maximale + 1)
+
+    Returns:
+        array: Cibles uint8 (ou uint16 au-delà de 256 classes), forme (n, k)
+    """
+    dtype = np.uint8 if num_classes <= 256 else np.uint16
+    return np.asarray(targets).astype(dtype)
+
+
+# Fonction pour vérifier les fenêtres et les cibles face aux boucles d'origine
+def test_sequence_windows(n_draws=500, sequence_length=10, seed=42):
+    rng = np.random.default_rng(seed)
+    values = np.sort(rng.random((n_draws, 50)).argsort(axis=1)[:, :5] + 1, axis=1)
+
+    X, targets = sliding_windows(values, sequence_length)
+    expected_X = np.array([values[i:i + sequence_length].flatten() for i in range(n_draws - sequence_length)])
+    assert np.shares_memory(X, values) and np.array_equal(X, expected_X)
+    assert np.array_equal(targets, values[sequence_length:])
+
+    encoded = one_hot_targets(targets, 51)
+    for row, draw in zip(encoded[:20], targets[:20]):
+        expected = np.zeros((5, 51))
+        expected[np.arange(5), draw] = 1
+        assert np.array_equal(row, expected)
+    assert np.array_equal(encoded.argmax(axis=2), sparse_targets(targets, 51))
+    assert np.allclose(target_distribution(targets, 51), encoded.mean(axis=1))
+
+    logger.info(f"Fenêtres glissantes vérifiées: {X.shape}, cibles {encoded.shape} {encoded.dtype}")
+    return X, encoded
+
+
+if __name__ == "__main__":
+    test_sequence_windows()
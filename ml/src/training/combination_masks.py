@@ -0,0 +1,275 @@
+import numpy as np
+import os
+import sys
+
+# Ajout du répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import logger
+
+# Une combinaison est codée par deux masques de bits: le numéro n (1-50)
+# occupe le bit n-1 d'un uint64, l'étoile s (1-12) le bit s-1 d'un uint16
+NUMBER_MASK_DTYPE = np.uint64
+STAR_MASK_DTYPE = np.uint16
+
+# Constantes du comptage de bits par blocs (si np.bitwise_count est absent)
+_M1 = np.uint64(0x5555555555555555)
+_M2 = np.uint64(0x3333333333333333)
+_M4 = np.uint64(0x0F0F0F0F0F0F0F0F)
+_H01 = np.uint64(0x0101010101010101)
+
+
+def encode(values, dtype=NUMBER_MASK_DTYPE):
+    """
+    Codage de groupes de valeurs (numéros ou étoiles) en masques de bits
+
+    Args:
+        values (array): Valeurs à partir de 1, forme (..., k)
+        dtype: Type des masques (uint64 pour les numéros, uint16 pour les étoiles)
+
+    Returns:
+        array: Masques, forme (...)
+    """
+    values = np.asarray(values, dtype=np.uint64)
+    bits = np.left_shift(np.uint64(1), values - np.uint64(1))
+    return np.bitwise_or.reduce(bits, axis=-1).astype(dtype)
+
+
+def encode_draws(draws, numbers_to_draw=5):
+    """
+    Codage de tirages complets (numéros puis étoiles)
+
+    Args:
+        draws (array): Tirages, forme (n, 7)
+        numbers_to_draw (int): Nombre de numéros par tirage
+
+    Returns:
+        tuple: (masques des numéros uint64, masques des étoiles uint16)
+    """
+    draws = np.asarray(draws)
+    return (encode(draws[:, :numbers_to_draw], NUMBER_MASK_DTYPE),
+            encode(draws[:, numbers_to_draw:], STAR_MASK_DTYPE))
+
+
+def combination_keys(combinations, numbers_to_draw=5, star_shift=50):
+    """
+    Clé entière canonique de chaque combinaison
+
+    Le masque des étoiles est placé au-dessus de celui des numéros (bits 50
+    à 61): deux combinaisons ont la même clé si et seulement si elles ont les
+    mêmes numéros et les mêmes étoiles, quel que soit leur ordre.
+
+    Args:
+        combinations (array): Combinaisons, forme (n, 7)
+        numbers_to_draw (int): Nombre de numéros par combinaison
+        star_shift (int): Position du premier bit des étoiles
+
+    Returns:
+        array: Clés uint64
+    """
+    number_masks, star_masks = encode_draws(combinations, numbers_to_draw)
+    return number_masks | (star_masks.astype(np.uint64) << np.uint64(star_shift))
+
+
+def popcount(masks):
+    """
+    Nombre de bits à 1 de chaque masque
+
+    Args:
+        masks (array): Masques entiers non signés
+
+    Returns:
+        array: Nombre de bits (uint8)
+    """
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(masks)
+
+    # NumPy < 2.0: comptage par blocs de 2, 4 puis 8 bits
+    x = np.asarray(masks).astype(np.uint64)
+    x = x - ((x >> np.uint64(1)) & _M1)
+    x = (x & _M2) + ((x >> np.uint64(2)) & _M2)
+    x = (x + (x >> np.uint64(4))) & _M4
+    return ((x * _H01) >> np.uint64(56)).astype(np.uint8)
+
+
+def common_counts(number_mask, star_mask, history_number_masks, history_star_masks):
+    """
+    Numéros et étoiles communs entre une combinaison et chaque tirage historique
+
+    Args:
+        number_mask (int): Masque des numéros de la combinaison
+        star_mask (int): Masque des étoiles de la combinaison
+        history_number_masks (array): Masques des numéros des tirages (uint64)
+        history_star_masks (array): Masques des étoiles des tirages (uint16)
+
+    Returns:
+        tuple: (numéros communs, étoiles communes) par tirage
+    """
+    common_numbers = popcount(history_number_masks & NUMBER_MASK_DTYPE(number_mask))
+    common_stars = popcount(history_star_masks & STAR_MASK_DTYPE(star_mask))
+    return common_numbers, common_stars
+
+
+# Nombre maximal de cases (combinaisons x tirages) traitées par bloc
+ORIGINALITY_BLOCK_SIZE = 1 << 22
+
+
+def similarity_table(numbers_to_draw=5, stars_to_draw=2):
+    """
+    Similarité avec un tirage selon le nombre de numéros et d'étoiles communs
+
+    Même opération flottante que l'évaluation d'origine:
+    (communs / numéros + étoiles communes / étoiles) / 2.
+
+    Returns:
+        array: Table float64 (numéros communs, étoiles communes)
+    """
+    common_numbers = np.arange(numbers_to_draw + 1)[:, None]
+    common_stars = np.arange(stars_to_draw + 1)[None, :]
+    return (common_numbers / numbers_to_draw + common_stars / stars_to_draw) / 2
+
+
+def mean_originality(common_numbers, common_stars, numbers_to_draw=5, stars_to_draw=2):
+    """
+    1 - similarité moyenne, les similarités étant sommées tirage après tirage
+
+    La somme cumulée suit l'ordre de l'ancienne boucle (sum() d'une liste):
+    le résultat est identique au bit près, et non seulement à l'arrondi près.
+
+    Args:
+        common_numbers (array): Numéros communs, forme (..., tirages)
+        common_stars (array): Étoiles communes, forme (..., tirages)
+
+    Returns:
+        array: Originalité, forme (...)
+    """
+    similarities = similarity_table(numbers_to_draw, stars_to_draw)[common_numbers, common_stars]
+    return 1.0 - np.cumsum(similarities, axis=-1)[..., -1] / similarities.shape[-1]
+
+
+def originality(numbers, stars, history_number_masks, history_star_masks):
+    """
+    Originalité d'une combinaison: 1 - similarité moyenne avec l'historique
+
+    Les éléments communs avec chaque tirage sont comptés par popcount.
+
+    Args:
+        numbers (list): Numéros de la combinaison
+        stars (list): Étoiles de la combinaison
+        history_number_masks (array): Masques des numéros des tirages (uint64)
+        history_star_masks (array): Masques des étoiles des tirages (uint16)
+
+    Returns:
+        float: Originalité entre 0 et 1 (0.5 sans historique)
+    """
+    if len(history_number_masks) == 0:
+        return 0.5
+
+    common_numbers, common_stars = common_counts(
+        encode(numbers, NUMBER_MASK_DTYPE), encode(stars, STAR_MASK_DTYPE),
+        history_number_masks, history_star_masks
+    )
+    return float(mean_originality(common_numbers, common_stars, len(numbers), len(stars)))
+
+
+def originality_from_totals(total_numbers, total_stars, n_draws, numbers_to_draw=5, stars_to_draw=2):
+    """
+    Originalité à partir des totaux de numéros et d'étoiles communs
+
+    La somme des éléments communs sur l'historique est la somme des totaux
+    d'apparitions des numéros et étoiles de la combinaison: le calcul ne
+    dépend plus de la taille de l'historique, mais l'arrondi diffère de la
+    somme tirage par tirage (écart croissant avec l'historique, environ
+    2e-13 pour un million de tirages).
+
+    Args:
+        total_numbers (int): Somme des numéros communs sur l'historique
+        total_stars (int): Somme des étoiles communes sur l'historique
+        n_draws (int): Nombre de tirages historiques
+        numbers_to_draw (int): Nombre de numéros par combinaison
+        stars_to_draw (int): Nombre d'étoiles par combinaison
+
+    Returns:
+        float: Originalité
+    """
+    numerator = stars_to_draw * total_numbers + numbers_to_draw * total_stars
+    return 1.0 - numerator / (2 * numbers_to_draw * stars_to_draw * n_draws)
+
+
+def population_originality(number_masks, star_masks, history_number_masks, history_star_masks,
+                           numbers_to_draw=5, stars_to_draw=2):
+    """
+    Originalité de chaque combinaison d'une population, identique à originality()
+
+    Les comptes (combinaisons x tirages) sont calculés par blocs d'au plus
+    ORIGINALITY_BLOCK_SIZE cases.
+
+    Args:
+        number_masks (array): Masques des numéros des combinaisons (uint64)
+        star_masks (array): Masques des étoiles des combinaisons (uint16)
+        history_number_masks (array): Masques des numéros des tirages (uint64)
+        history_star_masks (array): Masques des étoiles des tirages (uint16)
+
+    Returns:
+        array: Originalité float64 par combinaison (0.5 sans historique)
+    """
+    n_draws = len(history_number_masks)
+    result = np.full(len(number_masks), 0.5)
+    if n_draws == 0:
+        return result
+
+    block = max(1, ORIGINALITY_BLOCK_SIZE // n_draws)
+    for start in range(0, len(number_masks), block):
+        stop = start + block
+        common_numbers = popcount(history_number_masks[None, :] & number_masks[start:stop, None])
+        common_stars = popcount(history_star_masks[None, :] & star_masks[start:stop, None])
+        result[start:stop] = mean_originality(common_numbers, common_stars, numbers_to_draw, stars_to_draw)
+    return result
+
+
+# Fonction pour vérifier le noyau contre le calcul par ensembles
+def test_combination_masks(n_draws=2000, n_combinations=200, seed=42):
+    """
+    Comparaison avec le calcul historique par intersections d'ensembles
+
+    Les nombres de numéros et d'étoiles communs et l'originalité (somme
+    flottante séquentielle de l'ancien calcul) doivent être identiques.
+    """
+    rng = np.random.default_rng(seed)
+    numbers = np.sort(rng.random((n_draws, 50)).argsort(axis=1)[:, :5] + 1, axis=1)
+    stars = np.sort(rng.random((n_draws, 12)).argsort(axis=1)[:, :2] + 1, axis=1)
+    draws = np.hstack([numbers, stars]).tolist()
+    history_number_masks, history_star_masks = encode_draws(draws)
+
+    combinations = []
+    for _ in range(n_combinations):
+        combination = (sorted(rng.choice(np.arange(1, 51), 5, replace=False).tolist())
+                       + sorted(rng.choice(np.arange(1, 13), 2, replace=False).tolist()))
+        combo_numbers, combo_stars = combination[:5], combination[5:]
+        combinations.append(combination)
+
+        expected_numbers = [len(set(combo_numbers).intersection(draw[:5])) for draw in draws]
+        expected_stars = [len(set(combo_stars).intersection(draw[5:])) for draw in draws]
+        common_numbers, common_stars = common_counts(
+            encode(combo_numbers), encode(combo_stars, STAR_MASK_DTYPE),
+            history_number_masks, history_star_masks
+        )
+        assert common_numbers.tolist() == expected_numbers
+        assert common_stars.tolist() == expected_stars
+
+        # Ancienne évaluation: similarités accumulées une à une
+        total = 0
+        for n, s in zip(expected_numbers, expected_stars):
+            total += (n / 5 + s / 2) / 2
+        expected = 1.0 - total / len(draws)
+        assert originality(combo_numbers, combo_stars, history_number_masks, history_star_masks) == expected
+
+    number_masks, star_masks = encode_draws(combinations)
+    expected = [originality(c[:5], c[5:], history_number_masks, history_star_masks) for c in combinations]
+    assert population_originality(number_masks, star_masks, history_number_masks, history_star_masks).tolist() == expected
+
+    logger.info(f"Masques de combinaisons vérifiés: {n_combinations} combinaisons, originalité identique")
+    return expected
+
+
+if __name__ == "__main__":
+    test_combination_masks()
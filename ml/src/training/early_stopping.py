@@ -0,0 +1,102 @@
+import os
+import sys
+import time
+
+# Ajout du répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import logger
+
+# Raisons d'arrêt d'une exécution du GA
+STOP_GENERATIONS = 'generations'
+STOP_TIME_BUDGET = 'time_budget'
+STOP_STAGNATION = 'stagnation'
+STOP_EXHAUSTIVE = 'exhaustive'
+
+
+class EarlyStopping:
+    """
+    Critères d'arrêt anticipé d'une exécution de l'algorithme génétique
+
+    - budget de temps: une génération n'est lancée que si la durée moyenne
+      d'une génération tient encore dans le budget restant;
+    - stagnation: ni la meilleure fitness ni la fitness moyenne ne se sont
+      améliorées (de plus de `min_delta`) depuis `patience` générations.
+    """
+
+    def __init__(self, time_budget=None, patience=None, min_delta=0.0):
+        """
+        Initialisation des critères
+
+        Args:
+            time_budget (float, optional): Budget de temps en secondes
+            patience (int, optional): Générations sans amélioration avant l'arrêt
+            min_delta (float): Amélioration minimale prise en compte
+        """
+        self.time_budget = time_budget
+        self.patience = patience
+        self.min_delta = min_delta
+        self.start()
+
+    def start(self):
+        """
+        Démarrage du chronomètre et remise à zéro des records
+        """
+        self.started_at = time.perf_counter()
+        self.generations = 0
+        self.best = float('-inf')
+        self.mean = float('-inf')
+        self.stale_generations = 0
+        self.reason = None
+
+    def elapsed(self):
+        return time.perf_counter() - self.started_at
+
+    def update(self, best, mean):
+        """
+        Prise en compte d'une génération terminée
+
+        Args:
+            best (float): Meilleure fitness de la génération
+            mean (float): Fitness moyenne de la génération
+
+        Returns:
+            str: Raison d'arrêt, ou None pour continuer
+        """
+        self.generations += 1
+        improved = False
+        if best > self.best + self.min_delta:
+            self.best = best
+            improved = True
+        if mean > self.mean + self.min_delta:
+            self.mean = mean
+            improved = True
+        self.stale_generations = 0 if improved else self.stale_generations + 1
+
+        if self.patience is not None and self.stale_generations >= self.patience:
+            self.reason = STOP_STAGNATION
+        elif not self.has_time_for_generation():
+            self.reason = STOP_TIME_BUDGET
+        return self.reason
+
+    def has_time_for_generation(self):
+        """
+        Vérifie qu'une génération de plus tient dans le budget de temps
+        """
+        if self.time_budget is None:
+            return True
+        elapsed = self.elapsed()
+        per_generation = elapsed / self.generations if self.generations else 0.0
+        return elapsed + per_generation <= self.time_budget
+
+    def finish(self):
+        """
+        Raison d'arrêt finale (nombre de générations atteint par défaut)
+
+        Returns:
+            str: Raison d'arrêt
+        """
+        if self.reason is None:
+            self.reason = STOP_GENERATIONS
+        logger.info(f"Arrêt du GA après {self.generations} générations ({self.reason}, "
+                    f"{self.elapsed() * 1000:.1f} ms)")
+        return self.reason
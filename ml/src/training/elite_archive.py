@@ -0,0 +1,233 @@
+import fcntl
+import numpy as np
+import os
+import sys
+import tempfile
+
+# Ajout du répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import logger
+from training.numpy_engine import top_unique
+
+# Suffixe du fichier d'archive, à côté de la sauvegarde du GA
+ARCHIVE_SUFFIX = '_elites.npz'
+
+
+def elite_archive_path(model_path):
+    """
+    Chemin de l'archive des élites associée à une sauvegarde du GA
+
+    Args:
+        model_path (str): Chemin de la sauvegarde du GA (genetic_algorithm.npz ou .pkl)
+
+    Returns:
+        str: Chemin de genetic_algorithm_elites.npz
+    """
+    return os.path.splitext(model_path)[0] + ARCHIVE_SUFFIX
+
+
+class EliteArchive:
+    """
+    Archive persistante des meilleures combinaisons trouvées par le GA
+
+    Les élites sont regroupées par version de l'historique (empreinte des
+    tirages, voir preprocessing.draw_store.history_fingerprint): leur fitness
+    n'a de sens que pour l'historique qui l'a produite. Chaque exécution y
+    verse son panthéon; les suivantes sur le même historique y puisent une
+    partie de leur population initiale au lieu de repartir du hasard.
+    Seules les `max_versions` versions les plus récentes sont conservées.
+
+    Les exécutions n'enrichissent que l'archive en mémoire: le fichier
+    n'est écrit que par save() (entraînement, export), après fusion avec
+    son contenu courant pour ne pas perdre les élites d'un autre processus.
+    """
+
+    def __init__(self, path=None, max_size=200, max_versions=4):
+        """
+        Initialisation d'une archive vide
+
+        Args:
+            path (str, optional): Fichier .npz de l'archive (None: archive en mémoire)
+            max_size (int): Nombre d'élites conservées par version de l'historique
+            max_versions (int): Nombre de versions de l'historique conservées
+        """
+        self.path = path
+        self.max_size = max_size
+        self.max_versions = max_versions
+        self.numbers_to_draw = 5
+        # Empreinte hexadécimale -> (combinaisons uint8, fitness), du plus ancien au plus récent
+        self.entries = {}
+
+    @classmethod
+    def open(cls, path, max_size=200, max_versions=4):
+        """
+        Ouverture d'une archive (vide si le fichier n'existe pas encore)
+
+        Args:
+            path (str): Fichier .npz de l'archive
+
+        Returns:
+            EliteArchive: Archive liée au fichier
+        """
+        archive = cls(path, max_size=max_size, max_versions=max_versions)
+        archive.entries = cls._read_entries(path)
+        if archive.entries:
+            logger.info(f"Archive des élites chargée depuis {path}: {len(archive.entries)} versions")
+        return archive
+
+    @staticmethod
+    def _read_entries(path):
+        """
+        Versions archivées dans un fichier (vide s'il n'existe pas)
+        """
+        entries = {}
+        if os.path.exists(path):
+            with np.load(path, allow_pickle=False) as data:
+                for key in data['versions'].tolist():
+                    entries[key] = (data[f"{key}/combinations"], data[f"{key}/fitness"])
+        return entries
+
+    def save(self, path=None):
+        """
+        Fusion avec le fichier existant puis écriture atomique de l'archive
+
+        Les élites écrites entre-temps par un autre processus sont conservées;
+        les versions de cette archive deviennent les plus récentes.
+
+        Args:
+            path (str, optional): Fichier de sortie (par défaut celui de l'archive)
+        """
+        path = path or self.path
+        if path is None:
+            return
+
+        directory = os.path.dirname(path) or '.'
+        with open(f"{path}.lock", 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                entries = self._read_entries(path)
+                for key, (combinations, fitness) in self.entries.items():
+                    entries[key] = self._merge(entries.pop(key, None), combinations, fitness)
+                while len(entries) > self.max_versions:
+                    del entries[next(iter(entries))]
+                self.entries = entries
+
+                arrays = {'versions': np.array(list(entries), dtype=str)}
+                for key, (combinations, fitness) in entries.items():
+                    arrays[f"{key}/combinations"] = combinations
+                    arrays[f"{key}/fitness"] = fitness
+
+                # Fichier temporaire unique dans le même répertoire, puis renommage atomique
+                fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp.npz')
+                try:
+                    with os.fdopen(fd, 'wb') as f:
+                        np.savez(f, **arrays)
+                    os.replace(tmp_path, path)
+                except BaseException:
+                    os.unlink(tmp_path)
+                    raise
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _merge(self, archived, combinations, fitness):
+        """
+        Meilleures combinaisons distinctes de deux ensembles d'élites
+        """
+        if archived is None:
+            archived = (np.zeros((0, 7), np.uint8), np.zeros(0))
+        return top_unique(np.vstack([archived[0], np.asarray(combinations, dtype=np.uint8)]),
+                          np.concatenate([archived[1], np.asarray(fitness, dtype=np.float64)]),
+                          self.max_size, self.numbers_to_draw)
+
+    def elites(self, fingerprint, size=None):
+        """
+        Meilleures combinaisons archivées pour un historique
+
+        Args:
+            fingerprint (bytes): Empreinte de l'historique
+            size (int, optional): Nombre maximal de combinaisons
+
+        Returns:
+            tuple: (combinaisons uint8 (n, 7), fitness) par fitness décroissante
+        """
+        combinations, fitness = self.entries.get(fingerprint.hex(), (np.zeros((0, 7), np.uint8), np.zeros(0)))
+        return combinations[:size], fitness[:size]
+
+    def update(self, fingerprint, combinations, fitness, numbers_to_draw=5):
+        """
+        Ajout des combinaisons d'une exécution (en mémoire, voir save())
+
+        Args:
+            fingerprint (bytes): Empreinte de l'historique
+            combinations (array): Combinaisons triées, forme (n, 7)
+            fitness (array): Fitness correspondantes
+            numbers_to_draw (int): Nombre de numéros par combinaison
+
+        Returns:
+            int: Nombre d'élites archivées pour cet historique
+        """
+        key = fingerprint.hex()
+        self.numbers_to_draw = numbers_to_draw
+        merged = self._merge(self.entries.pop(key, None), combinations, fitness)
+
+        # La version mise à jour devient la plus récente; les plus anciennes sont oubliées
+        self.entries[key] = merged
+        while len(self.entries) > self.max_versions:
+            del self.entries[next(iter(self.entries))]
+        return len(merged[0])
+
+
+# Fonction pour vérifier l'archive et la reprise des élites
+def test_elite_archive(n_draws=500, seed=42):
+    """
+    Deux exécutions successives sur le même historique: la seconde repart
+    des élites de la première et ne peut pas faire moins bien
+    """
+    import tempfile
+    import pandas as pd
+    from training.genetic_algorithm import GeneticAlgorithm
+
+    rng = np.random.default_rng(seed)
+    numbers = np.sort(rng.random((n_draws, 50)).argsort(axis=1)[:, :5] + 1, axis=1)
+    stars = np.sort(rng.random((n_draws, 12)).argsort(axis=1)[:, :2] + 1, axis=1)
+    columns = ['numero1', 'numero2', 'numero3', 'numero4', 'numero5', 'etoile1', 'etoile2']
+    history = pd.DataFrame(np.hstack([numbers, stars]), columns=columns)
+
+    path = os.path.join(tempfile.mkdtemp(), f"genetic_algorithm{ARCHIVE_SUFFIX}")
+    results = []
+    for engine in ['numpy', 'deap']:
+        for run in range(2):
+            ga = GeneticAlgorithm(population_size=100, generations=10, engine=engine, seed=run,
+                                  elite_archive=EliteArchive.open(path))
+            ga.load_historical_data(history)
+            best = ga.generate_combinations(num_combinations=5, verbose=False)
+            results.append((engine, ga.run_stats['warm_start'], best[0]['fitness']))
+            # Une exécution ne touche pas au fichier: seul save() l'écrit
+            assert os.path.exists(path) == (len(results) > 1)
+            ga.elite_archive.save()
+
+    # Chaque exécution reprend les élites et fait au moins aussi bien que la précédente
+    assert results[0][1] == 0 and all(warm == 25 for _, warm, _ in results[1:]), results
+    assert all(later[2] >= earlier[2] for earlier, later in zip(results, results[1:])), results
+
+    archive = EliteArchive.open(path)
+    combinations, fitness = archive.elites(ga.history_fingerprint)
+    assert len(archive.entries) == 1 and np.all(np.diff(fitness) <= 0)
+    assert np.array_equal(ga._score_population(combinations), fitness)
+
+    # Deux processus ouverts sur le même fichier: le dernier à écrire conserve les élites de l'autre
+    first, second = EliteArchive.open(path), EliteArchive.open(path)
+    first.update(b'\x01' * 32, combinations[:3], fitness[:3])
+    second.update(b'\x02' * 32, combinations[:4], fitness[:4])
+    first.save()
+    second.save()
+    merged = EliteArchive.open(path)
+    assert {(b'\x01' * 32).hex(), (b'\x02' * 32).hex(), ga.history_fingerprint.hex()} <= set(merged.entries)
+    assert not [name for name in os.listdir(os.path.dirname(path)) if '.tmp' in name]
+
+    logger.info(f"Archive des élites vérifiée: {len(combinations)} élites, meilleure fitness {fitness[0]:.4f}")
+    return archive
+
+
+if __name__ == "__main__":
+    test_elite_archive()
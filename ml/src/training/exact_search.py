@@ -0,0 +1,245 @@
+import heapq
+import itertools
+import numpy as np
+import os
+import sys
+import time
+from math import comb
+
+# Ajout du répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import logger
+from training.numpy_engine import to_combinations
+
+# Ensembles de numéros et paires d'étoiles, énumérés une seule fois par processus
+_combination_sets = {}
+
+# Structure des ensembles de numéros indépendante de l'historique (voir number_set_layout)
+_number_set_layouts = {}
+
+
+def combination_set(max_value, k):
+    """
+    Toutes les combinaisons de k valeurs parmi 1..max_value, en ordre lexicographique
+
+    Args:
+        max_value (int): Valeur maximale (50 ou 12)
+        k (int): Nombre de valeurs par combinaison
+
+    Returns:
+        array: Combinaisons triées, forme (C(max_value, k), k), uint8
+    """
+    key = (max_value, k)
+    if key not in _combination_sets:
+        count = comb(max_value, k)
+        values = itertools.chain.from_iterable(itertools.combinations(range(1, max_value + 1), k))
+        _combination_sets[key] = np.fromiter(values, dtype=np.uint8, count=count * k).reshape(count, k)
+    return _combination_sets[key]
+
+
+def number_set_layout(max_value, k, low_threshold=25):
+    """
+    Structure fixe des ensembles de numéros, calculée une fois par processus
+
+    Args:
+        max_value (int): Numéro maximal
+        k (int): Numéros par ensemble
+        low_threshold (int): Plus grand numéro « bas »
+
+    Returns:
+        tuple: (ensembles, indices aplatis des paires dans une matrice
+                (max_value+1)², nombre de numéros bas de chaque ensemble)
+    """
+    key = (max_value, k, low_threshold)
+    if key not in _number_set_layouts:
+        number_sets = combination_set(max_value, k)
+        i, j = np.triu_indices(k, k=1)
+        pair_ids = (number_sets[:, i].astype(np.uint16) * (max_value + 1) + number_sets[:, j]).astype(np.uint16)
+        low_counts = np.count_nonzero(number_sets <= low_threshold, axis=1).astype(np.uint8)
+        _number_set_layouts[key] = (number_sets, pair_ids, low_counts)
+    return _number_set_layouts[key]
+
+
+class ExactSearch:
+    """
+    Recherche exhaustive des meilleures combinaisons pour la fitness du GA
+
+    Une fois l'historique chargé, chaque terme de la fitness est une somme
+    de termes par numéro, par étoile ou par paire de numéros: rareté,
+    équilibre, originalité moyenne (linéaire en les totaux d'apparitions) et
+    plausibilité des paires. Le score se décompose donc en une partie
+    numéros f (C(50,5) = 2 118 760 ensembles) et une partie étoiles g
+    (66 paires). Les meilleures combinaisons de f + g utilisent forcément
+    l'un des K meilleurs ensembles de numéros: seuls ceux-ci (et une marge
+    contre les écarts d'arrondi) sont croisés avec les 66 paires, puis
+    réévalués par la fitness du GA pour des scores identiques au bit près.
+    """
+
+    def __init__(self, ga, chunk_size=250_000):
+        """
+        Initialisation de la recherche
+
+        Args:
+            ga (GeneticAlgorithm): Algorithme génétique dont l'historique est chargé
+            chunk_size (int): Nombre d'ensembles de numéros évalués par bloc
+        """
+        if ga.number_frequency_table is None:
+            raise ValueError("Les données historiques doivent être chargées avant la recherche exacte")
+        self.ga = ga
+        self.chunk_size = chunk_size
+        self.evaluations = 0
+
+    def _originality_weight(self):
+        """
+        Coefficient d'un total d'apparitions dans l'originalité (1 - a*T / (2*n*s*N))
+        """
+        ga = self.ga
+        return 1.0 / (2 * ga.numbers_to_draw * ga.stars_to_draw * ga.history_size)
+
+    def number_weights(self):
+        """
+        Tables de la partie numéros de la fitness, à une constante près:
+        f = somme des poids des numéros + équilibre[numéros bas] + somme des poids des paires
+
+        Returns:
+            tuple: (poids par numéro, terme d'équilibre par nombre de numéros bas,
+                    poids des paires aplatis)
+        """
+        ga = self.ga
+        k = ga.numbers_to_draw
+        n_pairs = k * (k - 1) // 2
+
+        # Rareté (0.3 / 2 de la moyenne) et originalité (linéaire en les apparitions)
+        number_weights = (0.15 * (1.0 - ga.number_frequency_table) / k
+                          - 0.3 * ga.stars_to_draw * ga.number_history_counts * self._originality_weight())
+        low_numbers = np.arange(k + 1)
+        balance = 0.2 * (1.0 - np.abs(low_numbers / k - 0.5) * 2)
+        pair_weights = (0.2 / n_pairs * ga.pair_frequency_table).ravel()
+        return number_weights, balance, pair_weights
+
+    def number_scores(self, start=0, stop=None):
+        """
+        Partie numéros de la fitness (à une constante près) d'une tranche des ensembles
+
+        Args:
+            start (int): Indice du premier ensemble (ordre lexicographique)
+            stop (int, optional): Indice de fin (exclu)
+
+        Returns:
+            array: Scores float64
+        """
+        ga = self.ga
+        number_sets, pair_ids, low_counts = number_set_layout(ga.num_numbers, ga.numbers_to_draw)
+        number_weights, balance, pair_weights = self.number_weights()
+        return (np.take(number_weights, number_sets[start:stop]).sum(axis=1)
+                + balance[low_counts[start:stop]]
+                + np.take(pair_weights, pair_ids[start:stop]).sum(axis=1))
+
+    def star_scores(self, star_pairs):
+        """
+        Partie étoiles de la fitness (à une constante près)
+
+        Args:
+            star_pairs (array): Paires d'étoiles, forme (n, 2)
+
+        Returns:
+            array: Scores float64
+        """
+        ga = self.ga
+        stars = star_pairs.astype(np.intp)
+        rarity = (1.0 - ga.star_frequency_table[stars]).sum(axis=1) / ga.stars_to_draw
+        total = ga.star_history_counts[stars].sum(axis=1)
+        originality = -ga.numbers_to_draw * total * self._originality_weight()
+        return 0.15 * rarity + 0.3 * originality
+
+    def top_number_sets(self, size):
+        """
+        Meilleurs ensembles de numéros, par blocs et avec un tas borné
+
+        Args:
+            size (int): Nombre d'ensembles conservés
+
+        Returns:
+            array: Ensembles de numéros, forme (size, 5)
+        """
+        ga = self.ga
+        number_sets = combination_set(ga.num_numbers, ga.numbers_to_draw)
+        heap = []
+        for start in range(0, len(number_sets), self.chunk_size):
+            scores = self.number_scores(start, start + self.chunk_size)
+            self.evaluations += len(scores)
+
+            # Seuls les meilleurs du bloc peuvent entrer dans le tas
+            best = np.argpartition(-scores, min(size, len(scores)) - 1)[:size]
+            for index in best.tolist():
+                entry = (scores[index], start + index)
+                if len(heap) < size:
+                    heapq.heappush(heap, entry)
+                elif entry > heap[0]:
+                    heapq.heapreplace(heap, entry)
+
+        return number_sets[sorted(index for _, index in heap)]
+
+    def run(self, num_combinations=5):
+        """
+        Meilleures combinaisons exactes
+
+        Args:
+            num_combinations (int): Nombre de combinaisons à retourner
+
+        Returns:
+            list: Combinaisons au format de GeneticAlgorithm.generate_combinations()
+        """
+        ga = self.ga
+        start = time.perf_counter()
+
+        # Marge contre les écarts d'arrondi entre f + g et la fitness exacte
+        number_sets = self.top_number_sets(2 * num_combinations + 8)
+        star_pairs = combination_set(ga.num_stars, ga.stars_to_draw)
+        self.evaluations += len(star_pairs)
+
+        candidates = np.hstack([np.repeat(number_sets, len(star_pairs), axis=0),
+                                np.tile(star_pairs, (len(number_sets), 1))])
+        fitness = ga._score_population(candidates)
+        self.evaluations += len(candidates)
+
+        order = np.lexsort((np.arange(len(fitness)), -fitness))[:num_combinations]
+        logger.info(f"Recherche exacte: {self.evaluations} évaluations en "
+                    f"{(time.perf_counter() - start) * 1000:.0f} ms, meilleure fitness {fitness[order[0]]:.4f}")
+        return to_combinations(candidates[order], fitness[order], ga.numbers_to_draw)
+
+
+# Fonction pour vérifier la recherche exacte par force brute
+def test_exact_search(n_draws=1000, seed=42):
+    """
+    Comparaison avec l'évaluation de toutes les combinaisons utilisant la
+    meilleure paire d'étoiles, puis avec le moteur génétique
+    """
+    import pandas as pd
+    from training.genetic_algorithm import GeneticAlgorithm
+
+    rng = np.random.default_rng(seed)
+    numbers = np.sort(rng.random((n_draws, 50)).argsort(axis=1)[:, :5] + 1, axis=1)
+    stars = np.sort(rng.random((n_draws, 12)).argsort(axis=1)[:, :2] + 1, axis=1)
+    columns = ['numero1', 'numero2', 'numero3', 'numero4', 'numero5', 'etoile1', 'etoile2']
+    ga = GeneticAlgorithm(population_size=500, generations=100, engine='numpy', seed=seed)
+    ga.load_historical_data(pd.DataFrame(np.hstack([numbers, stars]), columns=columns))
+
+    best = ExactSearch(ga).run(num_combinations=10)
+
+    # Force brute: tous les ensembles de numéros avec la meilleure paire d'étoiles
+    number_sets = combination_set(50, 5)
+    candidates = np.hstack([number_sets, np.tile(np.array(best[0]['stars'], dtype=np.uint8), (len(number_sets), 1))])
+    brute_force = ga._score_population(candidates)
+    assert brute_force.max() == best[0]['fitness'], (brute_force.max(), best[0]['fitness'])
+
+    fitness = [combination['fitness'] for combination in best]
+    assert fitness == sorted(fitness, reverse=True)
+    assert ga.generate_combinations(num_combinations=1, verbose=False)[0]['fitness'] <= fitness[0]
+
+    logger.info(f"Recherche exacte vérifiée: meilleure fitness {fitness[0]:.6f}")
+    return best
+
+
+if __name__ == "__main__":
+    test_exact_search()
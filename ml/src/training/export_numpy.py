@@ -0,0 +1,181 @@
+import json
+import numpy as np
+import os
+import sys
+import tensorflow as tf
+
+# Ajout du répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import ROOT_DIR, DATA_DIR, MODELS_DIR, logger
+from prediction.numpy_runtime import FORMAT_VERSION, NumpyModel
+
+# Tolérance maximale (écart absolu) entre les sorties Keras et NumPy
+DEFAULT_TOLERANCE = 1e-5
+
+
+def _activation_name(activation):
+    """
+    Nom d'une fonction d'activation Keras
+    """
+    return activation if isinstance(activation, str) else activation.__name__
+
+
+def _lstm_spec(layer, prefix, arrays):
+    """
+    Description d'une couche LSTM et enregistrement de ses poids
+    """
+    names = ['kernel', 'recurrent_kernel', 'bias'] if layer.use_bias else ['kernel', 'recurrent_kernel']
+    for name, value in zip(names, layer.get_weights()):
+        arrays[f"{prefix}{name}"] = value.astype(np.float32)
+    return {
+        'return_sequences': bool(layer.return_sequences),
+        'go_backwards': bool(layer.go_backwards),
+        'activation': _activation_name(layer.activation),
+        'recurrent_activation': _activation_name(layer.recurrent_activation)
+    }
+
+
+def export_model(model, filepath):
+    """
+    Export des poids d'un modèle Keras séquentiel au format .npz
+
+    Args:
+        model: Modèle Keras (Embedding, LSTM, Bidirectional, Dense, Dropout)
+        filepath (str): Chemin du fichier .npz à écrire
+    """
+    layers = []
+    arrays = {}
+
+    for i, layer in enumerate(model.layers):
+        kind = layer.__class__.__name__
+        prefix = f"layer{i}/"
+        start = len(arrays)
+
+        if kind == 'Embedding':
+            arrays[f"{prefix}embeddings"] = layer.get_weights()[0].astype(np.float32)
+            spec = {'type': kind}
+        elif kind == 'Dense':
+            weights = layer.get_weights()
+            arrays[f"{prefix}kernel"] = weights[0].astype(np.float32)
+            if layer.use_bias:
+                arrays[f"{prefix}bias"] = weights[1].astype(np.float32)
+            spec = {'type': kind, 'activation': _activation_name(layer.activation)}
+        elif kind == 'Dropout':
+            spec = {'type': kind}
+        elif kind == 'LSTM':
+            spec = dict(_lstm_spec(layer, prefix, arrays), type=kind)
+        elif kind == 'Bidirectional':
+            spec = {
+                'type': kind,
+                'merge_mode': layer.merge_mode,
+                'forward': _lstm_spec(layer.forward_layer, f"{prefix}forward/", arrays),
+                'backward': _lstm_spec(layer.backward_layer, f"{prefix}backward/", arrays)
+            }
+        else:
+            raise ValueError(f"Couche non supportée par l'export NumPy: {kind}")
+
+        spec['weights'] = [name[len(prefix):] for name in list(arrays)[start:]]
+        layers.append(spec)
+
+    header = {'format_version': FORMAT_VERSION, 'layers': layers}
+    np.savez(filepath, header=np.array(json.dumps(header)), **arrays)
+    logger.info(f"Modèle exporté au format NumPy: {filepath}")
+
+
+def validate_export(model, numpy_model, input_shape, max_value, n_samples=64, tolerance=DEFAULT_TOLERANCE):
+    """
+    Comparaison des sorties Keras et NumPy sur des entrées aléatoires
+
+    Args:
+        model: Modèle Keras de référence
+        numpy_model (NumpyModel): Modèle NumPy exporté
+        input_shape (tuple): Forme d'un exemple d'entrée
+        max_value (int): Valeur maximale des entrées (numéro ou étoile)
+        n_samples (int): Nombre d'exemples testés
+        tolerance (float): Écart absolu maximal toléré
+
+    Returns:
+        float: Écart absolu maximal observé
+    """
+    rng = np.random.default_rng(42)
+    X = rng.integers(1, max_value + 1, size=(n_samples,) + tuple(input_shape))
+
+    expected = model.predict(X, verbose=0)
+    actual = numpy_model.predict(X)
+    max_error = float(np.max(np.abs(expected - actual)))
+
+    if max_error > tolerance:
+        raise ValueError(f"Écart Keras/NumPy trop important: {max_error:.2e} > {tolerance:.0e}")
+
+    logger.info(f"Export validé: écart maximal {max_error:.2e}")
+    return max_error
+
+
+def export_models(models_dir=None, tolerance=DEFAULT_TOLERANCE):
+    """
+    Export et validation des modèles LSTM des numéros et des étoiles
+
+    Args:
+        models_dir (str, optional): Répertoire des modèles. Par défaut MODELS_DIR.
+        tolerance (float): Écart absolu maximal toléré
+    """
+    if models_dir is None:
+        models_dir = MODELS_DIR
+
+    for name, max_value in [('lstm_numbers_model', 50), ('lstm_stars_model', 12)]:
+        h5_path = os.path.join(models_dir, f"{name}.h5")
+        npz_path = os.path.join(models_dir, f"{name}.npz")
+
+        # Seuls les poids sont exportés: compile=False évite de résoudre la perte
+        # et les métriques personnalisées (cibles entières, training/losses.py)
+        model = tf.keras.models.load_model(h5_path, compile=False)
+        export_model(model, npz_path)
+        validate_export(model, NumpyModel.load(npz_path), model.input_shape[1:], max_value, tolerance=tolerance)
+
+
+# Fonction pour vérifier l'export de modèles entraînés avec des cibles entières
+def test_export(n_draws=300, sequence_length=10, seed=42):
+    """
+    Entraînement bref des deux LSTM avec sparse_targets=True, export dans un
+    interpréteur neuf (sans training.losses importé), puis comparaison des
+    sorties Keras et NumPy
+    """
+    import subprocess
+    import tempfile
+    import pandas as pd
+    from training.lstm_numbers_model import LSTMNumbersModel
+    from training.lstm_stars_model import LSTMStarsModel
+
+    rng = np.random.default_rng(seed)
+    numbers = np.sort(rng.random((n_draws, 50)).argsort(axis=1)[:, :5] + 1, axis=1)
+    stars = np.sort(rng.random((n_draws, 12)).argsort(axis=1)[:, :2] + 1, axis=1)
+    columns = ['numero1', 'numero2', 'numero3', 'numero4', 'numero5', 'etoile1', 'etoile2']
+    data = pd.DataFrame(np.hstack([numbers, stars]), columns=columns)
+
+    models_dir = tempfile.mkdtemp()
+    models = {}
+    for name, cls in [('lstm_numbers_model', LSTMNumbersModel), ('lstm_stars_model', LSTMStarsModel)]:
+        model = cls(sequence_length=sequence_length, epochs=1, sparse_targets=True)
+        model._build_model()
+        X_train, y_train, _, _ = model._prepare_data(data)
+        model.model.fit(X_train, y_train, epochs=1, batch_size=64, verbose=0)
+        model.model.save(os.path.join(models_dir, f"{name}.h5"))
+        models[name] = model.model
+
+    subprocess.run([sys.executable, os.path.abspath(__file__), models_dir], check=True)
+
+    for name, max_value in [('lstm_numbers_model', 50), ('lstm_stars_model', 12)]:
+        model = models[name]
+        validate_export(model, NumpyModel.load(os.path.join(models_dir, f"{name}.npz")),
+                        model.input_shape[1:], max_value)
+
+    logger.info("Export des modèles à cibles entières vérifié")
+    return models_dir
+
+
+# Export des modèles entraînés: python export_numpy.py [répertoire des modèles]
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == '--test':
+        test_export()
+    else:
+        export_models(sys.argv[1] if len(sys.argv) > 1 else None)
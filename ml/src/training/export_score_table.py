@@ -0,0 +1,122 @@
+import numpy as np
+import os
+import sys
+import time
+
+# Ajout du répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import DATA_DIR, MODELS_DIR, logger
+from prediction.score_table import ScoreTable
+from preprocessing.draw_store import DrawStore, history_fingerprint
+from training.exact_search import ExactSearch, combination_set
+from training.genetic_algorithm import GeneticAlgorithm
+
+# Écart maximal toléré entre la fitness reconstituée et celle du GA
+DEFAULT_TOLERANCE = 1e-9
+
+
+def compute_scores(ga, chunk_size=250_000):
+    """
+    Scores partiels de tous les ensembles de numéros et de toutes les paires d'étoiles
+
+    Args:
+        ga (GeneticAlgorithm): Algorithme génétique dont l'historique est chargé
+        chunk_size (int): Nombre d'ensembles de numéros évalués par bloc
+
+    Returns:
+        tuple: (scores des numéros, scores des étoiles), en ordre lexicographique
+    """
+    search = ExactSearch(ga, chunk_size=chunk_size)
+    n_number_sets = len(combination_set(ga.num_numbers, ga.numbers_to_draw))
+    number_scores = np.empty(n_number_sets, dtype=np.float64)
+    for start in range(0, n_number_sets, chunk_size):
+        number_scores[start:start + chunk_size] = search.number_scores(start, start + chunk_size)
+    star_scores = search.star_scores(combination_set(ga.num_stars, ga.stars_to_draw))
+    return number_scores, star_scores
+
+
+def fitness_offset(ga, number_scores, star_scores, n_samples=1000, seed=0, tolerance=DEFAULT_TOLERANCE):
+    """
+    Constante reliant la somme des scores partiels à la fitness du GA,
+    vérifiée sur des grilles tirées au hasard
+
+    Returns:
+        float: Constante à ajouter aux scores partiels
+    """
+    rng = np.random.default_rng(seed)
+    number_sets = combination_set(ga.num_numbers, ga.numbers_to_draw)
+    star_pairs = combination_set(ga.num_stars, ga.stars_to_draw)
+    number_index = rng.integers(len(number_sets), size=n_samples)
+    star_index = rng.integers(len(star_pairs), size=n_samples)
+
+    fitness = ga._score_population(np.hstack([number_sets[number_index], star_pairs[star_index]]))
+    offsets = fitness - (number_scores[number_index] + star_scores[star_index])
+    offset = float(np.median(offsets))
+    deviation = float(np.abs(offsets - offset).max())
+    if deviation > tolerance:
+        raise ValueError(f"Fitness non séparable: écart de {deviation:.3g} avec la table des scores")
+    return offset
+
+
+def export_score_table(history_path=None, table_path=None):
+    """
+    Calcul et enregistrement de la table des scores pour l'historique courant
+
+    Args:
+        history_path (str, optional): Fichier de tirages binaire.
+            Par défaut data/euromillions_history.draws.
+        table_path (str, optional): Fichier de sortie. Par défaut models/score_table.scores.
+
+    Returns:
+        ScoreTable: Table enregistrée
+    """
+    history_path = history_path or os.path.join(DATA_DIR, 'euromillions_history.draws')
+    table_path = table_path or os.path.join(MODELS_DIR, 'score_table.scores')
+
+    start = time.perf_counter()
+    store = DrawStore.open(history_path)
+    ga = GeneticAlgorithm(engine='exact')
+    ga.load_historical_data(store)
+
+    number_scores, star_scores = compute_scores(ga)
+    offset = fitness_offset(ga, number_scores, star_scores)
+    table = ScoreTable.write(table_path, number_scores, star_scores, offset, len(store),
+                             history_fingerprint(store.numbers, store.stars),
+                             ga.num_numbers, ga.num_stars, ga.numbers_to_draw, ga.stars_to_draw)
+
+    logger.info(f"Table des scores calculée en {time.perf_counter() - start:.1f} s")
+    return table
+
+
+# Vérification sur un historique synthétique: fitness et rangs comparés au GA
+def test_export_score_table(n_draws=500, seed=42):
+    import tempfile
+
+    rng = np.random.default_rng(seed)
+    numbers = np.sort(rng.random((n_draws, 50)).argsort(axis=1)[:, :5] + 1, axis=1)
+    stars = np.sort(rng.random((n_draws, 12)).argsort(axis=1)[:, :2] + 1, axis=1)
+    directory = tempfile.mkdtemp()
+    store = DrawStore.write(os.path.join(directory, 'history.draws'), numbers, stars)
+    table = export_score_table(store.path, os.path.join(directory, 'history.scores'))
+
+    ga = GeneticAlgorithm(engine='exact')
+    ga.load_historical_data(store)
+    best = ga.generate_combinations(num_combinations=3, verbose=False)
+    for position, combination in enumerate(best, start=1):
+        result = table.lookup(combination['numbers'], combination['stars'])
+        assert result['rank'] == position, (result['rank'], position)
+        assert abs(result['fitness'] - combination['fitness']) <= DEFAULT_TOLERANCE
+
+    assert table.matches(history_fingerprint(numbers, stars))
+    worst = table.lookup([1, 2, 3, 4, 5], [1, 2])
+    logger.info(f"Table des scores vérifiée: meilleure grille au rang 1, "
+                f"{worst['numbers']} + {worst['stars']} au percentile {worst['percentile']}")
+    return table
+
+
+# Job hors ligne: python export_score_table.py [tirages.draws] [sortie.scores]
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == '--test':
+        test_export_score_table()
+    else:
+        export_score_table(*sys.argv[1:3])
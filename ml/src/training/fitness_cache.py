@@ -0,0 +1,112 @@
+import numpy as np
+import os
+import sys
+
+# Ajout du répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import logger
+
+
+class FitnessCache:
+    """
+    Cache borné des scores de fitness des combinaisons déjà évaluées
+
+    Les entrées sont indexées par la clé entière canonique de la combinaison
+    (voir combination_masks.combination_keys) et appartiennent à une version
+    de l'historique: `reset()` avec une nouvelle version vide le cache, les
+    scores dépendant des fréquences et des tirages chargés. Une fois plein,
+    les entrées les plus anciennes sont évincées.
+    """
+
+    def __init__(self, max_entries=100_000):
+        """
+        Initialisation du cache
+
+        Args:
+            max_entries (int): Nombre maximal d'entrées (0 = cache désactivé)
+        """
+        self.max_entries = max_entries
+        self.version = None
+        self._entries = {}
+
+        # Compteurs exposés pour le suivi
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0
+
+    def reset(self, version):
+        """
+        Invalidation de toutes les entrées pour une nouvelle version de l'historique
+
+        Args:
+            version (int): Version de l'historique
+        """
+        if self._entries:
+            logger.info(f"Cache de fitness invalidé ({len(self._entries)} entrées, version {version})")
+        self._entries.clear()
+        self.version = version
+
+    def lookup(self, keys):
+        """
+        Lecture des scores connus
+
+        Args:
+            keys (array): Clés canoniques (uint64), sans doublon
+
+        Returns:
+            tuple: (scores float64, NaN pour les clés absentes; masque des clés trouvées)
+        """
+        get = self._entries.get
+        scores = np.array([get(key, np.nan) for key in keys.tolist()], dtype=np.float64)
+        found = ~np.isnan(scores)
+        return scores, found
+
+    def store(self, keys, scores):
+        """
+        Enregistrement de nouveaux scores, avec éviction des plus anciens
+
+        Args:
+            keys (array): Clés canoniques (uint64)
+            scores (array): Scores correspondants
+        """
+        if not self.enabled:
+            return
+        self._entries.update(zip(keys.tolist(), scores.tolist()))
+
+        overflow = len(self._entries) - self.max_entries
+        if overflow > 0:
+            for key in list(self._entries)[:overflow]:
+                del self._entries[key]
+            self.evictions += overflow
+
+    def record(self, hits, misses):
+        """
+        Mise à jour des compteurs (un individu servi sans évaluation = un succès)
+        """
+        self.hits += hits
+        self.misses += misses
+
+    def stats(self):
+        """
+        Compteurs du cache
+
+        Returns:
+            dict: Taille, succès, échecs, évictions et taux de succès
+        """
+        requests = self.hits + self.misses
+        return {
+            'version': self.version,
+            'size': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_ratio': round(self.hits / requests, 4) if requests else 0.0
+        }
@@ -0,0 +1,183 @@
+import json
+import numpy as np
+import os
+import struct
+import sys
+import tempfile
+import zipfile
+
+# Ajout du répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import logger
+
+# Version du format de l'artefact .npz de l'algorithme génétique
+FORMAT_VERSION = 1
+
+# Tableaux de l'artefact: tables denses de la fitness et tirages en masques de bits
+ARTIFACT_ARRAYS = [
+    'number_frequency_table', 'star_frequency_table', 'pair_frequency_table',
+    'number_history_counts', 'star_history_counts', 'history_number_masks', 'history_star_masks'
+]
+
+# Paramètres de l'algorithme enregistrés dans l'en-tête
+ARTIFACT_PARAMS = ['population_size', 'generations', 'crossover_prob', 'mutation_prob', 'engine',
+                   'exact_originality']
+
+
+def save_artifact(ga, filepath):
+    """
+    Enregistrement de l'algorithme génétique et des tables dérivées de l'historique
+
+    Les tableaux sont stockés sans compression pour pouvoir être projetés
+    en mémoire au chargement (voir memmap_npz).
+
+    Args:
+        ga (GeneticAlgorithm): Algorithme génétique
+        filepath (str): Chemin du fichier .npz
+    """
+    header = {
+        'format_version': FORMAT_VERSION,
+        'params': {name: getattr(ga, name) for name in ARTIFACT_PARAMS},
+        'history_size': int(ga.history_size),
+        'history_fingerprint': ga.history_fingerprint.hex() if ga.history_fingerprint is not None else None
+    }
+    arrays = {}
+    if ga.number_frequency_table is not None:
+        arrays = {name: np.ascontiguousarray(getattr(ga, name)) for name in ARTIFACT_ARRAYS}
+
+    # Fichier temporaire unique dans le même répertoire, puis renommage atomique
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(filepath) or '.', suffix='.tmp.npz')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, header=np.array(json.dumps(header)), **arrays)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def memmap_npz(filepath):
+    """
+    Projection en mémoire des tableaux d'un .npz non compressé
+
+    np.load ignore mmap_mode pour les archives .npz: la position de chaque
+    tableau est lue dans l'en-tête local zip puis dans l'en-tête .npy.
+
+    Args:
+        filepath (str): Chemin du fichier .npz
+
+    Returns:
+        dict: Nom -> tableau en lecture seule (np.memmap, ou tableau chargé
+              pour un membre compressé ou vide)
+    """
+    arrays = {}
+    with zipfile.ZipFile(filepath) as archive, open(filepath, 'rb') as f:
+        for info in archive.infolist():
+            name = info.filename[:-len('.npy')] if info.filename.endswith('.npy') else info.filename
+            if info.compress_type != zipfile.ZIP_STORED:
+                with archive.open(info) as member:
+                    arrays[name] = np.lib.format.read_array(member, allow_pickle=False)
+                continue
+
+            # En-tête local: 30 octets, puis nom et champ supplémentaire
+            f.seek(info.header_offset + 26)
+            name_length, extra_length = struct.unpack('<HH', f.read(4))
+            f.seek(info.header_offset + 30 + name_length + extra_length)
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            if dtype.hasobject:
+                raise ValueError(f"Tableau d'objets non supporté dans {filepath}: {name}")
+
+            if int(np.prod(shape)) == 0:
+                arrays[name] = np.zeros(shape, dtype=dtype)
+            else:
+                arrays[name] = np.memmap(filepath, dtype=dtype, mode='r', offset=f.tell(), shape=shape,
+                                         order='F' if fortran_order else 'C')
+    return arrays
+
+
+def load_artifact(ga, filepath, mmap=True):
+    """
+    Chargement d'un artefact dans un algorithme génétique
+
+    Les tables denses et les masques de bits suffisent à la fitness
+    complète (rareté, équilibre, originalité, paires): aucun tirage source
+    n'est nécessaire.
+
+    Args:
+        ga (GeneticAlgorithm): Algorithme génétique à initialiser
+        filepath (str): Chemin du fichier .npz
+        mmap (bool): Projection en mémoire (sinon lecture complète)
+
+    Returns:
+        bool: True si l'artefact contient les tables de l'historique
+    """
+    if mmap:
+        arrays = memmap_npz(filepath)
+    else:
+        with np.load(filepath, allow_pickle=False) as archive:
+            arrays = {name: archive[name] for name in archive.files}
+
+    header = json.loads(str(arrays.pop('header')[()]))
+    if header['format_version'] != FORMAT_VERSION:
+        raise ValueError(f"Version de format non supportée: {header['format_version']}")
+
+    for name, value in header['params'].items():
+        setattr(ga, name, value)
+    if not arrays:
+        return False
+
+    for name in ARTIFACT_ARRAYS:
+        setattr(ga, name, arrays[name].view(np.ndarray))
+    ga.history_size = header['history_size']
+    ga.history_fingerprint = bytes.fromhex(header['history_fingerprint']) if header['history_fingerprint'] else None
+    return True
+
+
+# Fonction pour vérifier qu'un artefact restaure la fitness à l'identique
+def test_ga_artifact(n_draws=1000, seed=42):
+    """
+    Sauvegarde puis chargement (projeté et complet) dans un algorithme sans
+    historique: scores vectorisés et scalaires identiques au bit près
+    """
+    import tempfile
+    import pandas as pd
+    from training.genetic_algorithm import GeneticAlgorithm
+
+    rng = np.random.default_rng(seed)
+    numbers = np.sort(rng.random((n_draws, 50)).argsort(axis=1)[:, :5] + 1, axis=1)
+    stars = np.sort(rng.random((n_draws, 12)).argsort(axis=1)[:, :2] + 1, axis=1)
+    columns = ['numero1', 'numero2', 'numero3', 'numero4', 'numero5', 'etoile1', 'etoile2']
+    ga = GeneticAlgorithm(population_size=150, generations=20, engine='numpy', seed=seed)
+    ga.load_historical_data(pd.DataFrame(np.hstack([numbers, stars]), columns=columns))
+
+    path = os.path.join(tempfile.mkdtemp(), 'genetic_algorithm.npz')
+    ga.save(path)
+
+    population = np.hstack([np.sort(rng.random((500, 50)).argsort(axis=1)[:, :5] + 1, axis=1),
+                            np.sort(rng.random((500, 12)).argsort(axis=1)[:, :2] + 1, axis=1)])
+    expected = ga._score_population(population)
+    expected_scalar = [ga._evaluate_combination(ind.tolist())[0] for ind in population[:50]]
+
+    for mmap in [True, False]:
+        restored = GeneticAlgorithm(engine='deap')
+        load_artifact(restored, path, mmap=mmap)
+        restored._frequencies_from_tables()
+        assert restored.engine == 'numpy' and restored.population_size == 150
+        assert np.array_equal(restored._score_population(population), expected)
+        assert [restored._evaluate_combination(ind.tolist())[0] for ind in population[:50]] == expected_scalar
+
+    restored = GeneticAlgorithm()
+    restored.load(path)
+    restored.seed = seed
+    assert restored.generate_combinations(verbose=False) == ga.generate_combinations(verbose=False)
+
+    logger.info(f"Artefact du GA vérifié: {os.path.getsize(path)} octets, {ga.history_size} tirages")
+    return path
+
+
+if __name__ == "__main__":
+    test_ga_artifact()
@@ -10,13 +10,29 @@ import pickle
 # Ajout du répertoire parent au path pour les imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import ROOT_DIR, DATA_DIR, MODELS_DIR, logger
+from preprocessing.draw_store import DrawStore, history_fingerprint
+from training.combination_masks import (
+    combination_keys, encode_draws, originality, originality_from_totals, population_originality
+)
+from training.fitness_cache import FitnessCache
+from training.numpy_engine import NumpyGeneticEngine
+from training.island_model import run_islands
+from training.early_stopping import EarlyStopping, STOP_EXHAUSTIVE
+from training.exact_search import ExactSearch
+from training.elite_archive import EliteArchive, elite_archive_path
+from training.ga_artifact import load_artifact, save_artifact
+
+# Moteurs d'évolution disponibles
+ENGINES = ('deap', 'numpy', 'exact')
 
 class GeneticAlgorithm:
     """
     Algorithme génétique pour générer des combinaisons EuroMillions rares mais plausibles
     """
     
-    def __init__(self, population_size=100, generations=50, crossover_prob=0.7, mutation_prob=0.2):
+    def __init__(self, population_size=100, generations=50, crossover_prob=0.7, mutation_prob=0.2,
+                 engine='deap', seed=None, fitness_cache_size=100_000, elite_archive=None,
+                 warm_start_fraction=0.25, exact_originality=True):
         """
         Initialisation de l'algorithme génétique
         
@@ -25,11 +41,27 @@ class GeneticAlgorithm:
             generations (int): Nombre de générations
             crossover_prob (float): Probabilité de croisement
             mutation_prob (float): Probabilité de mutation
+            engine (str): Moteur d'évolution, 'deap', 'numpy' (population uint8 vectorisée)
+                ou 'exact' (recherche exhaustive déterministe)
+            seed (int, optional): Graine du moteur NumPy
+            fitness_cache_size (int): Nombre de scores mémorisés (0 = cache désactivé)
+            elite_archive (EliteArchive, optional): Archive des élites des exécutions précédentes
+            warm_start_fraction (float): Part de la population initiale tirée de l'archive
+            exact_originality (bool): Originalité sommée tirage par tirage, identique au
+                bit près à l'évaluation d'origine (coût proportionnel à la taille de
+                l'historique); False: formule des totaux d'apparitions, en temps
+                constant, à l'arrondi près (environ 2e-13 pour un million de tirages)
         """
+        if engine not in ENGINES:
+            raise ValueError(f"Moteur inconnu: {engine}. Valeurs acceptées: {', '.join(ENGINES)}")
+        
         self.population_size = population_size
         self.generations = generations
         self.crossover_prob = crossover_prob
         self.mutation_prob = mutation_prob
+        self.engine = engine
+        self.seed = seed
+        self.exact_originality = exact_originality
         
         # Paramètres spécifiques à EuroMillions
         self.num_numbers = 50  # Numéros de 1 à 50
@@ -43,18 +75,46 @@ class GeneticAlgorithm:
         self.pair_frequencies = None
         self.historical_draws = None
         
+        # Tirages historiques sous forme de masques de bits (numéros, étoiles)
+        self.history_number_masks = None
+        self.history_star_masks = None
+        
+        # Tables denses pour l'évaluation d'une population entière (indexées par numéro/étoile)
+        self.number_frequency_table = None
+        self.star_frequency_table = None
+        self.pair_frequency_table = None
+        self.number_history_counts = None
+        self.star_history_counts = None
+        self.history_size = 0
+        
+        # Scores déjà calculés, valables pour une version de l'historique
+        self.history_version = 0
+        self.fitness_cache = FitnessCache(max_entries=fitness_cache_size)
+        self.fitness_cache.reset(self.history_version)
+        
+        # Élites des exécutions précédentes, par empreinte de l'historique
+        self.history_fingerprint = None
+        self.elite_archive = elite_archive
+        self.warm_start_fraction = warm_start_fraction
+        
+        # Compteurs et journal de la dernière exécution de generate_combinations
+        self.run_stats = None
+        self.logbook = None
+        
         # Configuration de l'algorithme génétique avec DEAP
         self._setup_genetic_algorithm()
         
-        logger.info(f"Algorithme génétique initialisé avec population_size={population_size}, generations={generations}")
+        logger.info(f"Algorithme génétique initialisé avec population_size={population_size}, generations={generations}, engine={engine}")
     
     def _setup_genetic_algorithm(self):
         """
         Configuration de l'algorithme génétique avec DEAP
         """
-        # Création des types pour l'algorithme génétique
-        creator.create("FitnessMax", base.Fitness, weights=(1.0,))
-        creator.create("Individual", list, fitness=creator.FitnessMax)
+        # Création des types pour l'algorithme génétique (une seule fois par processus)
+        if not hasattr(creator, "FitnessMax"):
+            creator.create("FitnessMax", base.Fitness, weights=(1.0,))
+        if not hasattr(creator, "Individual"):
+            creator.create("Individual", list, fitness=creator.FitnessMax)
         
         # Initialisation de la toolbox
         self.toolbox = base.Toolbox()
@@ -78,6 +138,8 @@ class GeneticAlgorithm:
         
         # Enregistrement des opérateurs génétiques
         self.toolbox.register("evaluate", self._evaluate_combination)
+        # eaSimple évalue les individus via toolbox.map: évaluation par lot
+        self.toolbox.register("map", self._map_evaluate)
         self.toolbox.register("mate", self._custom_crossover)
         self.toolbox.register("mutate", self._custom_mutation)
         self.toolbox.register("select", tools.selTournament, tournsize=3)
@@ -125,24 +187,22 @@ class GeneticAlgorithm:
         score += 0.2 * balance_score
         
         # 3. Originalité par rapport aux tirages historiques
-        if self.historical_draws is not None:
-            # Calcul de la similarité avec les tirages historiques
-            similarities = []
-            for draw in self.historical_draws:
-                # Nombre de numéros communs
-                common_numbers = len(set(numbers).intersection(set(draw[:self.numbers_to_draw])))
-                # Nombre d'étoiles communes
-                common_stars = len(set(stars).intersection(set(draw[self.numbers_to_draw:])))
-                
-                # Similarité normalisée (0 = totalement différent, 1 = identique)
-                similarity = (common_numbers / self.numbers_to_draw + common_stars / self.stars_to_draw) / 2
-                similarities.append(similarity)
+        if self.history_number_masks is not None and not self.exact_originality:
+            # Formule des totaux d'apparitions (même calcul que l'évaluation vectorisée)
+            combination_originality = originality_from_totals(
+                int(self.number_history_counts[numbers].sum()), int(self.star_history_counts[stars].sum()),
+                self.history_size, self.numbers_to_draw, self.stars_to_draw
+            )
             
-            # Originalité = 1 - similarité moyenne
-            originality = 1.0 - sum(similarities) / len(similarities) if similarities else 0.5
+            # Contribution au score (30%)
+            score += 0.3 * combination_originality
+        elif self.history_number_masks is not None:
+            # Originalité = 1 - similarité moyenne, les éléments communs avec
+            # chaque tirage étant comptés par popcount sur les masques de bits
+            combination_originality = originality(numbers, stars, self.history_number_masks, self.history_star_masks)
             
             # Contribution au score (30%)
-            score += 0.3 * originality
+            score += 0.3 * combination_originality
         else:
             # Si pas de données historiques, score aléatoire
             score += 0.3 * random.random()
@@ -169,6 +229,190 @@ class GeneticAlgorithm:
         
         return (score,)
     
+    @staticmethod
+    def _sequential_sum(terms):
+        """
+        Somme des colonnes de gauche à droite, dans l'ordre de sum() sur une ligne
+        """
+        total = terms[:, 0].copy()
+        for column in range(1, terms.shape[1]):
+            total = total + terms[:, column]
+        return total
+    
+    def evaluate_population(self, population):
+        """
+        Évaluation d'une population entière, avec mémorisation des scores
+        
+        Les combinaisons identiques (dans la population ou déjà vues depuis le
+        chargement de l'historique) ne sont évaluées qu'une fois; les scores
+        restent identiques à ceux de `_score_population`.
+        
+        Args:
+            population (array): Combinaisons, forme (taille, 7)
+            
+        Returns:
+            array: Scores de fitness (float64)
+        """
+        if self.number_frequency_table is None:
+            return self._score_population(population)
+        if not self.fitness_cache.enabled:
+            scores = self._score_population(population)
+            self.fitness_cache.record(hits=0, misses=len(scores))
+            return scores
+        
+        population = np.asarray(population, dtype=np.uint8).reshape(-1, self.numbers_to_draw + self.stars_to_draw)
+        keys, first, inverse = np.unique(combination_keys(population, self.numbers_to_draw),
+                                         return_index=True, return_inverse=True)
+        
+        scores, found = self.fitness_cache.lookup(keys)
+        missing = np.flatnonzero(~found)
+        if len(missing):
+            scores[missing] = self._score_population(population[first[missing]])
+            self.fitness_cache.store(keys[missing], scores[missing])
+        
+        self.fitness_cache.record(hits=len(population) - len(missing), misses=len(missing))
+        return scores[inverse.reshape(-1)]
+    
+    def _score_population(self, population):
+        """
+        Évaluation vectorisée d'une population entière
+        
+        Chaque terme de `_evaluate_combination` est calculé par indexation de
+        tables denses, avec les mêmes opérations flottantes dans le même ordre:
+        les scores sont identiques au bit près à ceux de l'évaluation scalaire.
+        L'originalité compte les éléments communs avec chaque tirage par
+        popcount sur les masques, puis somme les similarités tirage par tirage:
+        ce terme coûte O(population x tirages) et domine sur un long historique.
+        Avec exact_originality=False, il découle des totaux d'apparitions par
+        numéro et par étoile (O(population)), à l'arrondi près de la somme exacte.
+        
+        Args:
+            population (array): Combinaisons, forme (taille, 7)
+            
+        Returns:
+            array: Scores de fitness (float64)
+        """
+        if self.number_frequency_table is None:
+            # Sans données historiques, les termes sont aléatoires: évaluation scalaire
+            return np.array([self._evaluate_combination(ind)[0] for ind in population], dtype=np.float64)
+        
+        population = np.asarray(population, dtype=np.intp).reshape(-1, self.numbers_to_draw + self.stars_to_draw)
+        numbers = population[:, :self.numbers_to_draw]
+        stars = population[:, self.numbers_to_draw:]
+        
+        # 1. Rareté relative des numéros et étoiles
+        number_rarity = self._sequential_sum(1.0 - self.number_frequency_table[numbers]) / self.numbers_to_draw
+        star_rarity = self._sequential_sum(1.0 - self.star_frequency_table[stars]) / self.stars_to_draw
+        score = 0.3 * (number_rarity + star_rarity) / 2
+        
+        # 2. Équilibre entre numéros bas (1-25) et hauts (26-50)
+        low_numbers = np.count_nonzero(numbers <= 25, axis=1)
+        balance_score = 1.0 - np.abs((low_numbers / self.numbers_to_draw) - 0.5) * 2
+        score = score + 0.2 * balance_score
+        
+        # 3. Originalité: somme exacte tirage par tirage, ou totaux d'apparitions
+        if self.exact_originality:
+            number_masks, star_masks = encode_draws(population, self.numbers_to_draw)
+            combination_originality = population_originality(
+                number_masks, star_masks, self.history_number_masks, self.history_star_masks,
+                self.numbers_to_draw, self.stars_to_draw
+            )
+        else:
+            combination_originality = originality_from_totals(
+                self.number_history_counts[numbers].sum(axis=1), self.star_history_counts[stars].sum(axis=1),
+                self.history_size, self.numbers_to_draw, self.stars_to_draw
+            )
+        score = score + 0.3 * combination_originality
+        
+        # 4. Plausibilité des paires (même ordre i < j que l'évaluation scalaire)
+        i, j = np.triu_indices(self.numbers_to_draw, k=1)
+        pair_scores = self.pair_frequency_table[numbers[:, i], numbers[:, j]]
+        avg_pair_score = self._sequential_sum(pair_scores) / len(i)
+        score = score + 0.2 * avg_pair_score
+        
+        return score
+    
+    def _map_evaluate(self, func, individuals):
+        """
+        Remplacement de map() pour DEAP: les évaluations passent par evaluate_population
+        """
+        if func is not self.toolbox.evaluate:
+            return map(func, individuals)
+        
+        individuals = list(individuals)
+        if not individuals:
+            return []
+        return [(score,) for score in self.evaluate_population(individuals).tolist()]
+    
+    def _build_fitness_tables(self, number_counts, star_counts):
+        """
+        Construction des tables denses utilisées par evaluate_population
+        
+        Args:
+            number_counts (dict): Apparitions de chaque numéro dans l'historique
+            star_counts (dict): Apparitions de chaque étoile dans l'historique
+        """
+        # Valeurs par défaut identiques aux .get() de l'évaluation scalaire
+        self.number_frequency_table = np.full(self.num_numbers + 1, 0.5)
+        for num, frequency in self.number_frequencies.items():
+            self.number_frequency_table[num] = frequency
+        
+        self.star_frequency_table = np.full(self.num_stars + 1, 0.5)
+        for star, frequency in self.star_frequencies.items():
+            self.star_frequency_table[star] = frequency
+        
+        self.pair_frequency_table = np.full((self.num_numbers + 1, self.num_numbers + 1), 0.1)
+        for (a, b), frequency in self.pair_frequencies.items():
+            self.pair_frequency_table[a, b] = self.pair_frequency_table[b, a] = frequency
+        
+        self.number_history_counts = np.zeros(self.num_numbers + 1, dtype=np.int64)
+        for num, count in number_counts.items():
+            self.number_history_counts[num] = count
+        
+        self.star_history_counts = np.zeros(self.num_stars + 1, dtype=np.int64)
+        for star, count in star_counts.items():
+            self.star_history_counts[star] = count
+    
+    def fitness_tables(self):
+        """
+        Tables denses de la fitness, transmissibles à un autre processus
+        
+        Returns:
+            dict: Tables NumPy, taille et version de l'historique
+        """
+        return {
+            'number_frequency_table': self.number_frequency_table,
+            'star_frequency_table': self.star_frequency_table,
+            'pair_frequency_table': self.pair_frequency_table,
+            'number_history_counts': self.number_history_counts,
+            'star_history_counts': self.star_history_counts,
+            'history_number_masks': self.history_number_masks,
+            'history_star_masks': self.history_star_masks,
+            'history_size': self.history_size,
+            'history_version': self.history_version,
+            'history_fingerprint': self.history_fingerprint
+        }
+    
+    def load_fitness_tables(self, tables):
+        """
+        Chargement des tables produites par fitness_tables() (masques des tirages
+        inclus, sans le DataFrame de l'historique)
+        
+        Args:
+            tables (dict): Tables de la fitness
+        """
+        self.number_frequency_table = tables['number_frequency_table']
+        self.star_frequency_table = tables['star_frequency_table']
+        self.pair_frequency_table = tables['pair_frequency_table']
+        self.number_history_counts = tables['number_history_counts']
+        self.star_history_counts = tables['star_history_counts']
+        self.history_number_masks = tables['history_number_masks']
+        self.history_star_masks = tables['history_star_masks']
+        self.history_size = tables['history_size']
+        self.history_version = tables['history_version']
+        self.history_fingerprint = tables.get('history_fingerprint')
+        self.fitness_cache.reset(self.history_version)
+    
     def _custom_crossover(self, ind1, ind2):
         """
         Opérateur de croisement personnalisé pour les combinaisons EuroMillions
@@ -180,8 +424,8 @@ class GeneticAlgorithm:
         Returns:
             tuple: Deux enfants (offspring)
         """
-        # Copie des parents
-        child1, child2 = list(ind1), list(ind2)
+        # Copie des parents (individus DEAP, dont la fitness sera recalculée)
+        child1, child2 = creator.Individual(ind1), creator.Individual(ind2)
         
         # Croisement des numéros (indices 0-4)
         if random.random() < self.crossover_prob:
@@ -299,14 +543,23 @@ class GeneticAlgorithm:
         Chargement des données historiques pour l'évaluation
         
         Args:
-            data (DataFrame): DataFrame contenant les tirages historiques
+            data (DataFrame or DrawStore): Tirages historiques (DataFrame ou fichier binaire)
         """
-        # Extraction des tirages
-        numbers_cols = [f'numero{i}' for i in range(1, self.numbers_to_draw + 1)]
-        stars_cols = [f'etoile{i}' for i in range(1, self.stars_to_draw + 1)]
+        if isinstance(data, DrawStore):
+            # Fichier binaire: numéros et étoiles déjà dans l'ordre attendu
+            self.historical_draws = data.draws().tolist()
+        else:
+            # Extraction des tirages
+            numbers_cols = [f'numero{i}' for i in range(1, self.numbers_to_draw + 1)]
+            stars_cols = [f'etoile{i}' for i in range(1, self.stars_to_draw + 1)]
+            
+            # Conversion en liste de listes
+            self.historical_draws = data[numbers_cols + stars_cols].values.tolist()
         
-        # Conversion en liste de listes
-        self.historical_draws = data[numbers_cols + stars_cols].values.tolist()
+        # Masques de bits des tirages pour le calcul vectorisé de l'originalité
+        draws = np.asarray(self.historical_draws, dtype=np.int64).reshape(-1, self.numbers_to_draw + self.stars_to_draw)
+        self.history_number_masks, self.history_star_masks = encode_draws(draws, self.numbers_to_draw)
+        self.history_fingerprint = history_fingerprint(draws[:, :self.numbers_to_draw], draws[:, self.numbers_to_draw:])
         
         # Calcul des fréquences des numéros
         number_counts = {}
@@ -340,20 +593,71 @@ class GeneticAlgorithm:
         max_pair_count = max(pair_counts.values()) if pair_counts else 1
         self.pair_frequencies = {pair: count / max_pair_count for pair, count in pair_counts.items()}
         
+        # Tables denses pour l'évaluation vectorisée
+        self.history_size = total_draws
+        self._build_fitness_tables(number_counts, star_counts)
+        
+        # Nouvelle version de l'historique: les scores mémorisés ne sont plus valables
+        self.history_version += 1
+        self.fitness_cache.reset(self.history_version)
+        
         logger.info(f"Données historiques chargées: {len(self.historical_draws)} tirages")
     
-    def generate_combinations(self, num_combinations=5):
+    def generate_combinations(self, num_combinations=5, time_budget=None, patience=None, verbose=True):
         """
         Génération de combinaisons optimisées avec l'algorithme génétique
         
+        L'exécution peut s'arrêter avant self.generations générations, sur
+        budget de temps ou stagnation; le résultat est alors le panthéon des
+        meilleures combinaisons distinctes rencontrées jusque-là. Les
+        générations effectuées, les évaluations et la raison d'arrêt sont
+        consignées dans self.run_stats.
+        
+        Avec une archive des élites, une part de la population initiale
+        (warm_start_fraction) reprend les meilleures combinaisons des
+        exécutions précédentes sur le même historique, et le panthéon de
+        l'exécution est ensuite versé dans l'archive.
+        
         Args:
             num_combinations (int): Nombre de combinaisons à générer
+            time_budget (float, optional): Budget de temps en secondes
+            patience (int, optional): Générations sans amélioration de la
+                meilleure fitness ni de la moyenne avant l'arrêt
+            verbose (bool): Affichage du journal de chaque génération (moteur DEAP)
             
         Returns:
             list: Liste des meilleures combinaisons générées
         """
-        # Création de la population initiale
-        pop = self.toolbox.population(n=self.population_size)
+        cache_hits, cache_misses = self.fitness_cache.hits, self.fitness_cache.misses
+        stopping = EarlyStopping(time_budget=time_budget, patience=patience)
+        
+        # Élites archivées: amorce de la population et taille du panthéon versé dans l'archive
+        seeds = self._warm_start_seeds()
+        hall_size = max(num_combinations, self._warm_start_size())
+        
+        if self.engine == 'exact':
+            # Recherche exhaustive: ni budget de temps ni stagnation
+            search = ExactSearch(self)
+            best_combinations = search.run(num_combinations)
+            stopping.reason = STOP_EXHAUSTIVE
+            self._record_run_stats(cache_hits, cache_misses, 0, stopping, best_combinations)
+            self.run_stats['evaluations'] = search.evaluations
+            self._archive_elites(best_combinations, 0)
+            logger.info(f"Génération de {num_combinations} combinaisons terminée")
+            return best_combinations
+        
+        if self.engine == 'numpy':
+            engine = NumpyGeneticEngine(self, seed=self.seed)
+            hall_of_fame = engine.run(hall_size, stopping=stopping, seeds=seeds)
+            best_combinations = hall_of_fame[:num_combinations]
+            self._record_run_stats(cache_hits, cache_misses, engine.generations_run, stopping, best_combinations)
+            self._archive_elites(hall_of_fame, len(seeds))
+            logger.info(f"Génération de {num_combinations} combinaisons terminée")
+            return best_combinations
+        
+        # Création de la population initiale (élites archivées, puis individus aléatoires)
+        pop = [creator.Individual(seed) for seed in seeds.tolist()]
+        pop += self.toolbox.population(n=self.population_size - len(pop))
         
         # Statistiques à suivre
         stats = tools.Statistics(lambda ind: ind.fitness.values)
@@ -361,22 +665,40 @@ class GeneticAlgorithm:
         stats.register("min", np.min)
         stats.register("max", np.max)
         
-        # Exécution de l'algorithme génétique
-        pop, logbook = algorithms.eaSimple(
-            pop, self.toolbox, 
-            cxpb=self.crossover_prob, 
-            mutpb=self.mutation_prob, 
-            ngen=self.generations, 
-            stats=stats, 
-            verbose=True
-        )
+        # Panthéon: meilleures combinaisons distinctes de toutes les générations
+        hall_of_fame = tools.HallOfFame(hall_size)
+        logbook = tools.Logbook()
+        logbook.header = ['gen', 'nevals'] + stats.fields
+        
+        # Boucle de algorithms.eaSimple, interrompue par les critères d'arrêt
+        generations_run = 0
+        for gen in range(self.generations + 1):
+            if gen > 0:
+                if stopping.reason is not None:
+                    break
+                offspring = self.toolbox.select(pop, len(pop))
+                pop = algorithms.varAnd(offspring, self.toolbox, self.crossover_prob, self.mutation_prob)
+            
+            # Évaluation des individus modifiés
+            invalid_ind = [ind for ind in pop if not ind.fitness.valid]
+            for ind, fit in zip(invalid_ind, self.toolbox.map(self.toolbox.evaluate, invalid_ind)):
+                ind.fitness.values = fit
+            hall_of_fame.update(pop)
+            
+            record = stats.compile(pop)
+            logbook.record(gen=gen, nevals=len(invalid_ind), **record)
+            if verbose:
+                print(logbook.stream)
+            
+            if gen > 0:
+                generations_run = gen
+                stopping.update(float(record['max']), float(record['avg']))
         
-        # Tri de la population finale par fitness
-        pop.sort(key=lambda x: x.fitness.values[0], reverse=True)
+        self.logbook = logbook
         
         # Sélection des meilleures combinaisons
         best_combinations = []
-        for ind in pop[:num_combinations]:
+        for ind in hall_of_fame:
             numbers = ind[:self.numbers_to_draw]
             stars = ind[self.numbers_to_draw:]
             fitness = ind.fitness.values[0]
@@ -386,9 +708,105 @@ class GeneticAlgorithm:
                 'fitness': fitness
             })
         
+        hall_of_fame_combinations = best_combinations
+        best_combinations = hall_of_fame_combinations[:num_combinations]
+        self._record_run_stats(cache_hits, cache_misses, generations_run, stopping, best_combinations)
+        self._archive_elites(hall_of_fame_combinations, len(seeds))
         logger.info(f"Génération de {num_combinations} combinaisons terminée")
         return best_combinations
     
+    def generate_combinations_parallel(self, num_combinations=5, n_islands=4, n_workers=None,
+                                       migration_interval=10, n_migrants=2, seeds=None, time_budget=None):
+        """
+        Génération de combinaisons par un modèle en îles sur plusieurs cœurs
+        
+        Args:
+            num_combinations (int): Nombre de combinaisons à générer
+            n_islands (int): Nombre d'îles (une population chacune)
+            n_workers (int, optional): Nombre de processus
+            migration_interval (int): Générations entre deux migrations des élites
+            n_migrants (int): Nombre d'élites migrant d'une île à la suivante
+            seeds (list, optional): Graine de chaque île
+            time_budget (float, optional): Budget de temps en secondes
+            
+        Returns:
+            list: Meilleures combinaisons de toutes les îles, sans doublon
+        """
+        combinations, self.run_stats = run_islands(
+            self, num_combinations, n_islands=n_islands, n_workers=n_workers,
+            migration_interval=migration_interval, n_migrants=n_migrants, seeds=seeds,
+            time_budget=time_budget
+        )
+        self.run_stats['engine'] = 'islands'
+        logger.info(f"Génération de {num_combinations} combinaisons terminée")
+        return combinations
+    
+    def _warm_start_size(self):
+        """
+        Nombre d'élites reprises de l'archive (0 sans archive)
+        """
+        if self.elite_archive is None or self.history_fingerprint is None:
+            return 0
+        return int(self.population_size * self.warm_start_fraction)
+    
+    def _warm_start_seeds(self):
+        """
+        Élites archivées pour l'historique courant, en tête de la population initiale
+        
+        Returns:
+            array: Combinaisons uint8 (n, 7), vide sans archive
+        """
+        size = self._warm_start_size()
+        if size <= 0:
+            return np.zeros((0, self.numbers_to_draw + self.stars_to_draw), dtype=np.uint8)
+        return self.elite_archive.elites(self.history_fingerprint, size)[0]
+    
+    def _archive_elites(self, combinations, n_seeds):
+        """
+        Versement du panthéon d'une exécution dans l'archive des élites
+        
+        Args:
+            combinations (list): Combinaisons au format de generate_combinations()
+            n_seeds (int): Élites archivées utilisées dans la population initiale
+        """
+        self.run_stats['warm_start'] = n_seeds
+        if self.elite_archive is None or self.history_fingerprint is None or not combinations:
+            return
+        
+        population = np.array([c['numbers'] + c['stars'] for c in combinations], dtype=np.uint8)
+        fitness = np.array([c['fitness'] for c in combinations], dtype=np.float64)
+        archived = self.elite_archive.update(self.history_fingerprint, population, fitness, self.numbers_to_draw)
+        self.run_stats['archived_elites'] = archived
+        logger.info(f"Archive des élites: {n_seeds} élites reprises, {archived} archivées pour cet historique")
+    
+    def _record_run_stats(self, cache_hits, cache_misses, generations_run, stopping, best_combinations):
+        """
+        Compteurs d'une exécution (écart avec les compteurs du cache au départ)
+        
+        Args:
+            cache_hits (int): Succès du cache avant l'exécution
+            cache_misses (int): Échecs du cache avant l'exécution
+            generations_run (int): Générations effectuées
+            stopping (EarlyStopping): Critères d'arrêt de l'exécution
+            best_combinations (list): Combinaisons retournées
+        """
+        hits = self.fitness_cache.hits - cache_hits
+        misses = self.fitness_cache.misses - cache_misses
+        self.run_stats = {
+            'engine': self.engine,
+            'history_version': self.history_version,
+            'generations': generations_run,
+            'stop_reason': stopping.finish(),
+            'elapsed_s': round(stopping.elapsed(), 3),
+            'best_fitness': best_combinations[0]['fitness'] if best_combinations else None,
+            'fitness_requests': hits + misses,
+            'evaluations': misses,
+            'evaluations_saved': hits,
+            'hit_ratio': round(hits / (hits + misses), 4) if hits + misses else 0.0
+        }
+        logger.info(f"Cache de fitness: {hits} évaluations évitées sur {hits + misses} "
+                    f"(taux de succès {self.run_stats['hit_ratio']:.1%})")
+    
     def plot_evolution(self, logbook):
         """
         Visualisation de l'évolution de l'algorithme génétique
@@ -412,15 +830,45 @@ class GeneticAlgorithm:
         plt.savefig(os.path.join(MODELS_DIR, "genetic_evolution.png"))
         plt.close()
     
+    def _frequencies_from_tables(self):
+        """
+        Dictionnaires de fréquences de l'évaluation scalaire, reconstruits à
+        partir des tables denses (valeurs identiques pour toute combinaison)
+        """
+        numbers = np.flatnonzero(self.number_history_counts).tolist()
+        stars = np.flatnonzero(self.star_history_counts).tolist()
+        self.number_frequencies = {n: float(self.number_frequency_table[n]) for n in numbers}
+        self.star_frequencies = {s: float(self.star_frequency_table[s]) for s in stars}
+        
+        # Paires présentes dans l'historique: partie supérieure non nulle de la matrice
+        # (les absentes valent la valeur par défaut 0.1 des deux côtés)
+        a, b = np.nonzero(np.triu(self.pair_frequency_table != 0.1, k=1))
+        self.pair_frequencies = {
+            (i, j): float(self.pair_frequency_table[i, j]) for i, j in zip(a.tolist(), b.tolist())
+        }
+    
     def save(self, filepath=None):
         """
         Sauvegarde de l'algorithme génétique
         
+        Le format dépend de l'extension: .npz (artefact versionné avec les
+        tables de l'historique, voir training/ga_artifact.py) ou .pkl
+        (ancien format, fréquences seules).
+        
         Args:
             filepath (str, optional): Chemin pour la sauvegarde. Par défaut None.
         """
         if filepath is None:
-            filepath = os.path.join(MODELS_DIR, 'genetic_algorithm.pkl')
+            filepath = os.path.join(MODELS_DIR, 'genetic_algorithm.npz')
+        
+        # Archive des élites à côté de la sauvegarde
+        if self.elite_archive is not None:
+            self.elite_archive.save(elite_archive_path(filepath))
+        
+        if filepath.endswith('.npz'):
+            save_artifact(self, filepath)
+            logger.info(f"Algorithme génétique sauvegardé à {filepath}")
+            return
         
         # Sauvegarde des données
         data = {
@@ -430,7 +878,8 @@ class GeneticAlgorithm:
             'population_size': self.population_size,
             'generations': self.generations,
             'crossover_prob': self.crossover_prob,
-            'mutation_prob': self.mutation_prob
+            'mutation_prob': self.mutation_prob,
+            'engine': self.engine
         }
         
         with open(filepath, 'wb') as f:
@@ -442,15 +891,32 @@ class GeneticAlgorithm:
         """
         Chargement d'un algorithme génétique sauvegardé
         
+        Un artefact .npz est projeté en mémoire et restaure la fitness
+        complète et déterministe sans les tirages source; un ancien .pkl ne
+        contient que les fréquences.
+        
         Args:
             filepath (str, optional): Chemin de l'algorithme à charger. Par défaut None.
         """
         if filepath is None:
-            filepath = os.path.join(MODELS_DIR, 'genetic_algorithm.pkl')
+            filepath = os.path.join(MODELS_DIR, 'genetic_algorithm.npz')
         
         if not os.path.exists(filepath):
             raise FileNotFoundError(f"Le fichier {filepath} n'existe pas")
         
+        # Archive des élites à côté de la sauvegarde: enrichie en mémoire à chaque
+        # exécution, écrite uniquement par save()
+        self.elite_archive = EliteArchive.open(elite_archive_path(filepath))
+        
+        if filepath.endswith('.npz'):
+            if load_artifact(self, filepath):
+                self._frequencies_from_tables()
+                # Nouvelle version de l'historique: les scores mémorisés ne sont plus valables
+                self.history_version += 1
+                self.fitness_cache.reset(self.history_version)
+            logger.info(f"Algorithme génétique chargé depuis {filepath} ({self.history_size} tirages)")
+            return
+        
         with open(filepath, 'rb') as f:
             data = pickle.load(f)
         
@@ -462,6 +928,7 @@ class GeneticAlgorithm:
         self.generations = data['generations']
         self.crossover_prob = data['crossover_prob']
         self.mutation_prob = data['mutation_prob']
+        self.engine = data.get('engine', 'deap')
         
         logger.info(f"Algorithme génétique chargé depuis {filepath}")
 
@@ -506,6 +973,45 @@ def test_algorithm():
     
     return ga
 
+# Fonction pour vérifier l'évaluation vectorisée contre l'évaluation scalaire
+def test_population_evaluation(n_draws=1000, population_size=500, seed=42):
+    """
+    Comparaison au bit près de evaluate_population et _evaluate_combination
+    """
+    rng = np.random.default_rng(seed)
+    
+    # Historique réduit: certains numéros et étoiles ne sont jamais tirés
+    numbers = np.sort(rng.random((n_draws, 45)).argsort(axis=1)[:, :5] + 1, axis=1)
+    stars = np.sort(rng.random((n_draws, 11)).argsort(axis=1)[:, :2] + 1, axis=1)
+    columns = ['numero1', 'numero2', 'numero3', 'numero4', 'numero5', 'etoile1', 'etoile2']
+    df = pd.DataFrame(np.hstack([numbers, stars]), columns=columns)
+    
+    ga = GeneticAlgorithm(population_size=population_size, generations=1)
+    ga.load_historical_data(df)
+    
+    population = np.hstack([
+        np.sort(rng.random((population_size, 50)).argsort(axis=1)[:, :5] + 1, axis=1),
+        np.sort(rng.random((population_size, 12)).argsort(axis=1)[:, :2] + 1, axis=1)
+    ]).astype(np.uint8)
+    
+    expected = np.array([ga._evaluate_combination(ind.tolist())[0] for ind in population])
+    actual = ga.evaluate_population(population)
+    assert np.array_equal(expected, actual), np.max(np.abs(expected - actual))
+    
+    # Formule des totaux: identique entre les deux chemins, proche de la somme exacte
+    approximate = GeneticAlgorithm(population_size=population_size, generations=1, exact_originality=False)
+    approximate.load_historical_data(df)
+    approximate_expected = np.array([approximate._evaluate_combination(ind.tolist())[0] for ind in population])
+    approximate_actual = approximate.evaluate_population(population)
+    assert np.array_equal(approximate_expected, approximate_actual)
+    assert np.allclose(approximate_actual, actual, rtol=0, atol=1e-12)
+    
+    logger.info(f"Évaluation vectorisée vérifiée sur {population_size} combinaisons")
+    return actual
+
 if __name__ == "__main__":
     # Test de l'algorithme
     test_algorithm()
+    
+    # Évaluation vectorisée identique à l'évaluation scalaire
+    test_population_evaluation()
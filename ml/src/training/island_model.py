@@ -0,0 +1,257 @@
+import numpy as np
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Ajout du répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import logger
+from training.early_stopping import STOP_GENERATIONS, STOP_TIME_BUDGET
+from training.numpy_engine import NumpyGeneticEngine, to_combinations, top_unique
+
+# Algorithme génétique propre à chaque processus du pool (voir _init_worker)
+_worker_ga = None
+
+
+def _make_island_ga(params, tables):
+    """
+    Algorithme génétique d'évaluation reconstruit à partir des tables de fitness
+    """
+    from training.genetic_algorithm import GeneticAlgorithm
+
+    ga = GeneticAlgorithm(engine='numpy', **params)
+    ga.load_fitness_tables(tables)
+    return ga
+
+
+def _init_worker(params, tables):
+    """
+    Initialisation d'un processus du pool: les tables ne sont transmises qu'une fois
+    """
+    global _worker_ga
+    _worker_ga = _make_island_ga(params, tables)
+
+
+def _evolve(ga, population, fitness, rng, generations, hall_of_fame):
+    """
+    Évolution d'une île pendant une époque (entre deux migrations)
+
+    Le panthéon de l'île (meilleurs individus distincts rencontrés depuis le
+    début) est mis à jour à chaque génération, comme dans le moteur NumPy:
+    la sélection par tournoi n'étant pas élitiste, la meilleure combinaison
+    peut disparaître de la population.
+
+    Returns:
+        tuple: (population, fitness, générateur, évaluations demandées, panthéon)
+    """
+    engine = NumpyGeneticEngine(ga)
+    engine.rng = rng
+    size = len(hall_of_fame[0])
+    for _ in range(generations):
+        population, fitness = engine.step(population, fitness)
+        hall_of_fame = top_unique(np.vstack([hall_of_fame[0], population]),
+                                  np.concatenate([hall_of_fame[1], fitness]),
+                                  size, ga.numbers_to_draw)
+    return population, fitness, engine.rng, engine.evaluations, hall_of_fame
+
+
+def _evolve_in_worker(population, fitness, rng, generations, hall_of_fame):
+    return _evolve(_worker_ga, population, fitness, rng, generations, hall_of_fame)
+
+
+def migrate(populations, fitnesses, n_migrants):
+    """
+    Migration en anneau: les meilleurs individus de l'île i remplacent les pires de l'île i+1
+
+    Args:
+        populations (list): Populations des îles (modifiées sur place)
+        fitnesses (list): Fitness des îles (modifiées sur place)
+        n_migrants (int): Nombre d'individus migrants par île
+    """
+    n_islands = len(populations)
+    if n_islands < 2 or n_migrants <= 0:
+        return
+
+    elites = []
+    for population, fitness in zip(populations, fitnesses):
+        best = np.argsort(-fitness, kind='stable')[:n_migrants]
+        elites.append((population[best].copy(), fitness[best].copy()))
+
+    for i, (migrants, migrant_fitness) in enumerate(elites):
+        target = (i + 1) % n_islands
+        worst = np.argsort(fitnesses[target], kind='stable')[:len(migrants)]
+        populations[target][worst] = migrants
+        fitnesses[target][worst] = migrant_fitness
+
+
+def merge_islands(populations, fitnesses, num_combinations, numbers_to_draw=5):
+    """
+    Fusion des panthéons des îles en un classement unique, sans doublon
+
+    Args:
+        populations (list): Individus du panthéon de chaque île
+        fitnesses (list): Fitness correspondantes
+
+    Returns:
+        list: Combinaisons au format de GeneticAlgorithm.generate_combinations()
+    """
+    best = top_unique(np.vstack(populations), np.concatenate(fitnesses), num_combinations, numbers_to_draw)
+    return to_combinations(*best, numbers_to_draw)
+
+
+def run_islands(ga, num_combinations=5, n_islands=4, n_workers=None, migration_interval=10,
+                n_migrants=2, seeds=None, generations=None, time_budget=None):
+    """
+    Exécution du modèle en îles sur plusieurs processus
+
+    Chaque île fait évoluer sa propre population (moteur NumPy) à partir des
+    tables de fitness du GA. Toutes les `migration_interval` générations, les
+    îles sont synchronisées et leurs meilleurs individus migrent vers l'île
+    suivante. Le résultat fusionne les panthéons des îles (meilleurs
+    individus rencontrés à chaque génération). Avec `time_budget`, aucune
+    nouvelle époque n'est lancée une fois le budget écoulé.
+
+    Args:
+        ga (GeneticAlgorithm): Algorithme génétique dont l'historique est chargé
+        num_combinations (int): Nombre de combinaisons à retourner
+        n_islands (int): Nombre d'îles
+        n_workers (int, optional): Nombre de processus (par défaut min(îles, cœurs))
+        migration_interval (int): Générations entre deux migrations
+        n_migrants (int): Individus migrants par île
+        seeds (list, optional): Graine de chaque île (par défaut dérivées de ga.seed)
+        generations (int, optional): Générations par île (par défaut ga.generations)
+        time_budget (float, optional): Budget de temps en secondes
+
+    Returns:
+        tuple: (combinaisons, statistiques de l'exécution)
+    """
+    if ga.number_frequency_table is None:
+        raise ValueError("Les données historiques doivent être chargées avant l'exécution en îles")
+
+    generations = ga.generations if generations is None else generations
+    n_workers = n_workers or min(n_islands, os.cpu_count() or 1)
+    if seeds is None:
+        seeds = np.random.SeedSequence(ga.seed).spawn(n_islands)
+    if len(seeds) != n_islands:
+        raise ValueError(f"{len(seeds)} graines pour {n_islands} îles")
+
+    params = {
+        'population_size': ga.population_size,
+        'generations': generations,
+        'crossover_prob': ga.crossover_prob,
+        'mutation_prob': ga.mutation_prob,
+        'fitness_cache_size': ga.fitness_cache.max_entries,
+        'exact_originality': ga.exact_originality
+    }
+    tables = ga.fitness_tables()
+
+    start = time.perf_counter()
+    rngs = [np.random.default_rng(seed) for seed in seeds]
+    populations, fitnesses, halls = [], [], []
+    for rng in rngs:
+        engine = NumpyGeneticEngine(ga)
+        engine.rng = rng
+        population = engine.initial_population(ga.population_size)
+        populations.append(population)
+        fitnesses.append(ga.evaluate_population(population))
+        halls.append(top_unique(population, fitnesses[-1], num_combinations, ga.numbers_to_draw))
+    evaluations = n_islands * ga.population_size
+
+    # Un seul processus: exécution locale, sans sérialisation des populations
+    pool = None
+    if n_workers > 1:
+        pool = ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker, initargs=(params, tables))
+
+    completed = 0
+    stop_reason = STOP_GENERATIONS
+    try:
+        while completed < generations:
+            if time_budget is not None and time.perf_counter() - start >= time_budget:
+                stop_reason = STOP_TIME_BUDGET
+                break
+            epoch = min(migration_interval, generations - completed)
+
+            if pool is None:
+                results = [_evolve(ga, p, f, r, epoch, h)
+                           for p, f, r, h in zip(populations, fitnesses, rngs, halls)]
+            else:
+                futures = [pool.submit(_evolve_in_worker, p, f, r, epoch, h)
+                           for p, f, r, h in zip(populations, fitnesses, rngs, halls)]
+                results = [future.result() for future in futures]
+
+            populations = [result[0] for result in results]
+            fitnesses = [result[1] for result in results]
+            rngs = [result[2] for result in results]
+            evaluations += sum(result[3] for result in results)
+            halls = [result[4] for result in results]
+            completed += epoch
+
+            if completed < generations:
+                migrate(populations, fitnesses, n_migrants)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    combinations = merge_islands([hall[0] for hall in halls], [hall[1] for hall in halls],
+                                 num_combinations, ga.numbers_to_draw)
+    stats = {
+        'n_islands': n_islands,
+        'n_workers': n_workers,
+        'generations': completed,
+        'evaluations': evaluations,
+        'stop_reason': stop_reason,
+        'elapsed_s': round(time.perf_counter() - start, 3),
+        'best_fitness': combinations[0]['fitness'] if combinations else None
+    }
+    logger.info(f"Modèle en îles: {n_islands} îles, {n_workers} processus, {completed} générations, "
+                f"{evaluations} évaluations en {stats['elapsed_s']} s")
+    return combinations, stats
+
+
+# Vérification: exécution locale et sur un pool de processus identiques
+def test_island_model(n_draws=1000, seed=42):
+    import pandas as pd
+    from training.genetic_algorithm import GeneticAlgorithm
+
+    rng = np.random.default_rng(seed)
+    numbers = np.sort(rng.random((n_draws, 50)).argsort(axis=1)[:, :5] + 1, axis=1)
+    stars = np.sort(rng.random((n_draws, 12)).argsort(axis=1)[:, :2] + 1, axis=1)
+    columns = ['numero1', 'numero2', 'numero3', 'numero4', 'numero5', 'etoile1', 'etoile2']
+    ga = GeneticAlgorithm(population_size=100, generations=20, engine='numpy', seed=seed)
+    ga.load_historical_data(pd.DataFrame(np.hstack([numbers, stars]), columns=columns))
+
+    results = []
+    for n_workers in (1, 2):
+        combinations, stats = run_islands(ga, num_combinations=5, n_islands=2, n_workers=n_workers,
+                                          migration_interval=5)
+        assert stats['n_workers'] == n_workers and stats['generations'] == 20
+        results.append(combinations)
+    assert results[0] == results[1]
+
+    # Fitness retournée identique à l'évaluation du GA
+    population = np.array([combo['numbers'] + combo['stars'] for combo in results[1]])
+    assert [combo['fitness'] for combo in results[1]] == ga.evaluate_population(population).tolist()
+
+    # Sans migration, la meilleure fitness est la meilleure rencontrée à chaque génération
+    seeds = np.random.SeedSequence(seed).spawn(2)
+    combinations, _ = run_islands(ga, num_combinations=5, n_islands=2, n_workers=1,
+                                  migration_interval=20, seeds=seeds)
+    best = -np.inf
+    for island_seed in seeds:
+        engine = NumpyGeneticEngine(ga)
+        engine.rng = np.random.default_rng(island_seed)
+        population = engine.initial_population(ga.population_size)
+        fitness = ga.evaluate_population(population)
+        best = max(best, fitness.max())
+        for _ in range(20):
+            population, fitness = engine.step(population, fitness)
+            best = max(best, fitness.max())
+    assert combinations[0]['fitness'] == best
+
+    logger.info(f"Modèle en îles vérifié: meilleure fitness {results[1][0]['fitness']:.6f}")
+    return results[1]
+
+
+if __name__ == "__main__":
+    test_island_model()
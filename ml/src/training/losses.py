@@ -0,0 +1,91 @@
+import numpy as np
+import tensorflow as tf
+import os
+import sys
+
+# Ajout du répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import logger
+
+# Politique Keras de précision mixte sur CPU (calculs bfloat16, variables float32)
+MIXED_PRECISION_POLICY = 'mixed_bfloat16'
+
+
+@tf.keras.utils.register_keras_serializable(package='eurogenius')
+def sparse_multilabel_crossentropy(y_true, y_pred):
+    """
+    Entropie croisée d'une sortie softmax face aux k valeurs entières d'un tirage
+
+    Identique à categorical_crossentropy contre la distribution cible (1/k
+    sur chaque valeur tirée, voir target_distribution), sans matérialiser
+    de tenseur dense: les k probabilités des valeurs tirées sont lues
+    directement dans la sortie.
+
+    Args:
+        y_true: Valeurs tirées, entiers (b, k)
+        y_pred: Probabilités (b, num_classes)
+
+    Returns:
+        Tensor: Perte par exemple (b,)
+    """
+    y_pred = tf.cast(y_pred, tf.float32)
+    epsilon = tf.keras.backend.epsilon()
+    picked = tf.gather(y_pred, tf.cast(y_true, tf.int32), batch_dims=1)
+    return -tf.reduce_mean(tf.math.log(tf.clip_by_value(picked, epsilon, 1.0)), axis=-1)
+
+
+@tf.keras.utils.register_keras_serializable(package='eurogenius')
+def sparse_top_k_hits(y_true, y_pred):
+    """
+    Part des k valeurs tirées parmi les k classes les plus probables (hors padding)
+
+    Args:
+        y_true: Valeurs tirées, entiers (b, k)
+        y_pred: Probabilités (b, num_classes)
+
+    Returns:
+        Tensor: Taux de réussite par exemple (b,)
+    """
+    y_true = tf.cast(y_true, tf.int32)
+    k = tf.shape(y_true)[-1]
+    _, top = tf.math.top_k(tf.cast(y_pred[:, 1:], tf.float32), k=k)
+    hits = tf.equal(y_true[:, :, None], top[:, None, :] + 1)
+    return tf.reduce_mean(tf.cast(tf.reduce_any(hits, axis=-1), tf.float32), axis=-1)
+
+
+def layer_dtype(mixed_precision):
+    """
+    Politique des couches cachées: bfloat16 mixte ou float32
+
+    Args:
+        mixed_precision (bool): Précision mixte demandée
+
+    Returns:
+        str: Nom de la politique Keras
+    """
+    return MIXED_PRECISION_POLICY if mixed_precision else 'float32'
+
+
+# Fonction pour vérifier la perte face à categorical_crossentropy
+def test_losses(n=256, k=5, num_classes=51, seed=42):
+    from preprocessing.sequence_windows import target_distribution
+
+    rng = np.random.default_rng(seed)
+    targets = np.sort(rng.random((n, num_classes - 1)).argsort(axis=1)[:, :k] + 1, axis=1).astype(np.uint8)
+    logits = rng.normal(size=(n, num_classes)).astype(np.float32)
+    probabilities = tf.nn.softmax(logits).numpy()
+
+    expected = tf.keras.losses.categorical_crossentropy(target_distribution(targets, num_classes), probabilities)
+    loss = sparse_multilabel_crossentropy(targets, probabilities)
+    assert np.allclose(loss.numpy(), expected.numpy(), atol=1e-5)
+
+    # Sortie concentrée sur les valeurs tirées: toutes trouvées
+    perfect = target_distribution(targets, num_classes)
+    assert np.all(sparse_top_k_hits(targets, perfect).numpy() == 1.0)
+
+    logger.info(f"Perte multi-étiquettes vérifiée: {float(tf.reduce_mean(loss)):.4f}")
+    return loss
+
+
+if __name__ == "__main__":
+    test_losses()
@@ -0,0 +1,286 @@
+import numpy as np
+import tensorflow as tf
+from tensorflow.keras.models import Model
+from tensorflow.keras.layers import (Dense, LSTM, Bidirectional, Input, Dropout, Reshape,
+                                     TimeDistributed, CategoryEncoding)
+from tensorflow.keras.optimizers import Adam
+from tensorflow.keras.callbacks import EarlyStopping, ModelCheckpoint
+import os
+import sys
+import pandas as pd
+
+# Ajout du répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import MODELS_DIR, logger
+from preprocessing.sequence_windows import sliding_windows, target_distribution
+from training.window_dataset import time_split
+
+# Colonnes des tirages utilisées par les modèles d'entraînement
+NUMBER_COLUMNS = ['numero1', 'numero2', 'numero3', 'numero4', 'numero5']
+STAR_COLUMNS = ['etoile1', 'etoile2']
+
+
+class LSTMMultiHeadModel:
+    """
+    Modèle LSTM unique pour les numéros et les étoiles EuroMillions
+
+    Chaque pas de temps est un tirage complet (5 numéros puis 2 étoiles,
+    décalées après les numéros dans un vocabulaire commun). Un tronc
+    récurrent partagé alimente deux sorties softmax: 'numbers' (51 classes)
+    et 'stars' (13 classes), chacune avec sa propre couche récurrente. Un
+    seul fit sur les fenêtres jointes remplace les entraînements de
+    LSTMNumbersModel et LSTMStarsModel, et un seul appel du modèle donne
+    les deux vecteurs de probabilités.
+    """
+
+    def __init__(self, sequence_length=10, batch_size=32, epochs=100, units=128):
+        """
+        Initialisation du modèle
+
+        Args:
+            sequence_length (int): Nombre de tirages précédents à utiliser pour la prédiction
+            batch_size (int): Taille des lots pour l'entraînement
+            epochs (int): Nombre d'époques pour l'entraînement
+            units (int): Taille des couches LSTM (moitié pour la sortie des étoiles)
+        """
+        self.sequence_length = sequence_length
+        self.batch_size = batch_size
+        self.epochs = epochs
+        self.units = units
+        self.model = None
+
+        # Paramètres spécifiques à EuroMillions
+        self.num_numbers = 50  # Numéros de 1 à 50
+        self.num_stars = 12  # Étoiles de 1 à 12
+        self.numbers_to_draw = 5  # 5 numéros par tirage
+        self.stars_to_draw = 2  # 2 étoiles par tirage
+
+        logger.info(f"Modèle LSTM multi-sorties initialisé avec sequence_length={sequence_length}")
+
+    @property
+    def draw_size(self):
+        return self.numbers_to_draw + self.stars_to_draw
+
+    def _head(self, x, num_classes, units, name):
+        """
+        Couches propres à une sortie au-dessus du tronc partagé
+        """
+        x = LSTM(units)(x)
+        x = Dropout(0.3)(x)
+        x = Dense(2 * units, activation='relu')(x)
+        x = Dropout(0.3)(x)
+        # Sortie softmax (+1: la classe 0 est réservée au padding)
+        return Dense(num_classes + 1, activation='softmax', name=name)(x)
+
+    def _build_model(self):
+        """
+        Construction du tronc partagé et des deux sorties
+        """
+        inputs = Input(shape=(self.sequence_length * self.draw_size,), dtype='int32')
+
+        # Un pas de temps par tirage: indicatrice de ses valeurs dans le vocabulaire
+        # commun (0: padding, numéros 1-50, étoiles 51-62), indépendante de l'ordre
+        x = Reshape((self.sequence_length, self.draw_size))(inputs)
+        x = TimeDistributed(CategoryEncoding(num_tokens=self.num_numbers + self.num_stars + 1,
+                                             output_mode='multi_hot'))(x)
+
+        # Tronc récurrent partagé, puis une couche récurrente par sortie: avec un
+        # tronc entièrement commun, la perte des étoiles (plus rapide à réduire)
+        # empêche la sortie des numéros d'apprendre
+        x = Bidirectional(LSTM(self.units, return_sequences=True))(x)
+        numbers = self._head(x, self.num_numbers, self.units, 'numbers')
+        stars = self._head(x, self.num_stars, self.units // 2, 'stars')
+
+        model = Model(inputs=inputs, outputs={'numbers': numbers, 'stars': stars})
+        model.compile(
+            loss={'numbers': 'categorical_crossentropy', 'stars': 'categorical_crossentropy'},
+            optimizer=Adam(learning_rate=0.001),
+            metrics={'numbers': ['accuracy'], 'stars': ['accuracy']}
+        )
+
+        self.model = model
+        logger.info(f"Modèle LSTM multi-sorties construit: {model.count_params()} paramètres")
+        return model
+
+    def joint_draws(self, numbers, stars):
+        """
+        Tirages joints: numéros puis étoiles décalées de num_numbers
+
+        Args:
+            numbers (array): Numéros, forme (n, 5)
+            stars (array): Étoiles, forme (n, 2)
+
+        Returns:
+            array: Tirages uint8, forme (n, 7)
+        """
+        joint = np.empty((len(numbers), self.draw_size), dtype=np.uint8)
+        joint[:, :self.numbers_to_draw] = numbers
+        joint[:, self.numbers_to_draw:] = np.asarray(stars, dtype=np.uint8) + self.num_numbers
+        return joint
+
+    def _prepare_data(self, data):
+        """
+        Préparation des fenêtres jointes et des cibles des deux sorties
+
+        Args:
+            data (DataFrame ou DrawStore): Tirages historiques
+
+        Returns:
+            tuple: (X_train, y_train, X_val, y_val), cibles en dictionnaires par sortie
+        """
+        if hasattr(data, 'columns'):
+            numbers, stars = data[NUMBER_COLUMNS].to_numpy(dtype=np.uint8), data[STAR_COLUMNS].to_numpy(dtype=np.uint8)
+        else:
+            numbers, stars = data.numbers, data.stars
+
+        # Une seule passe de fenêtrage pour les deux sorties
+        X, y = sliding_windows(self.joint_draws(numbers, stars), self.sequence_length)
+        y_numbers = target_distribution(y[:, :self.numbers_to_draw], self.num_numbers + 1)
+        y_stars = target_distribution(y[:, self.numbers_to_draw:] - self.num_numbers, self.num_stars + 1)
+
+        # Division chronologique: validation sur les 20 % de fenêtres les plus récentes
+        split = time_split(len(X), validation_split=0.2)
+        X_train, X_val = X[:split], X[split:]
+        yn_train, yn_val, ys_train, ys_val = y_numbers[:split], y_numbers[split:], y_stars[:split], y_stars[split:]
+
+        logger.info(f"Données préparées: X_train shape: {X_train.shape}, "
+                    f"y_train shapes: {yn_train.shape}, {ys_train.shape}")
+        return (X_train, {'numbers': yn_train, 'stars': ys_train},
+                X_val, {'numbers': yn_val, 'stars': ys_val})
+
+    def train(self, data):
+        """
+        Entraînement des deux sorties en un seul fit
+
+        Args:
+            data (DataFrame ou DrawStore): Tirages historiques
+
+        Returns:
+            History: Historique d'entraînement
+        """
+        if self.model is None:
+            self._build_model()
+
+        X_train, y_train, X_val, y_val = self._prepare_data(data)
+
+        callbacks = [
+            EarlyStopping(monitor='val_loss', patience=10, restore_best_weights=True),
+            ModelCheckpoint(
+                filepath=os.path.join(MODELS_DIR, 'lstm_multihead_model.h5'),
+                monitor='val_loss',
+                save_best_only=True
+            )
+        ]
+
+        history = self.model.fit(
+            X_train, y_train,
+            validation_data=(X_val, y_val),
+            epochs=self.epochs,
+            batch_size=self.batch_size,
+            callbacks=callbacks,
+            verbose=1
+        )
+
+        logger.info("Entraînement du modèle LSTM multi-sorties terminé")
+        return history
+
+    def predict_probabilities(self, recent_numbers, recent_stars):
+        """
+        Probabilités des numéros et des étoiles en un seul appel du modèle
+
+        Args:
+            recent_numbers (array): Derniers numéros (sequence_length tirages)
+            recent_stars (array): Dernières étoiles (sequence_length tirages)
+
+        Returns:
+            tuple: (probabilités des numéros (51,), probabilités des étoiles (13,))
+        """
+        if self.model is None:
+            raise ValueError("Le modèle doit être entraîné avant de faire des prédictions")
+
+        X = self.joint_draws(recent_numbers, recent_stars).reshape(1, -1).astype(np.int32)
+        outputs = self.model(X, training=False)
+        return outputs['numbers'].numpy()[0], outputs['stars'].numpy()[0]
+
+    def predict(self, recent_numbers, recent_stars):
+        """
+        Génération de prédictions pour le prochain tirage
+
+        Args:
+            recent_numbers (array): Derniers numéros (sequence_length tirages)
+            recent_stars (array): Dernières étoiles (sequence_length tirages)
+
+        Returns:
+            tuple: (numéros prédits, probabilités des numéros, étoiles prédites,
+                    probabilités des étoiles)
+        """
+        number_probs, star_probs = self.predict_probabilities(recent_numbers, recent_stars)
+
+        # Valeurs les plus probables, hors classe 0 (padding)
+        selected_numbers = sorted(int(i) + 1 for i in np.argsort(-number_probs[1:], kind='stable')[:self.numbers_to_draw])
+        selected_stars = sorted(int(i) + 1 for i in np.argsort(-star_probs[1:], kind='stable')[:self.stars_to_draw])
+
+        logger.info(f"Prédiction générée: {selected_numbers} + {selected_stars}")
+        return selected_numbers, number_probs, selected_stars, star_probs
+
+    def save(self, filepath=None):
+        """
+        Sauvegarde du modèle
+
+        Args:
+            filepath (str, optional): Chemin pour la sauvegarde. Par défaut None.
+        """
+        if self.model is None:
+            raise ValueError("Le modèle doit être entraîné avant d'être sauvegardé")
+
+        if filepath is None:
+            filepath = os.path.join(MODELS_DIR, 'lstm_multihead_model.h5')
+
+        self.model.save(filepath)
+        logger.info(f"Modèle sauvegardé à {filepath}")
+
+    def load(self, filepath=None):
+        """
+        Chargement d'un modèle sauvegardé
+
+        Args:
+            filepath (str, optional): Chemin du modèle à charger. Par défaut None.
+        """
+        if filepath is None:
+            filepath = os.path.join(MODELS_DIR, 'lstm_multihead_model.h5')
+
+        if not os.path.exists(filepath):
+            raise FileNotFoundError(f"Le fichier modèle {filepath} n'existe pas")
+
+        self.model = tf.keras.models.load_model(filepath)
+        logger.info(f"Modèle chargé depuis {filepath}")
+
+
+# Fonction pour tester le modèle avec des données synthétiques
+def test_model():
+    """
+    Test du modèle avec des données synthétiques
+    """
+    rng = np.random.default_rng(42)
+    n_draws = 1000
+    numbers = np.sort(rng.random((n_draws, 50)).argsort(axis=1)[:, :5] + 1, axis=1)
+    stars = np.sort(rng.random((n_draws, 12)).argsort(axis=1)[:, :2] + 1, axis=1)
+    df = pd.DataFrame(np.hstack([numbers, stars]), columns=NUMBER_COLUMNS + STAR_COLUMNS)
+
+    model = LSTMMultiHeadModel(sequence_length=5, batch_size=32, epochs=5)
+    model.train(df)
+
+    predicted_numbers, number_probs, predicted_stars, star_probs = model.predict(numbers[-5:], stars[-5:])
+    assert number_probs.shape == (51,) and star_probs.shape == (13,)
+    assert len(set(predicted_numbers)) == 5 and len(set(predicted_stars)) == 2
+
+    print(f"Numéros prédits pour le prochain tirage: {predicted_numbers}")
+    print(f"Étoiles prédites pour le prochain tirage: {predicted_stars}")
+
+    model.save()
+    return model
+
+
+if __name__ == "__main__":
+    # Test du modèle
+    test_model()
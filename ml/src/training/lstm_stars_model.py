@@ -8,18 +8,21 @@ import os
 import sys
 import pandas as pd
 from sklearn.preprocessing import MinMaxScaler
-from sklearn.model_selection import train_test_split
 
 # Ajout du répertoire parent au path pour les imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import ROOT_DIR, DATA_DIR, MODELS_DIR, logger
+from preprocessing.sequence_windows import sliding_windows, target_distribution, sparse_targets
+from training.losses import sparse_multilabel_crossentropy, sparse_top_k_hits, layer_dtype
+from training.window_dataset import streaming_datasets, history_values, time_split
 
 class LSTMStarsModel:
     """
     Modèle LSTM pour la prédiction des étoiles EuroMillions
     """
     
-    def __init__(self, sequence_length=10, batch_size=32, epochs=100):
+    def __init__(self, sequence_length=10, batch_size=32, epochs=100, sparse_targets=False,
+                 mixed_precision=False):
         """
         Initialisation du modèle
         
@@ -27,10 +30,15 @@ class LSTMStarsModel:
             sequence_length (int): Nombre de tirages précédents à utiliser pour la prédiction
             batch_size (int): Taille des lots pour l'entraînement
             epochs (int): Nombre d'époques pour l'entraînement
+            sparse_targets (bool): Cibles entières (valeurs du tirage suivant) et perte
+                multi-étiquettes au lieu des distributions cibles denses
+            mixed_precision (bool): Couches cachées en précision mixte bfloat16
         """
         self.sequence_length = sequence_length
         self.batch_size = batch_size
         self.epochs = epochs
+        self.sparse_targets = sparse_targets
+        self.mixed_precision = mixed_precision
         self.model = None
         self.scaler = MinMaxScaler(feature_range=(0, 1))
         
@@ -45,31 +53,37 @@ class LSTMStarsModel:
         Construction de l'architecture du modèle LSTM
         """
         # Définition de l'architecture du modèle
+        # (couches cachées en bfloat16 si la précision mixte est demandée)
+        dtype = layer_dtype(self.mixed_precision)
         model = Sequential()
         
         # Couche d'embedding pour transformer les numéros en vecteurs
         model.add(Embedding(input_dim=self.num_stars+1, output_dim=16, 
-                           input_length=self.sequence_length*self.stars_to_draw))
+                           input_length=self.sequence_length*self.stars_to_draw, dtype=dtype))
         
         # Couche LSTM pour capturer les dépendances temporelles
-        model.add(LSTM(64, return_sequences=False))
+        model.add(LSTM(64, return_sequences=False, dtype=dtype))
         
         # Dropout pour éviter le surapprentissage
-        model.add(Dropout(0.3))
+        model.add(Dropout(0.3, dtype=dtype))
         
         # Couche dense avec activation ReLU
-        model.add(Dense(128, activation='relu'))
-        model.add(Dropout(0.3))
+        model.add(Dense(128, activation='relu', dtype=dtype))
+        model.add(Dropout(0.3, dtype=dtype))
         
         # Couche de sortie avec activation softmax pour les probabilités
         # +1 car les étoiles vont de 1 à 12 (0 est utilisé pour le padding)
-        model.add(Dense(self.num_stars+1, activation='softmax'))
+        model.add(Dense(self.num_stars+1, activation='softmax', dtype='float32'))
         
-        # Compilation du modèle
+        # Compilation du modèle: perte sur les valeurs entières ou sur les distributions
+        if self.sparse_targets:
+            loss, metrics = sparse_multilabel_crossentropy, [sparse_top_k_hits]
+        else:
+            loss, metrics = 'categorical_crossentropy', ['accuracy']
         model.compile(
-            loss='categorical_crossentropy',
+            loss=loss,
             optimizer=Adam(learning_rate=0.001),
-            metrics=['accuracy']
+            metrics=metrics
         )
         
         self.model = model
@@ -87,48 +101,37 @@ class LSTMStarsModel:
             tuple: (X_train, y_train, X_val, y_val) données d'entraînement et de validation
         """
         # Extraction des étoiles
-        stars = data[['etoile1', 'etoile2']].values
+        stars = data[['etoile1', 'etoile2']].to_numpy(dtype=np.uint8)
         
-        # Création des séquences
-        X, y = [], []
+        # Séquences d'entrée (vues glissantes) et tirage suivant de chaque séquence
+        X, y = sliding_windows(stars, self.sequence_length)
         
-        for i in range(len(stars) - self.sequence_length):
-            # Séquence d'entrée: sequence_length tirages consécutifs
-            seq = stars[i:i+self.sequence_length].flatten()
-            X.append(seq)
-            
-            # Sortie: étoiles du tirage suivant
-            next_draw = stars[i+self.sequence_length]
-            y.append(next_draw)
-        
-        X = np.array(X)
-        y = np.array(y)
-        
-        # Conversion des sorties en format one-hot
-        y_one_hot = []
-        for draw in y:
-            # Création d'un vecteur one-hot pour chaque étoile du tirage
-            draw_one_hot = np.zeros((self.stars_to_draw, self.num_stars+1))
-            for i, num in enumerate(draw):
-                draw_one_hot[i, num] = 1
-            y_one_hot.append(draw_one_hot)
-        
-        y_one_hot = np.array(y_one_hot)
-        
-        # Division en ensembles d'entraînement et de validation
-        X_train, X_val, y_train, y_val = train_test_split(
-            X, y_one_hot, test_size=0.2, random_state=42
-        )
+        # Valeurs entières du tirage suivant, ou distribution cible (1/k sur
+        # chacune de ses valeurs) de même forme que la sortie softmax du modèle
+        if self.sparse_targets:
+            y_target = sparse_targets(y, self.num_stars+1)
+        else:
+            y_target = target_distribution(y, self.num_stars+1)
+        
+        # Division chronologique: validation sur les 20 % de fenêtres les plus
+        # récentes (un mélange ferait valider sur des tirages antérieurs à l'entraînement)
+        split = time_split(len(X), validation_split=0.2)
+        X_train, X_val, y_train, y_val = X[:split], X[split:], y_target[:split], y_target[split:]
         
         logger.info(f"Données préparées: X_train shape: {X_train.shape}, y_train shape: {y_train.shape}")
         return X_train, y_train, X_val, y_val
     
-    def train(self, data):
+    def train(self, data, streaming=False, shuffle_buffer=10_000, cache=None):
         """
         Entraînement du modèle
         
         Args:
-            data (DataFrame): DataFrame contenant les tirages historiques
+            data (DataFrame ou DrawStore): Tirages historiques
+            streaming (bool): Fenêtres générées à la demande depuis les tirages
+                (tf.data, validation chronologique) au lieu de tableaux en mémoire
+            shuffle_buffer (int): Tampon de mélange du mode en flux
+            cache (str, optional): Cache des fenêtres du mode en flux
+                ('' en mémoire, préfixe de fichier sur disque)
             
         Returns:
             History: Historique d'entraînement
@@ -137,8 +140,22 @@ class LSTMStarsModel:
         if self.model is None:
             self._build_model()
         
-        # Préparation des données
-        X_train, y_train, X_val, y_val = self._prepare_data(data)
+        # Préparation des données: jeux tf.data en flux ou tableaux en mémoire
+        columns = ['etoile1', 'etoile2']
+        if streaming:
+            train_data, val_data, _, _ = streaming_datasets(
+                history_values(data, columns, 'stars'),
+                self.sequence_length, self.num_stars+1,
+                batch_size=self.batch_size, shuffle_buffer=shuffle_buffer, cache=cache,
+                sparse=self.sparse_targets
+            )
+            fit_args, fit_kwargs = (train_data,), {'validation_data': val_data}
+        else:
+            if not hasattr(data, 'columns'):
+                data = pd.DataFrame(history_values(data, None, 'stars'), columns=columns)
+            X_train, y_train, X_val, y_val = self._prepare_data(data)
+            fit_args = (X_train, y_train)
+            fit_kwargs = {'validation_data': (X_val, y_val), 'batch_size': self.batch_size}
         
         # Callbacks pour l'entraînement
         callbacks = [
@@ -152,12 +169,11 @@ class LSTMStarsModel:
         
         # Entraînement du modèle
         history = self.model.fit(
-            X_train, y_train,
-            validation_data=(X_val, y_val),
+            *fit_args,
             epochs=self.epochs,
-            batch_size=self.batch_size,
             callbacks=callbacks,
-            verbose=1
+            verbose=1,
+            **fit_kwargs
         )
         
         logger.info("Entraînement du modèle LSTM pour étoiles terminé")
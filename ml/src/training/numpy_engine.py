@@ -0,0 +1,305 @@
+import numpy as np
+import os
+import sys
+
+# Ajout du répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import logger
+from training.combination_masks import combination_keys
+
+
+def random_sections(rng, size, max_value, k):
+    """
+    Tirage de sections triées sans doublon (numéros ou étoiles)
+
+    Args:
+        rng (np.random.Generator): Générateur aléatoire
+        size (int): Nombre de sections
+        max_value (int): Valeur maximale (50 ou 12)
+        k (int): Nombre de valeurs par section
+
+    Returns:
+        array: Sections, forme (size, k), uint8
+    """
+    values = rng.random((size, max_value)).argsort(axis=1)[:, :k] + 1
+    return np.sort(values, axis=1).astype(np.uint8)
+
+
+def _absent_candidates(rng, sections, max_value, n_candidates):
+    """
+    Valeurs absentes de chaque section, dans un ordre aléatoire
+
+    Returns:
+        array: Candidats, forme (lignes, n_candidates)
+    """
+    rows = np.arange(len(sections))[:, None]
+    keys = rng.random((len(sections), max_value + 1))
+    keys[:, 0] = 2.0
+    keys[rows, sections] = 2.0
+    return keys.argsort(axis=1)[:, :n_candidates]
+
+
+def repair_duplicates(rng, sections, max_value):
+    """
+    Remplacement des doublons de chaque section par des valeurs absentes
+
+    Args:
+        rng (np.random.Generator): Générateur aléatoire
+        sections (array): Sections (lignes x k), modifiées sur place
+        max_value (int): Valeur maximale
+
+    Returns:
+        array: Sections triées sans doublon
+    """
+    sections.sort(axis=1)
+    duplicates = np.zeros(sections.shape, dtype=bool)
+    duplicates[:, 1:] = sections[:, 1:] == sections[:, :-1]
+    rows = np.flatnonzero(duplicates.any(axis=1))
+    if len(rows):
+        subset = sections[rows]
+        mask = duplicates[rows]
+        candidates = _absent_candidates(rng, subset, max_value, sections.shape[1])
+        rank = np.cumsum(mask, axis=1) - 1
+        replacement = np.take_along_axis(candidates, np.maximum(rank, 0), axis=1)
+        subset[mask] = replacement[mask]
+        subset.sort(axis=1)
+        sections[rows] = subset
+    return sections
+
+
+def mutate_sections(rng, sections, max_value, gene_prob, rows):
+    """
+    Mutation des gènes d'une section vers des valeurs absentes de la section
+
+    Args:
+        rng (np.random.Generator): Générateur aléatoire
+        sections (array): Sections (lignes x k), modifiées sur place
+        max_value (int): Valeur maximale
+        gene_prob (float): Probabilité de mutation de chaque gène
+        rows (array): Indices des individus soumis à la mutation
+
+    Returns:
+        array: Masque des lignes effectivement modifiées
+    """
+    changed = np.zeros(len(sections), dtype=bool)
+    if not len(rows):
+        return changed
+
+    mask = rng.random((len(rows), sections.shape[1])) < gene_prob
+    mutated = mask.any(axis=1)
+    rows, mask = rows[mutated], mask[mutated]
+    if not len(rows):
+        return changed
+
+    # Chaque gène muté reçoit une valeur distincte, absente de la section
+    subset = sections[rows]
+    candidates = _absent_candidates(rng, subset, max_value, sections.shape[1])
+    rank = np.cumsum(mask, axis=1) - 1
+    replacement = np.take_along_axis(candidates, np.maximum(rank, 0), axis=1)
+    subset[mask] = replacement[mask]
+    subset.sort(axis=1)
+    sections[rows] = subset
+    changed[rows] = True
+    return changed
+
+
+def top_unique(population, fitness, size, numbers_to_draw=5):
+    """
+    Meilleurs individus distincts d'une population
+
+    Args:
+        population (array): Combinaisons, forme (n, 7)
+        fitness (array): Scores correspondants
+        size (int): Nombre d'individus à conserver
+        numbers_to_draw (int): Nombre de numéros par combinaison
+
+    Returns:
+        tuple: (individus, scores) par fitness décroissante
+    """
+    order = np.argsort(-fitness, kind='stable')
+    _, first = np.unique(combination_keys(population[order], numbers_to_draw), return_index=True)
+    best = order[np.sort(first)][:size]
+    return population[best], fitness[best]
+
+
+def to_combinations(population, fitness, numbers_to_draw=5):
+    """
+    Mise au format de GeneticAlgorithm.generate_combinations()
+    """
+    return [
+        {
+            'numbers': population[i, :numbers_to_draw].tolist(),
+            'stars': population[i, numbers_to_draw:].tolist(),
+            'fitness': float(fitness[i])
+        }
+        for i in range(len(population))
+    ]
+
+
+class NumpyGeneticEngine:
+    """
+    Moteur génétique vectorisé, alternative à DEAP
+
+    La population est un tableau contigu uint8 (taille x 7). Sélection par
+    tournoi, croisement par segment avec réparation des doublons et mutation
+    sont appliqués à toute la population à la fois, avec la même structure
+    que `algorithms.eaSimple` et les opérateurs personnalisés du GA:
+    croisement des paires d'individus consécutifs (probabilité cxpb), puis
+    mutation (probabilité mutpb), puis évaluation des individus modifiés.
+    """
+
+    def __init__(self, ga, seed=None, tournament_size=3):
+        """
+        Initialisation du moteur
+
+        Args:
+            ga (GeneticAlgorithm): Algorithme génétique (paramètres et fitness)
+            seed (int, optional): Graine du générateur np.random.Generator
+            tournament_size (int): Taille des tournois de sélection
+        """
+        self.ga = ga
+        self.rng = np.random.default_rng(seed)
+        self.tournament_size = tournament_size
+        self.evaluations = 0
+        self.generations_run = 0
+
+    def initial_population(self, size, seeds=None):
+        """
+        Population initiale de combinaisons valides
+
+        Args:
+            size (int): Taille de la population
+            seeds (array, optional): Combinaisons placées en tête de la population
+
+        Returns:
+            array: Population, forme (size, 7), uint8
+        """
+        ga = self.ga
+        n_seeds = 0 if seeds is None else min(len(seeds), size)
+        population = np.hstack([
+            random_sections(self.rng, size - n_seeds, ga.num_numbers, ga.numbers_to_draw),
+            random_sections(self.rng, size - n_seeds, ga.num_stars, ga.stars_to_draw)
+        ])
+        if n_seeds:
+            population = np.vstack([np.asarray(seeds[:n_seeds], dtype=np.uint8), population])
+        return population
+
+    def evaluate(self, population):
+        """
+        Fitness de toute la population (évaluation vectorisée du GA)
+        """
+        self.evaluations += len(population)
+        return self.ga.evaluate_population(population)
+
+    def select(self, population, fitness):
+        """
+        Sélection par tournoi (équivalent de tools.selTournament)
+        """
+        contenders = self.rng.integers(0, len(population), size=(len(population), self.tournament_size))
+        winners = contenders[np.arange(len(population)), np.argmax(fitness[contenders], axis=1)]
+        return population[winners].copy(), fitness[winners].copy()
+
+    def crossover(self, population):
+        """
+        Croisement des paires consécutives (équivalent de _custom_crossover)
+
+        Returns:
+            array: Masque des individus modifiés
+        """
+        ga = self.ga
+        k = ga.numbers_to_draw
+        n_pairs = len(population) // 2
+        changed = np.zeros(len(population), dtype=bool)
+
+        mated = np.flatnonzero(self.rng.random(n_pairs) < ga.crossover_prob)
+        if not len(mated):
+            return changed
+        first, second = 2 * mated, 2 * mated + 1
+        parents1, parents2 = population[first], population[second]
+
+        # Numéros: échange du segment [0, point[ puis réparation des doublons
+        swap_numbers = self.rng.random(len(mated)) < ga.crossover_prob
+        points = self.rng.integers(1, k, size=len(mated))
+        segment = (np.arange(k) < points[:, None]) & swap_numbers[:, None]
+        numbers1 = np.where(segment, parents2[:, :k], parents1[:, :k])
+        numbers2 = np.where(segment, parents1[:, :k], parents2[:, :k])
+
+        # Étoiles: chaque étoile est échangée avec une probabilité 1/2
+        swap_stars = (self.rng.random(len(mated)) < ga.crossover_prob)[:, None] & \
+                     (self.rng.random((len(mated), ga.stars_to_draw)) < 0.5)
+        stars1 = np.where(swap_stars, parents2[:, k:], parents1[:, k:])
+        stars2 = np.where(swap_stars, parents1[:, k:], parents2[:, k:])
+
+        population[first] = np.hstack([repair_duplicates(self.rng, numbers1, ga.num_numbers),
+                                       repair_duplicates(self.rng, stars1, ga.num_stars)])
+        population[second] = np.hstack([repair_duplicates(self.rng, numbers2, ga.num_numbers),
+                                        repair_duplicates(self.rng, stars2, ga.num_stars)])
+        changed[first] = changed[second] = True
+        return changed
+
+    def mutate(self, population):
+        """
+        Mutation des individus (équivalent de _custom_mutation)
+
+        Returns:
+            array: Masque des individus modifiés
+        """
+        ga = self.ga
+        k = ga.numbers_to_draw
+        rows = np.flatnonzero(self.rng.random(len(population)) < ga.mutation_prob)
+
+        # Les sections sont des vues: la population est modifiée sur place
+        changed = mutate_sections(self.rng, population[:, :k], ga.num_numbers, ga.mutation_prob, rows)
+        changed |= mutate_sections(self.rng, population[:, k:], ga.num_stars, ga.mutation_prob, rows)
+        return changed
+
+    def step(self, population, fitness):
+        """
+        Une génération: sélection, croisement, mutation, évaluation
+
+        Returns:
+            tuple: (population, fitness) de la génération suivante
+        """
+        offspring, offspring_fitness = self.select(population, fitness)
+        changed = self.crossover(offspring) | self.mutate(offspring)
+        if changed.any():
+            offspring_fitness[changed] = self.evaluate(offspring[changed])
+        return offspring, offspring_fitness
+
+    def run(self, num_combinations=5, generations=None, stopping=None, seeds=None):
+        """
+        Exécution et sélection des meilleures combinaisons rencontrées
+
+        Les meilleures combinaisons distinctes de toutes les générations
+        (panthéon) sont conservées: un arrêt anticipé retourne le meilleur
+        résultat obtenu jusque-là.
+
+        Args:
+            num_combinations (int): Nombre de combinaisons à retourner
+            generations (int, optional): Nombre de générations (par défaut celui du GA)
+            stopping (EarlyStopping, optional): Critères d'arrêt anticipé
+            seeds (array, optional): Combinaisons de départ (élites archivées)
+
+        Returns:
+            list: Combinaisons au format de GeneticAlgorithm.generate_combinations()
+        """
+        ga = self.ga
+        generations = ga.generations if generations is None else generations
+
+        population = self.initial_population(ga.population_size, seeds)
+        fitness = self.evaluate(population)
+        hall_of_fame = top_unique(population, fitness, num_combinations, ga.numbers_to_draw)
+
+        for _ in range(generations):
+            if stopping is not None and stopping.reason is not None:
+                break
+            population, fitness = self.step(population, fitness)
+            self.generations_run += 1
+            hall_of_fame = top_unique(np.vstack([hall_of_fame[0], population]),
+                                      np.concatenate([hall_of_fame[1], fitness]),
+                                      num_combinations, ga.numbers_to_draw)
+            if stopping is not None:
+                stopping.update(float(fitness.max()), float(fitness.mean()))
+        logger.info(f"Moteur NumPy: {self.generations_run} générations, {self.evaluations} évaluations, "
+                    f"meilleure fitness {hall_of_fame[1][0]:.4f}")
+        return to_combinations(*hall_of_fame, ga.numbers_to_draw)
@@ -0,0 +1,210 @@
+import numpy as np
+import tensorflow as tf
+import os
+import sys
+
+# Ajout du répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import logger
+from preprocessing.sequence_windows import sliding_windows
+
+# Nombre de fenêtres lues à chaque accès au fichier de tirages
+DEFAULT_CHUNK_SIZE = 4096
+
+
+def time_split(n_windows, validation_split=0.2):
+    """
+    Frontière chronologique entre entraînement et validation
+
+    Les fenêtres [0, split) servent à l'entraînement, [split, n_windows) à la
+    validation: toutes les cibles de validation sont postérieures à celles
+    de l'entraînement.
+
+    Args:
+        n_windows (int): Nombre de fenêtres
+        validation_split (float): Part des fenêtres les plus récentes en validation
+
+    Returns:
+        int: Indice de la première fenêtre de validation
+    """
+    return n_windows - int(round(n_windows * validation_split))
+
+
+def window_chunks(values, sequence_length, start, stop, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Fenêtres glissantes [start, stop) par blocs, lues à la demande
+
+    Seuls les tirages d'un bloc (chunk_size + sequence_length lignes) sont
+    lus dans le fichier projeté en mémoire à chaque itération.
+
+    Args:
+        values (array): Tirages (n, k), typiquement une colonne d'un DrawStore
+        sequence_length (int): Nombre de tirages par fenêtre
+        start (int): Première fenêtre
+        stop (int): Fin (exclue) des fenêtres
+        chunk_size (int): Nombre de fenêtres par bloc
+
+    Yields:
+        tuple: (X uint8 (m, L*k), cibles uint8 (m, k))
+    """
+    for begin in range(start, stop, chunk_size):
+        end = min(begin + chunk_size, stop)
+        block = np.asarray(values[begin:end + sequence_length], dtype=np.uint8)
+        X, y = sliding_windows(block, sequence_length)
+        yield np.ascontiguousarray(X), y
+
+
+def window_dataset(values, sequence_length, num_classes, start, stop, batch_size=32,
+                   shuffle_buffer=None, cache=None, chunk_size=DEFAULT_CHUNK_SIZE, seed=None, sparse=False):
+    """
+    Pipeline tf.data des fenêtres [start, stop)
+
+    Blocs lus à la demande -> fenêtres unitaires -> cache (optionnel) ->
+    mélange dans un tampon borné (optionnel) -> lots -> distribution cible
+    (1/k sur chaque valeur du tirage suivant) ou valeurs entières -> préchargement.
+    Le cache porte sur les fenêtres uint8 avant mélange: chaque époque
+    garde un ordre différent.
+
+    Args:
+        values (array): Tirages (n, k)
+        sequence_length (int): Nombre de tirages par fenêtre
+        num_classes (int): Nombre de classes de la sortie (valeur maximale + 1)
+        start (int): Première fenêtre
+        stop (int): Fin (exclue) des fenêtres
+        batch_size (int): Taille des lots
+        shuffle_buffer (int, optional): Taille du tampon de mélange (None: ordre chronologique)
+        cache (str, optional): '' pour un cache en mémoire, un chemin pour un cache
+            sur disque, None sans cache
+        chunk_size (int): Nombre de fenêtres par lecture
+        seed (int, optional): Graine du mélange
+        sparse (bool): Cibles entières (b, k) pour sparse_multilabel_crossentropy
+
+    Returns:
+        tf.data.Dataset: Lots (X int32 (b, L*k), cibles float32 (b, num_classes)
+                         ou int32 (b, k))
+    """
+    k = values.shape[1]
+    dataset = tf.data.Dataset.from_generator(
+        lambda: window_chunks(values, sequence_length, start, stop, chunk_size),
+        output_signature=(tf.TensorSpec((None, sequence_length * k), tf.uint8),
+                          tf.TensorSpec((None, k), tf.uint8))
+    ).unbatch()
+
+    if cache is not None:
+        dataset = dataset.cache(cache)
+    if shuffle_buffer:
+        dataset = dataset.shuffle(shuffle_buffer, seed=seed, reshuffle_each_iteration=True)
+
+    def encode(X, y):
+        if sparse:
+            return tf.cast(X, tf.int32), tf.cast(y, tf.int32)
+        distribution = tf.reduce_mean(tf.one_hot(tf.cast(y, tf.int32), num_classes), axis=1)
+        return tf.cast(X, tf.int32), distribution
+
+    n_batches = -(-(stop - start) // batch_size)
+    return (dataset.batch(batch_size)
+            .map(encode, num_parallel_calls=tf.data.AUTOTUNE)
+            .apply(tf.data.experimental.assert_cardinality(n_batches))
+            .prefetch(tf.data.AUTOTUNE))
+
+
+def streaming_datasets(values, sequence_length, num_classes, batch_size=32, validation_split=0.2,
+                       shuffle_buffer=10_000, cache=None, chunk_size=DEFAULT_CHUNK_SIZE, seed=None,
+                       sparse=False):
+    """
+    Jeux d'entraînement et de validation en flux, séparés chronologiquement
+
+    Args:
+        values (array): Tirages (n, k), en mémoire ou projetés (DrawStore)
+        sequence_length (int): Nombre de tirages par fenêtre
+        num_classes (int): Nombre de classes de la sortie
+        batch_size (int): Taille des lots
+        validation_split (float): Part des fenêtres les plus récentes en validation
+        shuffle_buffer (int): Tampon de mélange de l'entraînement (la validation n'est pas mélangée)
+        cache (str, optional): Cache des fenêtres ('' en mémoire, préfixe de fichier sur disque)
+        chunk_size (int): Nombre de fenêtres par lecture
+        seed (int, optional): Graine du mélange
+        sparse (bool): Cibles entières au lieu des distributions
+
+    Returns:
+        tuple: (jeu d'entraînement, jeu de validation, nombre de fenêtres d'entraînement,
+                nombre de fenêtres de validation)
+    """
+    n_windows = max(len(values) - sequence_length, 0)
+    split = time_split(n_windows, validation_split)
+    if split == 0 or split == n_windows:
+        raise ValueError(f"Historique trop court pour une validation chronologique: {len(values)} tirages")
+
+    train_cache = val_cache = cache
+    if cache:
+        train_cache, val_cache = f"{cache}_train", f"{cache}_val"
+    train = window_dataset(values, sequence_length, num_classes, 0, split, batch_size,
+                           shuffle_buffer, train_cache, chunk_size, seed, sparse)
+    validation = window_dataset(values, sequence_length, num_classes, split, n_windows, batch_size,
+                                None, val_cache, chunk_size, sparse=sparse)
+
+    logger.info(f"Jeux en flux: {split} fenêtres d'entraînement, {n_windows - split} de validation "
+                f"(à partir du tirage {split + sequence_length})")
+    return train, validation, split, n_windows - split
+
+
+def history_values(data, columns, store_attribute):
+    """
+    Colonnes de tirages d'un DataFrame ou d'un DrawStore, sans copie pour ce dernier
+
+    Args:
+        data (DataFrame ou DrawStore): Tirages historiques
+        columns (list): Colonnes du DataFrame
+        store_attribute (str): Attribut du DrawStore ('numbers' ou 'stars')
+
+    Returns:
+        array: Tirages uint8 (n, k)
+    """
+    if hasattr(data, store_attribute) and not hasattr(data, 'columns'):
+        return getattr(data, store_attribute)
+    return data[columns].to_numpy(dtype=np.uint8)
+
+
+# Fonction pour vérifier le flux face aux fenêtres en mémoire
+def test_window_dataset(n_draws=1000, sequence_length=10, seed=42):
+    """
+    Lecture depuis un DrawStore: mêmes fenêtres et cibles que la préparation
+    en mémoire, validation strictement postérieure à l'entraînement
+    """
+    import tempfile
+    from preprocessing.draw_store import DrawStore
+    from preprocessing.sequence_windows import target_distribution
+
+    rng = np.random.default_rng(seed)
+    numbers = np.sort(rng.random((n_draws, 50)).argsort(axis=1)[:, :5] + 1, axis=1)
+    stars = np.sort(rng.random((n_draws, 12)).argsort(axis=1)[:, :2] + 1, axis=1)
+    store = DrawStore.write(os.path.join(tempfile.mkdtemp(), 'history.draws'), numbers, stars)
+
+    X, y = sliding_windows(numbers, sequence_length)
+    expected_y = target_distribution(y, 51)
+    train, validation, n_train, n_val = streaming_datasets(store.numbers, sequence_length, 51, batch_size=64,
+                                                           chunk_size=100, seed=seed)
+    assert n_train + n_val == len(X) and n_val == round(len(X) * 0.2)
+
+    # Validation: ordre chronologique conservé
+    X_val = np.concatenate([batch.numpy() for batch, _ in validation])
+    y_val = np.concatenate([target.numpy() for _, target in validation])
+    assert np.array_equal(X_val, X[n_train:]) and np.allclose(y_val, expected_y[n_train:])
+
+    # Entraînement: mêmes fenêtres, mélangées, aucune de la période de validation
+    X_train = np.concatenate([batch.numpy() for batch, _ in train])
+    assert len(X_train) == n_train and not np.array_equal(X_train, X[:n_train])
+    order = np.lexsort(X_train.T[::-1])
+    assert np.array_equal(X_train[order], X[:n_train][np.lexsort(X[:n_train].T[::-1])])
+    assert train.cardinality().numpy() == -(-n_train // 64)
+
+    # Cibles entières: valeurs du tirage suivant
+    _, validation, _, _ = streaming_datasets(store.numbers, sequence_length, 51, batch_size=64, sparse=True)
+    assert np.array_equal(np.concatenate([target.numpy() for _, target in validation]), y[n_train:])
+
+    logger.info(f"Jeux en flux vérifiés: {n_train} fenêtres d'entraînement, {n_val} de validation")
+    return train, validation
+
+
+if __name__ == "__main__":
+    test_window_dataset()